@@ -142,6 +142,20 @@ class Channel(AbstractDateTimeModel):
                     f"No wrapper implemented for service: '{self.service}'."
                 )
 
+    @property
+    def media_variant(self) -> str | None:
+        """
+        Returns the key of the media specs of the service in MEDIA_SPECS, or
+        None if the service takes the images as they are.
+        """
+        match self.service:
+            case self.BLUESKY:
+                return "bluesky"
+            case self.THREADS:
+                return "threads"
+            case _:
+                return None
+
     def self_url(self):
         match self.service:
             case self.TWITTER:
@@ -1,10 +1,61 @@
+import logging
+
 from django.conf import settings
-from django_rq.queues import get_queue
 from rq import Retry
 
+from bc.core.utils.artifacts import get_artifacts
+from bc.core.utils.images import TextImage
+from bc.core.utils.queues import QueueRouter
+
 from .models import Channel, Group
+from .utils.rate_limits import add_status_with_rate_limits, delay_on_rate_limit
+
+logger = logging.getLogger(__name__)
 
-queue = get_queue("default")
+queue = QueueRouter()
+
+
+@delay_on_rate_limit
+def post_status(
+    channel_pk: int,
+    message: str,
+    text_image: TextImage | None = None,
+    thumbnails: list[bytes] | None = None,
+    thumbnails_key: str | None = None,
+) -> int | str:
+    """
+    Creates a new status in the given channel once the rate limits of the
+    channel and its service allow it. The job is delayed otherwise.
+
+    Jobs should pass the key of the thumbnails in the artifacts store
+    instead of the images, so the payload stays small when it's stored in
+    Redis and copied on each retry or delay.
+
+    Args:
+        channel_pk (int): The PK of the channel where the status is created.
+        message (str): Text to include in the new status.
+        text_image (TextImage | None): Image to attach to the new status.
+        thumbnails (list[bytes] | None): list of thumbnail images to include.
+        thumbnails_key (str | None): key of the thumbnails in the artifacts
+        store. Takes precedence over the thumbnails argument.
+
+    Returns:
+        int | str: The unique identifier for the new status.
+    """
+    if thumbnails_key:
+        thumbnails = get_artifacts(thumbnails_key)
+        if thumbnails is None:
+            # Post without thumbnails instead of failing the job
+            logger.warning(
+                f"The thumbnails {thumbnails_key} are no longer available"
+            )
+
+    channel = Channel.objects.get(pk=channel_pk)
+    channel.validate_access_token()
+    api = channel.get_api_wrapper()
+    return add_status_with_rate_limits(
+        channel, api, message, text_image, thumbnails
+    )
 
 
 def enqueue_text_status_for_channel(channel: Channel, text: str) -> None:
@@ -16,10 +67,9 @@ def enqueue_text_status_for_channel(channel: Channel, text: str) -> None:
         channel (Channel): The channel object.
         text (str): Message for the new status.
     """
-    channel.validate_access_token()
-    api = channel.get_api_wrapper()
     queue.enqueue(
-        api.add_status,
+        post_status,
+        channel.pk,
         text,
         retry=Retry(
             max=settings.RQ_MAX_NUMBER_OF_RETRIES,
@@ -0,0 +1,47 @@
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from bc.channel.utils.connectors.base import upload_media_concurrently
+
+
+class UploadMediaConcurrentlyTest(SimpleTestCase):
+    def test_keeps_the_order_of_the_items(self):
+        def upload(delay):
+            time.sleep(delay)
+            return delay
+
+        delays = [0.03, 0.01, 0.02, 0]
+        self.assertEqual(upload_media_concurrently(upload, delays), delays)
+
+    def test_returns_exceptions_in_place_of_results(self):
+        error = ValueError("upload failed")
+
+        def upload(item):
+            if item == 2:
+                raise error
+            return item
+
+        self.assertEqual(
+            upload_media_concurrently(upload, [1, 2, 3]), [1, error, 3]
+        )
+
+    def test_limits_the_number_of_concurrent_uploads(self):
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+
+        def upload(item):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return item
+
+        upload_media_concurrently(upload, list(range(6)), max_workers=2)
+
+        self.assertLessEqual(max_running, 2)
@@ -1,10 +1,17 @@
-from unittest.mock import call, patch
+import base64
+import json
+import os
+import time
+from io import BytesIO
+from unittest.mock import MagicMock, call, patch
 
 from django.test import SimpleTestCase
+from PIL import Image
 
 from bc.channel.tests.factories import fake_token
 from bc.channel.utils.connectors.alt_text_utils import thumb_num_alt_text
 from bc.channel.utils.connectors.bluesky import BlueskyConnector
+from bc.channel.utils.connectors.bluesky_api.client import BlueskyAPI
 from bc.core.utils.tests.base import faker
 
 
@@ -21,25 +28,37 @@ class ReprTest(SimpleTestCase):
 
 
 class UploadMediaTest(SimpleTestCase):
-    @patch("bc.core.utils.images.TextImage")
     @patch("bc.channel.utils.connectors.bluesky_api.client.BlueskyAPI")
     @patch.object(BlueskyConnector, "get_api_object")
-    def test_api_req_media_upload(
-        self, get_api_object, mock_bluesky_api, mock_image
+    def test_api_req_media_upload(self, get_api_object, mock_bluesky_api):
+        get_api_object.return_value = mock_bluesky_api
+        image = faker.image(size=(10, 10), image_format="png")
+
+        bluesky_conn = BlueskyConnector(fake_token(), fake_token())
+        bluesky_conn.upload_media(image, "image alt text")
+
+        mock_bluesky_api.post_media.assert_called_once_with(
+            image, mime_type="image/png"
+        )
+
+    @patch("bc.channel.utils.connectors.bluesky_api.client.BlueskyAPI")
+    @patch.object(BlueskyConnector, "get_api_object")
+    def test_converts_images_over_size_limit(
+        self, get_api_object, mock_bluesky_api
     ):
         get_api_object.return_value = mock_bluesky_api
+        image = Image.frombytes("RGB", (800, 800), os.urandom(800 * 800 * 3))
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
 
         bluesky_conn = BlueskyConnector(fake_token(), fake_token())
-        bluesky_conn.upload_media(mock_image, "image alt text")
+        bluesky_conn.upload_media(buffer.getvalue(), "image alt text")
 
-        expected_upload_media_calls = [
-            call(
-                mock_image,
-                mime_type="image/png",
-            ),
-        ]
-        mock_bluesky_api.post_media.assert_has_calls(
-            expected_upload_media_calls, any_order=True
+        media = mock_bluesky_api.post_media.call_args.args[0]
+        self.assertLessEqual(len(media), 1_000_000)
+        self.assertEqual(
+            mock_bluesky_api.post_media.call_args.kwargs["mime_type"],
+            "image/jpeg",
         )
 
 
@@ -96,7 +115,12 @@ class AddStatusTest(SimpleTestCase):
             None,
         )
 
-    @patch.object(BlueskyConnector, "upload_media", side_effect=[2, 3, 5, 8])
+    @patch.object(
+        BlueskyConnector,
+        "upload_media",
+        # ids match the size of the thumbnails so the order can be checked
+        side_effect=lambda media, _alt_text: len(media),
+    )
     @patch("bc.channel.utils.connectors.bluesky_api.client.BlueskyAPI")
     @patch.object(BlueskyConnector, "get_api_object")
     def test_has_thumbnails(
@@ -151,3 +175,132 @@ class AddStatusTest(SimpleTestCase):
         mock_upload_media.assert_has_calls(
             expected_upload_media_calls, any_order=True
         )
+
+
+def make_jwt(expires_in: int) -> str:
+    claims = {"exp": int(time.time()) + expires_in}
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode())
+    return f"header.{payload.decode().rstrip('=')}.signature"
+
+
+def make_session_data(expires_in: int = 3600) -> dict:
+    return {
+        "accessJwt": make_jwt(expires_in),
+        "refreshJwt": make_jwt(60 * 60 * 24),
+        "handle": "bigcases.bots.law",
+        "did": "did:plc:bigcases",
+    }
+
+
+@patch("bc.channel.utils.connectors.bluesky_api.client.requests")
+@patch("bc.channel.utils.connectors.bluesky_api.client.r")
+class BlueskySessionTest(SimpleTestCase):
+    def test_reuses_cached_session(self, mock_redis, mock_requests):
+        session_data = make_session_data()
+        mock_redis.get.return_value = json.dumps(session_data)
+
+        api = BlueskyAPI("bigcases.bots.law", fake_token())
+
+        self.assertEqual(api._session.accessJwt, session_data["accessJwt"])
+        mock_requests.post.assert_not_called()
+
+    def test_creates_session_if_none_is_cached(
+        self, mock_redis, mock_requests
+    ):
+        session_data = make_session_data()
+        mock_redis.get.return_value = None
+        mock_requests.post.return_value = MagicMock(
+            status_code=200, headers={}, json=lambda: session_data
+        )
+
+        api = BlueskyAPI("bigcases.bots.law", fake_token())
+
+        self.assertEqual(api._session.accessJwt, session_data["accessJwt"])
+        url = mock_requests.post.call_args.args[0]
+        self.assertTrue(url.endswith("com.atproto.server.createSession"))
+        key, cached_session = mock_redis.set.call_args.args
+        self.assertEqual(key, "bluesky_session_bigcases.bots.law")
+        self.assertEqual(
+            json.loads(cached_session)["refreshJwt"],
+            session_data["refreshJwt"],
+        )
+
+    def test_refreshes_expired_session(self, mock_redis, mock_requests):
+        expired_session = make_session_data(expires_in=-10)
+        refreshed_session = make_session_data()
+        mock_redis.get.return_value = json.dumps(expired_session)
+        mock_requests.post.return_value = MagicMock(
+            ok=True,
+            status_code=200,
+            headers={},
+            json=lambda: refreshed_session,
+        )
+
+        api = BlueskyAPI("bigcases.bots.law", fake_token())
+
+        self.assertEqual(
+            api._session.accessJwt, refreshed_session["accessJwt"]
+        )
+        mock_requests.post.assert_called_once()
+        url = mock_requests.post.call_args.args[0]
+        self.assertTrue(url.endswith("com.atproto.server.refreshSession"))
+        self.assertEqual(
+            mock_requests.post.call_args.kwargs["headers"],
+            {"Authorization": f"Bearer {expired_session['refreshJwt']}"},
+        )
+
+    def test_creates_session_if_refresh_fails(self, mock_redis, mock_requests):
+        new_session = make_session_data()
+        mock_redis.get.return_value = json.dumps(
+            make_session_data(expires_in=-10)
+        )
+        mock_requests.post.side_effect = [
+            MagicMock(ok=False, status_code=400, headers={}),
+            MagicMock(status_code=200, headers={}, json=lambda: new_session),
+        ]
+
+        api = BlueskyAPI("bigcases.bots.law", fake_token())
+
+        self.assertEqual(api._session.accessJwt, new_session["accessJwt"])
+        refresh_call, create_call = mock_requests.post.call_args_list
+        self.assertTrue(
+            refresh_call.args[0].endswith("com.atproto.server.refreshSession")
+        )
+        self.assertTrue(
+            create_call.args[0].endswith("com.atproto.server.createSession")
+        )
+
+    def test_retries_request_after_expired_token(
+        self, mock_redis, mock_requests
+    ):
+        session_data = make_session_data()
+        refreshed_session = make_session_data()
+        mock_redis.get.return_value = json.dumps(session_data)
+        mock_requests.post.side_effect = [
+            MagicMock(
+                status_code=400,
+                headers={},
+                json=lambda: {"error": "ExpiredToken"},
+            ),
+            MagicMock(
+                ok=True,
+                status_code=200,
+                headers={},
+                json=lambda: refreshed_session,
+            ),
+            MagicMock(status_code=200, headers={}, json=lambda: {"cid": "1"}),
+        ]
+
+        api = BlueskyAPI("bigcases.bots.law", fake_token())
+        response = api.status_post("this is the message", [])
+
+        self.assertEqual(response, {"cid": "1"})
+        first_post, _, second_post = mock_requests.post.call_args_list
+        self.assertEqual(
+            first_post.kwargs["headers"]["Authorization"],
+            f"Bearer {session_data['accessJwt']}",
+        )
+        self.assertEqual(
+            second_post.kwargs["headers"]["Authorization"],
+            f"Bearer {refreshed_session['accessJwt']}",
+        )
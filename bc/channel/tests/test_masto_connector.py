@@ -1,6 +1,7 @@
 from unittest.mock import call, patch
 
 from django.test import SimpleTestCase
+from mastodon.errors import MastodonNetworkError
 
 from bc.channel.tests.factories import fake_token
 from bc.channel.utils.connectors.masto import (
@@ -118,7 +119,12 @@ class AddStatusTest(SimpleTestCase):
             "The entry's text: the image description",
         )
 
-    @patch.object(MastodonConnector, "upload_media", side_effect=[2, 3, 5, 8])
+    @patch.object(
+        MastodonConnector,
+        "upload_media",
+        # ids match the size of the thumbnails so the order can be checked
+        side_effect=lambda media, _alt_text: len(media),
+    )
     @patch("mastodon.Mastodon")
     @patch.object(MastodonConnector, "get_api_object")
     def test_has_thumbnails(
@@ -172,6 +178,64 @@ class AddStatusTest(SimpleTestCase):
             expected_upload_media_calls, any_order=True
         )
 
+    @patch.object(MastodonConnector, "upload_media")
+    @patch("bc.core.utils.images.TextImage")
+    @patch.object(MastodonConnector, "get_api_object")
+    def test_skips_text_image_if_upload_fails(
+        self, _mock_get_api, mock_image, mock_upload_media
+    ):
+        mock_image.to_bytes.return_value = b"image"
+
+        def upload(media, _alt_text):
+            if media == b"image":
+                raise MastodonNetworkError()
+            return len(media)
+
+        mock_upload_media.side_effect = upload
+
+        mastodon_conn = MastodonConnector(
+            fake_token(), fake_token(), fake_token()
+        )
+        mastodon_conn.add_status(
+            "this has an image and 2 thumbnails",
+            text_image=mock_image,
+            thumbnails=[faker.binary(2), faker.binary(3)],
+        )
+
+        mastodon_conn.api.status_post.assert_called_with(
+            "this has an image and 2 thumbnails",
+            media_ids=[2, 3],
+        )
+
+    @patch.object(MastodonConnector, "upload_media")
+    @patch("bc.core.utils.images.TextImage")
+    @patch.object(MastodonConnector, "get_api_object")
+    def test_drops_all_media_if_a_thumbnail_upload_fails(
+        self, _mock_get_api, mock_image, mock_upload_media
+    ):
+        mock_image.to_bytes.return_value = b"image"
+
+        def upload(media, _alt_text):
+            if len(media) == 3:
+                raise MastodonNetworkError()
+            return len(media)
+
+        mock_upload_media.side_effect = upload
+
+        mastodon_conn = MastodonConnector(
+            fake_token(), fake_token(), fake_token()
+        )
+        mastodon_conn.add_status(
+            "this has an image and 3 thumbnails",
+            text_image=mock_image,
+            thumbnails=[faker.binary(2), faker.binary(3), faker.binary(4)],
+        )
+
+        mastodon_conn.api.status_post.assert_called_with(
+            "this has an image and 3 thumbnails",
+            media_ids=[],
+        )
+
 
 class ReprTest(SimpleTestCase):
     @patch("mastodon.Mastodon")
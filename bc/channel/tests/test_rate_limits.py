@@ -0,0 +1,147 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from bc.channel.tests.factories import ChannelFactory
+from bc.channel.utils.rate_limits import (
+    RateLimitExceeded,
+    add_status_with_rate_limits,
+    block_channel,
+    delay_on_rate_limit,
+    get_reset_time_if_exhausted,
+    get_retry_after,
+    r,
+    take_post_token,
+)
+
+
+@override_settings(
+    SERVICE_POST_RATE_LIMITS={"mastodon": (1_000, 1)},
+    CHANNEL_POST_RATE_LIMITS={"mastodon": (2, 60 * 60)},
+)
+class TakePostTokenTest(TestCase):
+    def setUp(self) -> None:
+        self.channel = ChannelFactory(mastodon=True)
+        keys = [
+            f"rate_limit:block:channel:{self.channel.pk}",
+            f"rate_limit:bucket:channel:{self.channel.pk}",
+        ]
+        self.addCleanup(r.delete, *keys)
+
+    def test_raises_once_the_bucket_is_empty(self):
+        take_post_token(self.channel)
+        take_post_token(self.channel)
+
+        with self.assertRaises(RateLimitExceeded) as cm:
+            take_post_token(self.channel)
+
+        # One token is added to the bucket every 30 minutes
+        self.assertAlmostEqual(cm.exception.retry_after, 30 * 60, delta=5)
+
+    def test_raises_while_the_channel_is_blocked(self):
+        block_channel(self.channel, 120)
+
+        with self.assertRaises(RateLimitExceeded) as cm:
+            take_post_token(self.channel)
+
+        self.assertAlmostEqual(cm.exception.retry_after, 120, delta=5)
+        # A blocked request doesn't use the tokens of the channel
+        r.delete(f"rate_limit:block:channel:{self.channel.pk}")
+        take_post_token(self.channel)
+        take_post_token(self.channel)
+
+
+class RateLimitHeadersTest(SimpleTestCase):
+    def test_uses_retry_after_header(self):
+        self.assertEqual(get_retry_after({"Retry-After": "30"}), 30)
+
+    def test_uses_reset_header(self):
+        headers = {"x-rate-limit-reset": str(time.time() + 60)}
+        retry_after = get_retry_after(headers, "x-rate-limit-reset")
+        self.assertAlmostEqual(retry_after, 60, delta=1)
+
+    @override_settings(RATE_LIMIT_DEFAULT_WAIT=900)
+    def test_uses_default_wait(self):
+        self.assertEqual(get_retry_after({}, "x-rate-limit-reset"), 900)
+        self.assertEqual(get_retry_after({"Retry-After": "soon"}), 900)
+
+    def test_returns_reset_time_if_exhausted(self):
+        headers = {"ratelimit-remaining": "0", "ratelimit-reset": "1700000000"}
+        self.assertEqual(
+            get_reset_time_if_exhausted(
+                headers, "ratelimit-remaining", "ratelimit-reset"
+            ),
+            1700000000,
+        )
+        headers["ratelimit-remaining"] = "4"
+        self.assertIsNone(
+            get_reset_time_if_exhausted(
+                headers, "ratelimit-remaining", "ratelimit-reset"
+            )
+        )
+
+
+@patch("bc.channel.utils.rate_limits.block_channel")
+@patch("bc.channel.utils.rate_limits.take_post_token")
+class AddStatusWithRateLimitsTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.channel = MagicMock(pk=1)
+        self.api = MagicMock()
+        self.api.rate_limit_reset_time = None
+
+    def test_can_add_status(self, mock_take_token, mock_block):
+        self.api.add_status.return_value = "42"
+
+        status_id = add_status_with_rate_limits(
+            self.channel, self.api, "message", None, None
+        )
+
+        self.assertEqual(status_id, "42")
+        mock_take_token.assert_called_once_with(self.channel)
+        self.api.add_status.assert_called_once_with("message", None, None)
+        mock_block.assert_not_called()
+
+    def test_blocks_channel_if_service_rejects_post(
+        self, mock_take_token, mock_block
+    ):
+        self.api.add_status.side_effect = RateLimitExceeded(60)
+
+        with self.assertRaises(RateLimitExceeded):
+            add_status_with_rate_limits(self.channel, self.api, "message")
+
+        mock_block.assert_called_once_with(self.channel, 60)
+
+    def test_blocks_channel_if_no_requests_are_left(
+        self, mock_take_token, mock_block
+    ):
+        self.api.rate_limit_reset_time = time.time() + 300
+
+        add_status_with_rate_limits(self.channel, self.api, "message")
+
+        mock_block.assert_called_once()
+        _, seconds = mock_block.call_args.args
+        self.assertAlmostEqual(seconds, 300, delta=1)
+
+
+@patch("bc.channel.utils.rate_limits.queue")
+class DelayOnRateLimitTest(SimpleTestCase):
+    def test_reschedules_job_on_rate_limit(self, mock_queue):
+        mock_job = MagicMock(side_effect=RateLimitExceeded(9.5))
+        job = delay_on_rate_limit(mock_job)
+
+        result = job(1, "message", thumbnails=None)
+
+        self.assertIsNone(result)
+        mock_queue.enqueue_in.assert_called_once()
+        time_delta, func, *args = mock_queue.enqueue_in.call_args.args
+        self.assertEqual(time_delta.total_seconds(), 10)
+        self.assertEqual(func, job)
+        self.assertEqual(args, [1, "message"])
+        self.assertIsNone(mock_queue.enqueue_in.call_args.kwargs["thumbnails"])
+
+    def test_returns_result_of_job(self, mock_queue):
+        job = delay_on_rate_limit(MagicMock(return_value="42"))
+
+        self.assertEqual(job(1, "message"), "42")
+        mock_queue.enqueue_in.assert_not_called()
@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from bc.channel.models import Channel
+from bc.channel.tasks import post_status
+from bc.channel.tests.factories import ChannelFactory
+
+
+@patch("bc.channel.tasks.add_status_with_rate_limits", return_value="1")
+@patch.object(Channel, "get_api_wrapper")
+class PostStatusTest(TestCase):
+    channel = None
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.channel = ChannelFactory(mastodon=True)
+
+    @patch("bc.channel.tasks.get_artifacts", return_value=[b"thumbnail"])
+    def test_reads_thumbnails_from_artifacts(
+        self, mock_get_artifacts, mock_api, mock_add_status
+    ):
+        post_status(self.channel.pk, "message", thumbnails_key="key")
+
+        mock_get_artifacts.assert_called_once_with("key")
+        self.assertEqual(mock_add_status.call_args.args[-1], [b"thumbnail"])
+
+    @patch("bc.channel.tasks.get_artifacts", return_value=None)
+    def test_posts_without_expired_thumbnails(
+        self, mock_get_artifacts, mock_api, mock_add_status
+    ):
+        post_status(self.channel.pk, "message", thumbnails_key="key")
+
+        self.assertIsNone(mock_add_status.call_args.args[-1])
@@ -1,4 +1,4 @@
-from unittest.mock import call, patch
+from unittest.mock import MagicMock, call, patch
 
 from django.test import SimpleTestCase
 
@@ -104,7 +104,12 @@ class AddStatusTest(SimpleTestCase):
             "The entry's text: the image description",
         )
 
-    @patch.object(TwitterConnector, "upload_media", side_effect=[2, 3, 5, 8])
+    @patch.object(
+        TwitterConnector,
+        "upload_media",
+        # ids match the size of the thumbnails so the order can be checked
+        side_effect=lambda media, _alt_text: len(media),
+    )
     @patch("TwitterAPI.TwitterAPI.TwitterAPI")
     @patch.object(TwitterConnector, "get_api_object")
     def test_has_thumbnails(
@@ -179,6 +184,44 @@ class AddStatusTest(SimpleTestCase):
         )
 
 
+class RateLimitTest(SimpleTestCase):
+    def make_response(self, remaining, reset):
+        return MagicMock(
+            status_code=200,
+            headers={
+                "x-rate-limit-remaining": str(remaining),
+                "x-rate-limit-reset": str(reset),
+            },
+        )
+
+    @patch.object(TwitterConnector, "get_api_object")
+    def test_keeps_latest_reset_time_of_uploads(self, _mock_get_api):
+        twitter_conn = TwitterConnector(
+            fake_token(), fake_token(), fake_token()
+        )
+
+        # Uploads finish in any order, so an upload with requests left or
+        # an earlier reset time doesn't replace the latest one
+        twitter_conn._check_rate_limit(self.make_response(0, 2000))
+        twitter_conn._check_rate_limit(self.make_response(5, 3000))
+        twitter_conn._check_rate_limit(self.make_response(0, 1000))
+
+        self.assertEqual(twitter_conn.rate_limit_reset_time, 2000)
+
+    @patch.object(TwitterConnector, "get_api_object")
+    def test_resets_rate_limit_for_each_status(self, mock_get_api):
+        mock_get_api().request().json.return_value = {"data": {"id": "1"}}
+        mock_get_api().request().headers = {}
+        twitter_conn = TwitterConnector(
+            fake_token(), fake_token(), fake_token()
+        )
+        twitter_conn._check_rate_limit(self.make_response(0, 2000))
+
+        twitter_conn.add_status("this is the message")
+
+        self.assertIsNone(twitter_conn.rate_limit_reset_time)
+
+
 class ReprTest(SimpleTestCase):
     @patch("TwitterAPI.TwitterAPI.TwitterAPI")
     @patch.object(TwitterConnector, "get_api_object")
@@ -1,5 +1,8 @@
-from typing import Protocol, Union
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol, TypeVar, Union
 
+from django.conf import settings
 from mastodon import Mastodon
 from TwitterAPI import TwitterAPI
 
@@ -11,6 +14,50 @@ from .bluesky_api.types import ImageBlob
 
 ApiWrapper = Union[Mastodon, TwitterAPI, BlueskyAPI, ThreadsAPI]  # noqa: UP007
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def upload_media_concurrently(
+    upload: Callable[[T], R],
+    items: Sequence[T],
+    max_workers: int | None = None,
+) -> list[R | Exception]:
+    """
+    Calls the upload function once per item using a bounded pool of threads.
+
+    The results are returned in the same order as the items. Exceptions
+    raised by an upload are returned in place of its result instead of being
+    raised, so each connector can apply its own partial-failure behavior
+    while reading the results in order, just like it would after a loop of
+    sequential uploads.
+
+    Args:
+        upload (Callable): Function that uploads a single item.
+        items (Sequence): Items to upload.
+        max_workers (int | None): Maximum number of concurrent uploads.
+        Defaults to the MEDIA_UPLOAD_MAX_WORKERS setting.
+
+    Returns:
+        list[R | Exception]: the result or the exception of each upload.
+    """
+
+    def safe_upload(item: T) -> R | Exception:
+        try:
+            return upload(item)
+        except Exception as e:
+            return e
+
+    max_workers = max_workers or settings.MEDIA_UPLOAD_MAX_WORKERS
+    if len(items) <= 1 or max_workers <= 1:
+        return [safe_upload(item) for item in items]
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(items)),
+        thread_name_prefix="media-upload",
+    ) as executor:
+        return list(executor.map(safe_upload, items))
+
 
 class BaseAPIConnector(Protocol):
     def get_api_object(self, version: str | None = None) -> ApiWrapper:
@@ -36,7 +83,9 @@ class BaseAPIConnector(Protocol):
         creates a media attachment to be used with a new status.
 
         This method should handle extra step if needed to provide additional
-        information about the uploaded file.
+        information about the uploaded file. Connectors call it from several
+        threads at once through `upload_media_concurrently`, so it must not
+        rely on state shared between uploads.
 
         Args:
             media (bytes): The file to be attached.
@@ -66,11 +115,25 @@ class BaseAPIConnector(Protocol):
             text_image (TextImage | None): Image to attach to the new status
             thumbnails ( list[bytes] | None): list of thumbnail images to include
 
+        Raises:
+            RateLimitExceeded: if the service rejected a request because the
+            rate limit of the account was reached.
+
         Returns:
             int: The unique identifier for the new status.
         """
         ...
 
+    @property
+    def rate_limit_reset_time(self) -> float | None:
+        """
+        Returns the epoch time when the rate limit of the account resets if
+        the last response from the service showed that no requests are
+        left. Returns None otherwise or if the service doesn't send rate
+        limit headers.
+        """
+        ...
+
 
 class RefreshableBaseAPIConnector(BaseAPIConnector, Protocol):
     """
@@ -1,6 +1,8 @@
 from bc.core.utils.images import TextImage
+from bc.core.utils.media import MEDIA_SPECS, fit_image_to_spec, get_mime_type
 
 from .alt_text_utils import text_image_alt_text, thumb_num_alt_text
+from .base import upload_media_concurrently
 from .bluesky_api.client import BlueskyAPI
 from .bluesky_api.types import ImageBlob, Thumbnail
 
@@ -17,8 +19,12 @@ class BlueskyConnector:
     def upload_media(
         self, media: bytes, _alt_text: str | None = None
     ) -> ImageBlob | None:
-        """Upload a new blob to be added to a post in a later request."""
-        return self.api.post_media(media, mime_type="image/png")
+        """
+        Upload a new blob to be added to a post in a later request. Images
+        over the size limit of Bluesky are converted to JPEG first.
+        """
+        media = fit_image_to_spec(media, MEDIA_SPECS["bluesky"])
+        return self.api.post_media(media, mime_type=get_mime_type(media))
 
     def add_status(
         self,
@@ -27,32 +33,36 @@ class BlueskyConnector:
         thumbnails: list[bytes] | None = None,
     ) -> str:
         """Send post with attached image."""
-        media: list[Thumbnail] = []
+        images: list[tuple[bytes, str]] = []
         if text_image:
-            blob = self.upload_media(text_image.to_bytes(), None)
-            if blob:
-                media.append(
-                    {
-                        "alt": text_image_alt_text(text_image.description),
-                        "image": blob,
-                    }
+            images.append(
+                (
+                    text_image.to_bytes(),
+                    text_image_alt_text(text_image.description),
                 )
+            )
+        for idx, thumbnail in enumerate(thumbnails or []):
+            images.append((thumbnail, thumb_num_alt_text(idx)))
 
-        if thumbnails:
-            for idx, thumbnail in enumerate(thumbnails):
-                blob = self.upload_media(thumbnail, None)
-                if not blob:
-                    continue
-                media.append(
-                    {
-                        "alt": thumb_num_alt_text(idx),
-                        "image": blob,
-                    }
-                )
+        blobs = upload_media_concurrently(
+            lambda image: self.upload_media(image[0], None), images
+        )
+
+        media: list[Thumbnail] = []
+        for (_, alt_text), blob in zip(images, blobs, strict=True):
+            if isinstance(blob, Exception):
+                raise blob
+            if not blob:
+                continue
+            media.append({"alt": alt_text, "image": blob})
 
         api_response = self.api.status_post(message, media)
 
         return api_response["cid"]
 
+    @property
+    def rate_limit_reset_time(self) -> float | None:
+        return self.api.rate_limit_reset_time
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__module__}.{self.__class__.__name__}: identifier:'{self.identifier}'>"
@@ -1,12 +1,25 @@
+import base64
+import json
 import logging
 import re
-from datetime import UTC, datetime
+import threading
+import time
+from dataclasses import asdict, fields
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup
 from requests import HTTPError, ReadTimeout
 
+from bc.channel.utils.rate_limits import (
+    RateLimitExceeded,
+    get_reset_time_if_exhausted,
+    get_retry_after,
+)
+from bc.core.utils.redis import make_redis_interface
+
 from .types import (
     ImageBlob,
     Record,
@@ -23,6 +36,38 @@ _BASE_API_URL = "https://bsky.social/xrpc"
 _DEFAULT_CONTENT_TYPE = "application/json"
 DEFAULT_LANGUAGE_CODE1 = "en"
 
+# Refresh tokens are valid for two months, so the cached session is
+# forgotten after that even if it's never used.
+_SESSION_TTL = timedelta(days=60)
+# Access tokens that expire within this number of seconds are refreshed
+# before they're used.
+_ACCESS_TOKEN_EXPIRATION_MARGIN = 60
+
+r = make_redis_interface("CACHE")
+
+
+def get_token_expiration(token: str) -> float | None:
+    """
+    Reads the expiration time of a JWT.
+
+    The signature isn't verified, the claim is only used to know when the
+    token must be refreshed.
+
+    Args:
+        token (str): The JWT.
+
+    Returns:
+        float | None: The epoch time of the "exp" claim or None if the token
+        can't be decoded.
+    """
+    try:
+        payload = token.split(".")[1]
+        padding = "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload + padding))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
 
 class BlueskyAPI:
     def __init__(
@@ -31,11 +76,101 @@ class BlueskyAPI:
         self._identifier = identifier
         self._password = password
         self._timeout = timeout
+        self.rate_limit_reset_time: float | None = None
+        self._session_lock = threading.Lock()
         self._session = self._get_session()
 
+    def _check_rate_limit(self, response: requests.Response) -> None:
+        """
+        Reads the rate limit headers of a response and raises an exception
+        if the request was rejected because of them.
+        """
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            raise RateLimitExceeded(
+                get_retry_after(response.headers, "ratelimit-reset")
+            )
+        self.rate_limit_reset_time = get_reset_time_if_exhausted(
+            response.headers, "ratelimit-remaining", "ratelimit-reset"
+        )
+
+    def _get_session_key(self) -> str:
+        """
+        Returns the Redis key used for storing the session of the account.
+        """
+        return f"bluesky_session_{self._identifier}"
+
     def _get_session(self) -> Session:
         """
-        Create an authentication session
+        Returns a session for the account.
+
+        The session stored in the cache is reused while its access token is
+        valid. An expired access token is refreshed and a new session is
+        only created with the password of the account if the refresh fails.
+
+        Returns:
+            Session: session with the "accessJwt", "refreshJwt", "handle" and "did"
+        """
+        session = self._get_cached_session()
+        if session is None:
+            return self._create_session()
+
+        expiration = get_token_expiration(session.accessJwt)
+        if (
+            expiration is None
+            or expiration - time.time() < _ACCESS_TOKEN_EXPIRATION_MARGIN
+        ):
+            return self._refresh_session(session) or self._create_session()
+        return session
+
+    def _get_cached_session(self) -> Session | None:
+        """
+        Returns the session stored in the cache for the account, if any.
+        """
+        try:
+            cached_session = r.get(self._get_session_key())
+        except Exception as e:
+            logger.error(
+                f"Could not retrieve cached Bluesky session, will create a new one.\n"
+                f"Redis error: {e}"
+            )
+            return None
+
+        if cached_session is None:
+            return None
+        return self._make_session(json.loads(cached_session))
+
+    def _cache_session(self, session: Session) -> None:
+        """
+        Stores the session of the account in the cache.
+
+        Args:
+            session (Session): The session to store.
+        """
+        key = self._get_session_key()
+        try:
+            r.set(key, json.dumps(asdict(session)), ex=_SESSION_TTL)
+        except Exception as e:
+            logger.error(f"Could not set {key} in cache:\n{e}")
+
+    @staticmethod
+    def _make_session(data: dict) -> Session:
+        """
+        Creates a Session using the fields it knows from a response.
+        """
+        known_fields = {
+            session_field.name for session_field in fields(Session)
+        }
+        return Session(
+            **{
+                key: value
+                for key, value in data.items()
+                if key in known_fields
+            }
+        )
+
+    def _create_session(self) -> Session:
+        """
+        Creates a new session using the password of the account.
 
         Returns:
             Session: response with the "accessJwt", "refreshJwt", "handle" and "did"
@@ -51,7 +186,101 @@ class BlueskyAPI:
             },
             timeout=self._timeout,
         )
-        return Session(**response.json())
+        self._check_rate_limit(response)
+        response.raise_for_status()
+        session = self._make_session(response.json())
+        self._cache_session(session)
+        return session
+
+    def _refresh_session(self, session: Session) -> Session | None:
+        """
+        Gets new tokens for the session using its refresh token.
+
+        Args:
+            session (Session): The session to refresh.
+
+        Returns:
+            Session | None: the refreshed session or None if the refresh
+            token was rejected.
+        """
+        response = requests.post(
+            f"{_BASE_API_URL}/com.atproto.server.refreshSession",
+            headers={"Authorization": f"Bearer {session.refreshJwt}"},
+            timeout=self._timeout,
+        )
+        self._check_rate_limit(response)
+        if not response.ok:
+            logger.warning(
+                f"Could not refresh the Bluesky session of {self._identifier}, "
+                f"will create a new one.\n"
+                f"Response: {response.text}"
+            )
+            return None
+
+        refreshed_session = self._make_session(
+            {**asdict(session), **response.json()}
+        )
+        self._cache_session(refreshed_session)
+        return refreshed_session
+
+    def _renew_session(self, expired_access_token: str) -> None:
+        """
+        Replaces a session whose access token was rejected by the server.
+
+        Uploads run in several threads, so the session is only renewed once
+        even if many requests found the same expired token.
+
+        Args:
+            expired_access_token (str): The access token that was rejected.
+        """
+        with self._session_lock:
+            if self._session.accessJwt != expired_access_token:
+                return
+            self._session = (
+                self._refresh_session(self._session) or self._create_session()
+            )
+
+    def _authorized_post(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a POST request using the access token of the session.
+
+        If the server says the access token expired, the session is renewed
+        and the request is sent again.
+
+        Args:
+            url (str): The URL of the request.
+            **kwargs: Arguments of `requests.post`.
+
+        Returns:
+            requests.Response: The response of the server.
+        """
+        headers = kwargs.pop("headers", {})
+        for attempt in range(2):
+            access_token = self._session.accessJwt
+            response = requests.post(
+                url,
+                headers={**headers, "Authorization": f"Bearer {access_token}"},
+                timeout=self._timeout,
+                **kwargs,
+            )
+            if attempt or not self._is_expired_token_response(response):
+                break
+            self._renew_session(access_token)
+
+        self._check_rate_limit(response)
+        return response
+
+    @staticmethod
+    def _is_expired_token_response(response: requests.Response) -> bool:
+        if response.status_code not in (
+            HTTPStatus.BAD_REQUEST,
+            HTTPStatus.UNAUTHORIZED,
+        ):
+            return False
+        try:
+            return response.json().get("error") == "ExpiredToken"
+        except ValueError:
+            return False
 
     def post_media(self, media: bytes, mime_type: str) -> ImageBlob | None:
         """
@@ -71,14 +300,10 @@ class BlueskyAPI:
             )
             return None
 
-        resp = requests.post(
+        resp = self._authorized_post(
             f"{_BASE_API_URL}/com.atproto.repo.uploadBlob",
-            headers={
-                "Content-Type": mime_type,
-                "Authorization": f"Bearer {self._session.accessJwt}",
-            },
+            headers={"Content-Type": mime_type},
             data=media,
-            timeout=self._timeout,
         )
         resp.raise_for_status()
         blob = resp.json()["blob"]
@@ -382,15 +607,13 @@ class BlueskyAPI:
                     "external": card,
                 }
 
-        response = requests.post(
+        response = self._authorized_post(
             f"{_BASE_API_URL}/com.atproto.repo.createRecord",
-            headers={"Authorization": f"Bearer {self._session.accessJwt}"},
             json={
                 "repo": self._session.did,
                 "collection": "app.bsky.feed.post",
                 "record": message_object,
             },
-            timeout=self._timeout,
         )
 
         return response.json()
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal, NotRequired, TypedDict
 
 
@@ -8,11 +8,11 @@ class Session:
     did: str
     handle: str
     refreshJwt: str
-    didDoc: dict
-    email: str
-    emailConfirmed: bool
-    emailAuthFactor: bool
-    active: bool
+    didDoc: dict = field(default_factory=dict)
+    email: str = ""
+    emailConfirmed: bool = False
+    emailAuthFactor: bool = False
+    active: bool = True
     status: str = ""
 
 
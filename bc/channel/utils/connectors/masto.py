@@ -1,6 +1,7 @@
 import base64
 import logging
 import re
+import time
 from textwrap import shorten
 
 from django.conf import settings
@@ -9,17 +10,26 @@ from mastodon import Mastodon
 from mastodon.errors import (
     MastodonGatewayTimeoutError,
     MastodonNetworkError,
+    MastodonRatelimitError,
     MastodonServerError,
 )
 
+from bc.channel.utils.rate_limits import RateLimitExceeded
 from bc.core.utils.images import TextImage
 
 from .alt_text_utils import text_image_alt_text, thumb_num_alt_text
-from .base import ApiWrapper
+from .base import ApiWrapper, upload_media_concurrently
 
 masto_regex = re.compile(r"@(.+)@(.+)")
 logger = logging.getLogger(__name__)
 
+# Upload errors that don't prevent the post from being created
+MEDIA_UPLOAD_ERRORS = (
+    MastodonServerError,
+    MastodonGatewayTimeoutError,
+    MastodonNetworkError,
+)
+
 
 def get_handle_parts(handle: str) -> tuple[str, str]:
     """
@@ -50,6 +60,9 @@ class MastodonConnector:
             api_base_url=self.base_url,
             access_token=self.access_token,
             request_timeout=60,
+            # Don't block the worker until the limit resets, the job is
+            # delayed instead.
+            ratelimit_method="throw",
         )
 
         logger.debug(f"Created Mastodon instance: {mastodon}")
@@ -75,42 +88,62 @@ class MastodonConnector:
         text_image: TextImage | None = None,
         thumbnails: list[bytes] | None = None,
     ) -> int:
-        media_ids = []
+        try:
+            return self._add_status(message, text_image, thumbnails)
+        except MastodonRatelimitError as e:
+            raise RateLimitExceeded(
+                self.api.ratelimit_reset - time.time()
+            ) from e
+
+    def _add_status(
+        self,
+        message: str,
+        text_image: TextImage | None = None,
+        thumbnails: list[bytes] | None = None,
+    ) -> int:
+        media: list[tuple[bytes, str]] = []
         if text_image:
-            try:
-                media_id = self.upload_media(
+            media.append(
+                (
                     text_image.to_bytes(),
                     text_image_alt_text(text_image.description),
                 )
-                media_ids.append(media_id)
-            except (
-                MastodonServerError,
-                MastodonGatewayTimeoutError,
-                MastodonNetworkError,
-            ):
-                # clean the media array
-                media_ids = []
+            )
+        for idx, thumbnail in enumerate(thumbnails or []):
+            media.append((thumbnail, thumb_num_alt_text(idx)))
 
-        if thumbnails:
-            for idx, thumbnail in enumerate(thumbnails):
-                try:
-                    media_id = self.upload_media(
-                        thumbnail, thumb_num_alt_text(idx)
-                    )
-                    media_ids.append(media_id)
-                except (
-                    MastodonServerError,
-                    MastodonGatewayTimeoutError,
-                    MastodonNetworkError,
-                ):
-                    # clean the media array and break the loop
-                    media_ids = []
-                    break
+        results = upload_media_concurrently(
+            lambda item: self.upload_media(*item), media
+        )
+
+        media_ids = []
+        if text_image:
+            text_image_result, *results = results
+            # the post is created without the text image if its upload fails
+            if not isinstance(text_image_result, Exception):
+                media_ids.append(text_image_result)
+            elif not isinstance(text_image_result, MEDIA_UPLOAD_ERRORS):
+                raise text_image_result
+
+        for result in results:
+            if isinstance(result, MEDIA_UPLOAD_ERRORS):
+                # clean the media array and break the loop
+                media_ids = []
+                break
+            if isinstance(result, Exception):
+                raise result
+            media_ids.append(result)
 
         api_response = self.api.status_post(message, media_ids=media_ids)
 
         return api_response["id"]
 
+    @property
+    def rate_limit_reset_time(self) -> float | None:
+        if self.api.ratelimit_remaining > 0:
+            return None
+        return self.api.ratelimit_reset
+
     def get_keys(self):
         if (
             settings.MASTODON_SHARED_KEY
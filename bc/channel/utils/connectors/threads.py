@@ -3,6 +3,7 @@ import logging
 from bc.core.utils.images import TextImage
 
 from .alt_text_utils import text_image_alt_text, thumb_num_alt_text
+from .base import upload_media_concurrently
 from .threads_api.client import ThreadsAPI
 
 logger = logging.getLogger(__name__)
@@ -87,8 +88,6 @@ class ThreadsConnector:
         Returns:
             str: The ID of the published status.
         """
-        media: list[str] = []
-
         # Count media elements to determine type of post:
         multiple_thumbnails = thumbnails is not None and len(thumbnails) > 1
         text_image_and_thumbnail = (
@@ -98,29 +97,35 @@ class ThreadsConnector:
         )
         is_carousel_item = multiple_thumbnails or text_image_and_thumbnail
 
+        images: list[tuple[bytes, str]] = []
         if text_image:
-            image_url = self.upload_media(text_image.to_bytes())
-            item_container_id = self.api.create_image_container(
-                image_url,
-                message,
-                text_image_alt_text(text_image.description),
-                is_carousel_item,
-            )
-            if item_container_id:
-                media.append(item_container_id)
-
-        if thumbnails:
-            for idx, thumbnail in enumerate(thumbnails):
-                thumbnail_url = self.upload_media(thumbnail)
-                item_container_id = self.api.create_image_container(
-                    thumbnail_url,
-                    message,
-                    thumb_num_alt_text(idx),
-                    is_carousel_item,
+            images.append(
+                (
+                    text_image.to_bytes(),
+                    text_image_alt_text(text_image.description),
                 )
-                if not item_container_id:
-                    continue
-                media.append(item_container_id)
+            )
+        for idx, thumbnail in enumerate(thumbnails or []):
+            images.append((thumbnail, thumb_num_alt_text(idx)))
+
+        def create_item_container(image: tuple[bytes, str]) -> str | None:
+            image_bytes, alt_text = image
+            image_url = self.upload_media(image_bytes)
+            return self.api.create_image_container(
+                image_url, message, alt_text, is_carousel_item
+            )
+
+        # Each image needs an upload to S3 and a container, so both steps
+        # run concurrently for every image.
+        media: list[str] = []
+        for item_container_id in upload_media_concurrently(
+            create_item_container, images
+        ):
+            if isinstance(item_container_id, Exception):
+                raise item_container_id
+            if not item_container_id:
+                continue
+            media.append(item_container_id)
 
         # Determine container id to be published based on media count:
         if len(media) > 1:
@@ -141,6 +146,12 @@ class ThreadsConnector:
 
         return self.api.publish_container(container_id)
 
+    @property
+    def rate_limit_reset_time(self) -> float | None:
+        # Threads doesn't send rate limit headers, rate-limited requests
+        # raise an exception instead.
+        return None
+
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__module__}.{self.__class__.__name__}: "
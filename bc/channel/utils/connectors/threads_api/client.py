@@ -2,10 +2,12 @@ import logging
 import time
 import uuid
 from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
 
 import requests
 
-from bc.core.utils.images import convert_to_jpeg, resize_image
+from bc.channel.utils.rate_limits import RateLimitExceeded, get_retry_after
+from bc.core.utils.media import MEDIA_SPECS, fit_image_to_spec
 from bc.core.utils.redis import make_redis_interface
 from bc.core.utils.s3 import put_object_in_bucket
 
@@ -149,9 +151,15 @@ class ThreadsAPI:
         """
         Attempts to send a POST request to a specified URL with given parameters.
         If the request is successful, the response is returned, otherwise `None` is returned.
+
+        Raises:
+            RateLimitExceeded: if the request was rejected because of the rate
+            limits of the account.
         """
         try:
             response = requests.post(url, params=params, timeout=self._timeout)
+            if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                raise RateLimitExceeded(get_retry_after(response.headers))
             response.raise_for_status()
         except requests.exceptions.Timeout:
             logger.error(
@@ -284,6 +292,8 @@ class ThreadsAPI:
           Threads only accepts JPEG images.
         - Resizes the image to fit within specified width and aspect ratio
           constraints required by Threads.
+        - Skips both steps for images that already meet the requirements,
+          like the variants rendered by the tasks.
         - Uploads the processed image to an S3 bucket with a unique filename,
           generating a public URL that can be passed to Threads API.
 
@@ -293,22 +303,12 @@ class ThreadsAPI:
         Returns:
             str: The public URL of the uploaded image in S3.
         """
-        jpeg_image = convert_to_jpeg(
-            image=media,
-            quality=85,
-        )
-        resized_image = resize_image(
-            image=jpeg_image,
-            min_width=320,
-            max_width=1440,
-            min_aspect_ratio=4 / 5,
-            max_aspect_ratio=1.91,
-        )
+        jpeg_image = fit_image_to_spec(media, MEDIA_SPECS["threads"])
         timestamp = time.strftime("%H%M%S")
         prefix = f"tmp/threads/{time.strftime('%Y/%m/%d')}/"
         file_name_in_bucket = f"{prefix}{timestamp}_{uuid.uuid4().hex}.jpeg"
         image_s3_url = put_object_in_bucket(
-            resized_image,
+            jpeg_image,
             file_name_in_bucket,
         )
         return image_s3_url
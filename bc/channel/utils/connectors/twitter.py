@@ -1,13 +1,20 @@
+from http import HTTPStatus
 from textwrap import shorten
+from threading import Lock
 from typing import Any
 
 from django.conf import settings
-from TwitterAPI import TwitterAPI
+from TwitterAPI import TwitterAPI, TwitterResponse
 
+from bc.channel.utils.rate_limits import (
+    RateLimitExceeded,
+    get_reset_time_if_exhausted,
+    get_retry_after,
+)
 from bc.core.utils.images import TextImage
 
 from .alt_text_utils import text_image_alt_text, thumb_num_alt_text
-from .base import ApiWrapper
+from .base import ApiWrapper, upload_media_concurrently
 
 
 class TwitterConnector:
@@ -19,6 +26,8 @@ class TwitterConnector:
         self.account = account
         self.api: TwitterAPI = self.get_api_object("1.1")
         self.api_v2: TwitterAPI = self.get_api_object("2")
+        self._rate_limit_reset_time: float | None = None
+        self._rate_limit_lock = Lock()
 
     def get_api_object(self, version=None) -> ApiWrapper:
         """
@@ -37,6 +46,7 @@ class TwitterConnector:
         media_response = self.api.request(
             "media/upload", None, {"media": media}
         )
+        self._check_rate_limit(media_response)
         media_id = media_response.json()["media_id"]
         self.api.request(
             "media/metadata/create",
@@ -75,22 +85,27 @@ class TwitterConnector:
         endpoints are available. They still have several items marked as [COMING SOON] and the media
         endpoints are one of them.
         """
-        media_array = []
+        self._rate_limit_reset_time = None
         payload: dict[str, Any] = {"text": message}
+        media: list[tuple[bytes, str]] = []
         if text_image:
-            media_id = self.upload_media(
-                text_image.to_bytes(),
-                text_image_alt_text(text_image.description),
+            media.append(
+                (
+                    text_image.to_bytes(),
+                    text_image_alt_text(text_image.description),
+                )
             )
-            media_array.append(str(media_id))
-            payload["media"] = {"media_ids": media_array}
+        for idx, thumbnail in enumerate(thumbnails or []):
+            media.append((thumbnail, thumb_num_alt_text(idx)))
 
-        if thumbnails:
-            for idx, thumbnail in enumerate(thumbnails):
-                media_id = self.upload_media(
-                    thumbnail, thumb_num_alt_text(idx)
-                )
-                media_array.append(str(media_id))
+        media_array = []
+        for result in upload_media_concurrently(
+            lambda item: self.upload_media(*item), media
+        ):
+            if isinstance(result, Exception):
+                raise result
+            media_array.append(str(result))
+        if media_array:
             payload["media"] = {"media_ids": media_array}
 
         response = self.api_v2.request(
@@ -98,10 +113,37 @@ class TwitterConnector:
             params=payload,
             method_override="POST",
         )
+        self._check_rate_limit(response)
         response.response.raise_for_status()
         data = response.json()
 
         return data["data"]["id"]
 
+    def _check_rate_limit(self, response: TwitterResponse) -> None:
+        """
+        Reads the rate limit headers of a response and raises an exception
+        if the request was rejected because of them.
+        """
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            raise RateLimitExceeded(
+                get_retry_after(response.headers, "x-rate-limit-reset")
+            )
+        reset_time = get_reset_time_if_exhausted(
+            response.headers, "x-rate-limit-remaining", "x-rate-limit-reset"
+        )
+        if reset_time is None:
+            return
+
+        # Media is uploaded from several threads, so the latest reset time
+        # reported by any request of the status is kept.
+        with self._rate_limit_lock:
+            self._rate_limit_reset_time = max(
+                self._rate_limit_reset_time or 0, reset_time
+            )
+
+    @property
+    def rate_limit_reset_time(self) -> float | None:
+        return self._rate_limit_reset_time
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__module__}.{self.__class__.__name__}: account:'{self.account}'>"
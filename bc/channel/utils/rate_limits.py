@@ -0,0 +1,263 @@
+import logging
+import time
+from collections.abc import Callable, Mapping
+from datetime import timedelta
+from functools import wraps
+from math import ceil
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from rq import Retry
+
+from bc.core.utils.queues import QueueRouter
+from bc.core.utils.redis import make_redis_interface
+
+if TYPE_CHECKING:
+    from bc.channel.models import Channel
+
+    from .connectors.base import BaseAPIConnector
+
+logger = logging.getLogger(__name__)
+
+r = make_redis_interface("CACHE")
+queue = QueueRouter()
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a post can't be created until the rate limits of the service
+    or the channel allow it.
+    """
+
+    def __init__(self, retry_after: float) -> None:
+        self.retry_after = max(retry_after, 0.0)
+        super().__init__(
+            f"Rate limit exceeded. Retry in {self.retry_after:.0f} seconds."
+        )
+
+
+# Takes a token from every bucket in KEYS or from none of them.
+#
+# KEYS: the block keys of each scope followed by their bucket keys.
+# ARGV: the current time, followed by the rate (tokens per second) and the
+#       capacity of each bucket.
+#
+# Returns the number of seconds to wait before a token is available, or "0"
+# if the tokens were taken. Numbers are returned as strings because Redis
+# truncates Lua numbers to integers.
+TAKE_TOKEN_SCRIPT = r.register_script(
+    """
+    local scopes = #KEYS / 2
+    local now = tonumber(ARGV[1])
+    local wait = 0
+
+    for i = 1, scopes do
+        local blocked_for = redis.call("PTTL", KEYS[i])
+        if blocked_for > 0 then
+            wait = math.max(wait, blocked_for / 1000)
+        end
+    end
+    if wait > 0 then
+        return tostring(wait)
+    end
+
+    local tokens = {}
+    for i = 1, scopes do
+        local rate = tonumber(ARGV[i * 2])
+        local capacity = tonumber(ARGV[i * 2 + 1])
+        local state = redis.call("HMGET", KEYS[scopes + i], "tokens", "ts")
+        local available = tonumber(state[1]) or capacity
+        local last_update = tonumber(state[2]) or now
+        available = math.min(capacity, available + (now - last_update) * rate)
+        tokens[i] = available
+        if available < 1 then
+            wait = math.max(wait, (1 - available) / rate)
+        end
+    end
+    if wait > 0 then
+        return tostring(wait)
+    end
+
+    for i = 1, scopes do
+        local rate = tonumber(ARGV[i * 2])
+        local capacity = tonumber(ARGV[i * 2 + 1])
+        local key = KEYS[scopes + i]
+        redis.call("HSET", key, "tokens", tostring(tokens[i] - 1), "ts", tostring(now))
+        redis.call("EXPIRE", key, math.ceil(capacity / rate) + 1)
+    end
+    return "0"
+    """
+)
+
+
+def get_rate_limit_scopes(channel: "Channel") -> dict[str, tuple[int, int]]:
+    """
+    Returns the token buckets that a post in the given channel goes through.
+
+    Each bucket is represented by its name and a tuple with the number of
+    posts allowed in a period and the length of that period in seconds. The
+    service bucket is shared by every channel of the same service.
+
+    Args:
+        channel (Channel): The channel that will create the post.
+
+    Returns:
+        dict[str, tuple[int, int]]: The limit of each scope.
+    """
+    service = channel.get_service_display().lower()
+    return {
+        f"service:{service}": settings.SERVICE_POST_RATE_LIMITS[service],
+        f"channel:{channel.pk}": settings.CHANNEL_POST_RATE_LIMITS[service],
+    }
+
+
+def take_post_token(channel: "Channel") -> None:
+    """
+    Takes a token from the service bucket and the channel bucket.
+
+    Args:
+        channel (Channel): The channel that will create the post.
+
+    Raises:
+        RateLimitExceeded: if any of the buckets is empty or blocked.
+    """
+    scopes = get_rate_limit_scopes(channel)
+    keys = [f"rate_limit:block:{scope}" for scope in scopes]
+    keys += [f"rate_limit:bucket:{scope}" for scope in scopes]
+    args: list[float] = [time.time()]
+    for posts, period in scopes.values():
+        args += [posts / period, posts]
+
+    wait = float(TAKE_TOKEN_SCRIPT(keys=keys, args=args))
+    if wait:
+        raise RateLimitExceeded(wait)
+
+
+def block_channel(channel: "Channel", seconds: float) -> None:
+    """
+    Blocks the posts of a channel for the given number of seconds.
+
+    Args:
+        channel (Channel): The channel to block.
+        seconds (float): The time until the service accepts new posts.
+    """
+    logger.warning(
+        f"Rate limit reached for channel {channel}. "
+        f"Delaying posts for {seconds:.0f} seconds."
+    )
+    r.set(
+        f"rate_limit:block:channel:{channel.pk}",
+        1,
+        px=max(ceil(seconds * 1000), 1),
+    )
+
+
+def get_retry_after(
+    headers: Mapping[str, str], reset_header: str | None = None
+) -> float:
+    """
+    Returns the number of seconds to wait after a rate-limited response.
+
+    The value is read from the Retry-After header or from the header with
+    the epoch time when the limit resets. The RATE_LIMIT_DEFAULT_WAIT
+    setting is used when the service doesn't send any of them.
+
+    Args:
+        headers (Mapping[str, str]): The headers of the response.
+        reset_header (str | None): Name of the header with the reset time.
+
+    Returns:
+        float: Seconds to wait before the next request.
+    """
+    try:
+        if "Retry-After" in headers:
+            return float(headers["Retry-After"])
+        if reset_header and reset_header in headers:
+            return float(headers[reset_header]) - time.time()
+    except ValueError:
+        pass
+    return settings.RATE_LIMIT_DEFAULT_WAIT
+
+
+def get_reset_time_if_exhausted(
+    headers: Mapping[str, str], remaining_header: str, reset_header: str
+) -> float | None:
+    """
+    Returns the epoch time when the limit resets if the headers of a
+    response show that no requests are left.
+
+    Args:
+        headers (Mapping[str, str]): The headers of the response.
+        remaining_header (str): Name of the header with the requests left.
+        reset_header (str): Name of the header with the reset time.
+
+    Returns:
+        float | None: The reset time or None if requests are left.
+    """
+    try:
+        if int(headers.get(remaining_header, 1)) > 0:
+            return None
+        return float(headers[reset_header])
+    except (KeyError, ValueError):
+        return None
+
+
+def add_status_with_rate_limits(
+    channel: "Channel",
+    api: "BaseAPIConnector",
+    *args,
+    **kwargs,
+) -> int | str:
+    """
+    Calls `add_status` on the connector once the rate limits allow it, and
+    learns the limits of the channel from the response of the service.
+
+    Args:
+        channel (Channel): The channel that will create the post.
+        api (BaseAPIConnector): The connector of the channel.
+        *args: Arguments of `add_status`.
+        **kwargs: Keyword arguments of `add_status`.
+
+    Raises:
+        RateLimitExceeded: if the post must be delayed.
+
+    Returns:
+        int | str: The unique identifier for the new status.
+    """
+    take_post_token(channel)
+    try:
+        status_id = api.add_status(*args, **kwargs)
+    except RateLimitExceeded as e:
+        block_channel(channel, e.retry_after)
+        raise
+
+    reset_time = api.rate_limit_reset_time
+    if reset_time:
+        block_channel(channel, reset_time - time.time())
+    return status_id
+
+
+def delay_on_rate_limit(func: Callable) -> Callable:
+    """
+    Decorates a job so it's scheduled again, with the same arguments, when
+    it raises RateLimitExceeded instead of failing and using its retries.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except RateLimitExceeded as e:
+            queue.enqueue_in(
+                timedelta(seconds=ceil(e.retry_after)),
+                wrapper,
+                *args,
+                **kwargs,
+                retry=Retry(
+                    max=settings.RQ_MAX_NUMBER_OF_RETRIES,
+                    interval=settings.RQ_POST_RETRY_INTERVALS,
+                ),
+            )
+            return None
+
+    return wrapper
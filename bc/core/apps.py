@@ -7,3 +7,7 @@ class UsersConfig(AppConfig):
     def ready(self):
         # Implicitly connect a signal handlers decorated with @receiver.
         from bc.core import signals  # noqa: F401
+        from bc.core.utils.fonts import preload_fonts
+
+        # Load the fonts once per process instead of once per image
+        preload_fonts()
@@ -0,0 +1,235 @@
+import dataclasses
+import re
+import statistics
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bc.core.utils.images import TextImage
+from bc.core.utils.status import templates
+from bc.core.utils.status.base import BaseTemplate
+from bc.core.utils.thumbnails import THUMBNAIL_ENGINES, get_thumbnail_engine
+from bc.subscription.models import FilingWebhookEvent, FilterRule
+from bc.subscription.utils.filters import (
+    get_compiled_rules,
+    get_filtered_group_ids,
+    is_junk_entry,
+    should_purchase_document,
+)
+
+SAMPLE_TITLE = (
+    "Case: Braidwood Management v. Becerra (ACA prev. care challenge)"
+)
+
+SAMPLE_DESCRIPTION = (
+    "MOTION to Dismiss for Lack of Jurisdiction by Xavier Becerra, United "
+    "States of America. (Attachments: # 1 Proposed Order) (Mooney, "
+    "Christopher) (Entered: 04/10/2023)"
+)
+SAMPLE_LINK = "https://www.courtlistener.com/docket/63290453/braidwood/"
+
+
+def time_function(func: Callable[[], object], iterations: int) -> list[float]:
+    """Calls the function several times and returns the duration of each
+    call in seconds."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+class Command(BaseCommand):
+    help = "Measures the speed of the code that renders posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Number of times each case is run.",
+        )
+        subparsers = parser.add_subparsers(dest="target", required=True)
+
+        thumbnails = subparsers.add_parser(
+            "thumbnails", help="Compare the thumbnail engines."
+        )
+        thumbnails.add_argument(
+            "--file",
+            type=Path,
+            nargs="+",
+            required=True,
+            help="Sample PDF documents.",
+        )
+        thumbnails.add_argument(
+            "--pages",
+            default="[1,2,3,4]",
+            help="Pages rendered from each document.",
+        )
+        thumbnails.add_argument(
+            "--engine",
+            nargs="+",
+            choices=list(THUMBNAIL_ENGINES),
+            default=list(THUMBNAIL_ENGINES),
+            help="Engines to compare. Defaults to all of them.",
+        )
+
+        text_image = subparsers.add_parser(
+            "text-image", help="Time the layout and rendering of text images."
+        )
+        text_image.add_argument(
+            "--length",
+            type=int,
+            nargs="+",
+            default=[200, 1_000, 4_000],
+            help="Number of characters of the sample descriptions.",
+        )
+
+        subparsers.add_parser(
+            "templates",
+            help="Time the creation and formatting of the status templates.",
+        ).add_argument(
+            "--calls",
+            type=int,
+            default=1_000,
+            help="Number of calls timed together in each iteration.",
+        )
+
+        filters = subparsers.add_parser(
+            "filters",
+            help="Time the junk filters over a corpus of descriptions.",
+        )
+        filters.add_argument(
+            "--file",
+            type=Path,
+            help=(
+                "Text file with one docket entry description per line. "
+                "Defaults to the descriptions of the latest webhook events."
+            ),
+        )
+        filters.add_argument(
+            "--limit",
+            type=int,
+            default=10_000,
+            help="Number of webhook events read when no file is given.",
+        )
+
+    def report(self, label: str, timings: list[float]) -> None:
+        self.stdout.write(
+            f"{label}: "
+            f"mean {statistics.mean(timings) * 1000:.1f}ms, "
+            f"median {statistics.median(timings) * 1000:.1f}ms, "
+            f"min {min(timings) * 1000:.1f}ms"
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        target = options["target"].replace("-", "_")
+        getattr(self, f"benchmark_{target}")(options)
+
+    def benchmark_thumbnails(self, options) -> None:
+        # The engines are called directly, so the thumbnail cache is skipped
+        for path in options["file"]:
+            for name in options["engine"]:
+                engine = get_thumbnail_engine(name)
+                with path.open("rb") as document:
+                    render = partial(engine.render, document, options["pages"])
+                    timings = time_function(render, options["iterations"])
+                self.report(f"{path.name} [{name}]", timings)
+
+    def benchmark_text_image(self, options) -> None:
+        sentence = (
+            "Transcript Order Form: re 115 Notice of Appeal, transcript not "
+            "requested (Lynch, Christopher) (Entered: 04/10/2023). "
+        )
+        for length in options["length"]:
+            description = (sentence * (length // len(sentence) + 1))[:length]
+
+            def layout(description=description) -> None:
+                image = TextImage(SAMPLE_TITLE, description, (243, 195, 62))
+                image.width, _ = image.get_initial_dimensions()
+                image.get_max_character_count()
+
+            def render(description=description) -> None:
+                TextImage(SAMPLE_TITLE, description, (243, 195, 62)).render()
+
+            iterations = options["iterations"]
+            self.report(
+                f"{length} chars [layout]", time_function(layout, iterations)
+            )
+            self.report(
+                f"{length} chars [render]", time_function(render, iterations)
+            )
+
+    def benchmark_templates(self, options) -> None:
+        values = {
+            "docket": SAMPLE_TITLE,
+            "description": SAMPLE_DESCRIPTION,
+            "doc_num": 115,
+            "pdf_link": SAMPLE_LINK,
+            "docket_link": SAMPLE_LINK,
+            "docket_id": 63290453,
+            "article_url": SAMPLE_LINK,
+            "date_filed": "2023-04-10",
+            "initial_complaint_type": "Complaint",
+            "initial_complaint_link": SAMPLE_LINK,
+        }
+        calls = options["calls"]
+        for name, template in vars(templates).items():
+            if not isinstance(template, BaseTemplate):
+                continue
+
+            def create(template=template) -> None:
+                for _ in range(calls):
+                    dataclasses.replace(template)
+
+            def format(template=template) -> None:
+                for _ in range(calls):
+                    template.format(**values)
+
+            iterations = options["iterations"]
+            self.report(
+                f"{name} [create x{calls}]", time_function(create, iterations)
+            )
+            self.report(
+                f"{name} [format x{calls}]", time_function(format, iterations)
+            )
+
+    def benchmark_filters(self, options) -> None:
+        if options["file"]:
+            descriptions = options["file"].read_text().splitlines()
+        else:
+            events = FilingWebhookEvent.objects.order_by("-pk")[
+                : options["limit"]
+            ]
+            descriptions = [event.description for event in events]
+        if not descriptions:
+            raise CommandError("There are no descriptions to filter.")
+
+        rules = list(FilterRule.objects.filter(enabled=True))
+        rule_patterns = [
+            re.compile(rule.regex, re.IGNORECASE) for rule in rules
+        ]
+        # Compile the rules before timing them
+        get_compiled_rules()
+
+        def per_rule() -> None:
+            for description in descriptions:
+                for pattern in rule_patterns:
+                    pattern.search(description)
+
+        def compiled() -> None:
+            for description in descriptions:
+                is_junk_entry(description)
+                should_purchase_document(description)
+                get_filtered_group_ids(description)
+
+        iterations = options["iterations"]
+        label = f"{len(descriptions)} descriptions, {len(rules)} rules"
+        self.report(f"{label} [per rule]", time_function(per_rule, iterations))
+        self.report(f"{label} [compiled]", time_function(compiled, iterations))
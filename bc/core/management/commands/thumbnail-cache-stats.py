@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from bc.core.utils.thumbnail_cache import (
+    get_thumbnail_cache_stats,
+    reset_thumbnail_cache_stats,
+)
+
+
+class Command(BaseCommand):
+    help = "Shows the hit rate of the thumbnail cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after showing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_thumbnail_cache_stats()
+        self.stdout.write(f"Disk hits: {stats['disk_hits']}")
+        self.stdout.write(f"Redis hits: {stats['redis_hits']}")
+        self.stdout.write(f"Misses: {stats['misses']}")
+        self.stdout.write(f"Redis tier size: {stats['redis_bytes']} bytes")
+        self.stdout.write(
+            self.style.SUCCESS(f"Hit rate: {stats['hit_rate']:.1%}")
+        )
+
+        if options["reset"]:
+            reset_thumbnail_cache_stats()
@@ -0,0 +1,26 @@
+from django.test import SimpleTestCase
+
+from bc.core.utils.artifacts import get_artifacts, r, store_artifacts
+
+
+class ArtifactsTest(SimpleTestCase):
+    key = "artifacts:test"
+
+    def setUp(self) -> None:
+        self.addCleanup(r.delete, self.key, f"{self.key}:empty")
+
+    def test_can_store_and_read_artifacts(self):
+        store_artifacts(self.key, [b"first", b"second"])
+
+        self.assertEqual(get_artifacts(self.key), [b"first", b"second"])
+        self.assertIsNone(get_artifacts("artifacts:missing"))
+
+    def test_can_store_empty_list(self):
+        store_artifacts(self.key, [b"first"])
+        store_artifacts(self.key, [])
+
+        self.assertEqual(get_artifacts(self.key), [])
+
+        store_artifacts(self.key, [b"first"])
+
+        self.assertEqual(get_artifacts(self.key), [b"first"])
@@ -0,0 +1,87 @@
+import os
+from io import BytesIO
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from PIL import Image
+
+from bc.core.utils.media import (
+    MEDIA_SPECS,
+    MediaSpec,
+    MediaVariants,
+    fit_image_to_spec,
+    fits_spec,
+    get_mime_type,
+)
+
+
+def make_image(
+    size: tuple[int, int], image_format: str = "PNG", noise: bool = False
+) -> bytes:
+    if noise:
+        # Random pixels don't compress, so the file is big
+        image = Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+    else:
+        image = Image.new("RGBA", size, (255, 255, 255, 255))
+    buffer = BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class FitImageToSpecTest(SimpleTestCase):
+    def test_returns_images_that_fit_unchanged(self):
+        image = make_image((600, 800))
+
+        self.assertIs(fit_image_to_spec(image, MEDIA_SPECS["bluesky"]), image)
+
+    def test_converts_images_for_threads(self):
+        image = make_image((1920, 2485))
+
+        variant = fit_image_to_spec(image, MEDIA_SPECS["threads"])
+
+        self.assertEqual(get_mime_type(variant), "image/jpeg")
+        with Image.open(BytesIO(variant)) as img:
+            width, height = img.size
+        self.assertEqual(width, 1440)
+        self.assertAlmostEqual(width / height, 4 / 5, delta=0.01)
+        self.assertTrue(fits_spec(variant, MEDIA_SPECS["threads"]))
+
+    def test_lowers_quality_to_fit_size_limit(self):
+        image = make_image((800, 800), noise=True)
+        spec = MediaSpec(formats=("PNG", "JPEG"), max_bytes=400_000)
+
+        variant = fit_image_to_spec(image, spec)
+
+        self.assertLessEqual(len(variant), 400_000)
+        self.assertEqual(get_mime_type(variant), "image/jpeg")
+        with Image.open(BytesIO(variant)) as img:
+            self.assertEqual(img.size, (800, 800))
+
+    def test_scales_down_images_that_dont_fit_at_min_quality(self):
+        image = make_image((800, 800), noise=True)
+        spec = MediaSpec(formats=("JPEG",), max_bytes=50_000)
+
+        variant = fit_image_to_spec(image, spec)
+
+        self.assertLessEqual(len(variant), 50_000)
+        with Image.open(BytesIO(variant)) as img:
+            self.assertLess(img.size[0], 800)
+
+
+@patch("bc.core.utils.media.fit_image_to_spec", side_effect=lambda i, s: i)
+class MediaVariantsTest(SimpleTestCase):
+    def test_computes_each_variant_once(self, mock_fit):
+        media = MediaVariants([b"thumbnail_1", b"thumbnail_2"])
+
+        media.get("bluesky")
+        media.get("bluesky")
+
+        self.assertEqual(mock_fit.call_count, 2)
+
+    def test_returns_originals_for_platforms_without_specs(self, mock_fit):
+        images = [b"thumbnail"]
+        media = MediaVariants(images)
+
+        self.assertIs(media.get(None), images)
+        self.assertIsNone(MediaVariants(None).get("threads"))
+        mock_fit.assert_not_called()
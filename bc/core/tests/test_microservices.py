@@ -0,0 +1,78 @@
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+from zipfile import ZipFile
+
+import requests
+from django.core.files.uploadhandler import MemoryFileUploadHandler
+from django.http.multipartparser import MultiPartParser
+from django.test import SimpleTestCase
+
+from bc.core.utils.microservices import (
+    MultipartFileBody,
+    request_thumbnails_from_doctor,
+)
+
+
+class MultipartFileBodyTest(SimpleTestCase):
+    def test_body_can_be_parsed_as_form_data(self):
+        content = b"%PDF-1.7" + bytes(range(256)) * 100
+        body = MultipartFileBody(
+            {"pages": "[1,2,3]", "max_dimension": "1920"},
+            "dummy.pdf",
+            BytesIO(content),
+        )
+
+        # Read the body in blocks, like http.client does
+        blocks = []
+        while block := body.read(8192):
+            blocks.append(block)
+        data = b"".join(blocks)
+        self.assertEqual(len(data), body.len)
+
+        fields, files = MultiPartParser(
+            {
+                "CONTENT_TYPE": body.content_type,
+                "CONTENT_LENGTH": str(body.len),
+            },
+            BytesIO(data),
+            [MemoryFileUploadHandler()],
+        ).parse()
+
+        self.assertEqual(fields["pages"], "[1,2,3]")
+        self.assertEqual(fields["max_dimension"], "1920")
+        self.assertEqual(files["file"].name, "dummy.pdf")
+        self.assertEqual(files["file"].read(), content)
+
+
+@patch("bc.core.utils.microservices.requests.post")
+class RequestThumbnailsFromDoctorTest(SimpleTestCase):
+    def make_response(self, status_code: int, content: bytes) -> MagicMock:
+        response = MagicMock(status_code=status_code)
+        response.__enter__.return_value = response
+        response.iter_content.side_effect = lambda size: (
+            content[i : i + size] for i in range(0, len(content), size)
+        )
+        if status_code != 200:
+            response.raise_for_status.side_effect = requests.HTTPError()
+        return response
+
+    def test_reads_thumbnails_from_zip_in_page_order(self, mock_post):
+        archive = BytesIO()
+        with ZipFile(archive, "w") as zipfile:
+            zipfile.writestr("thumb-2.png", b"page 2")
+            zipfile.writestr("thumb-1.png", b"page 1")
+        mock_post.return_value = self.make_response(200, archive.getvalue())
+
+        thumbnails = request_thumbnails_from_doctor(BytesIO(b"pdf"), "[1,2]")
+
+        self.assertEqual(thumbnails, [b"page 1", b"page 2"])
+        self.assertTrue(mock_post.call_args.kwargs["stream"])
+
+    def test_raises_on_error_response(self, mock_post):
+        response = self.make_response(500, b"Internal Server Error")
+        mock_post.return_value = response
+
+        with self.assertRaises(requests.HTTPError):
+            request_thumbnails_from_doctor(BytesIO(b"pdf"), "[1,2]")
+
+        response.iter_content.assert_not_called()
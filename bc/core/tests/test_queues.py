@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+from rq.queue import Queue
+
+from bc.channel.utils.connectors.masto import MastodonConnector
+from bc.core.utils.cloudfront import create_cache_invalidation
+from bc.core.utils.queues import QueueRouter, get_queue_name
+from bc.subscription.tasks import (
+    check_webhook_before_posting,
+    make_post_for_webhook_event,
+    process_filing_webhook_event,
+    render_thumbnails_for_webhook_event,
+)
+
+
+class GetQueueNameTest(SimpleTestCase):
+    def test_can_route_tasks_to_their_queue(self):
+        tests = (
+            (process_filing_webhook_event, "ingest"),
+            (check_webhook_before_posting, "courtlistener"),
+            (render_thumbnails_for_webhook_event, "render"),
+            (make_post_for_webhook_event, "posts"),
+            (create_cache_invalidation, "default"),
+        )
+        for func, queue_name in tests:
+            with self.subTest(func=func):
+                self.assertEqual(get_queue_name(func), queue_name)
+
+    def test_can_route_connector_methods(self):
+        connector = MastodonConnector.__new__(MastodonConnector)
+
+        self.assertEqual(get_queue_name(connector.add_status), "posts")
+
+
+@patch("bc.core.utils.queues.get_queue")
+class QueueRouterTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.queues: dict[str, MagicMock] = {}
+        self.router = QueueRouter()
+
+    def get_queue(self, name):
+        return self.queues.setdefault(name, MagicMock(name=name))
+
+    def test_enqueues_jobs_in_routed_queue(self, mock_get_queue):
+        mock_get_queue.side_effect = self.get_queue
+
+        self.router.enqueue(process_filing_webhook_event, 1)
+        self.router.enqueue(make_post_for_webhook_event, 1, 2, None)
+
+        self.queues["ingest"].enqueue.assert_called_once_with(
+            process_filing_webhook_event, 1
+        )
+        self.queues["posts"].enqueue.assert_called_once_with(
+            make_post_for_webhook_event, 1, 2, None
+        )
+
+    def test_can_split_batches_per_queue(self, mock_get_queue):
+        mock_get_queue.side_effect = self.get_queue
+        pipe = MagicMock()
+        job_datas = [
+            Queue.prepare_data(process_filing_webhook_event, args=(1,)),
+            Queue.prepare_data(check_webhook_before_posting, args=(1,)),
+            Queue.prepare_data(process_filing_webhook_event, args=(2,)),
+        ]
+
+        self.router.enqueue_many(job_datas, pipeline=pipe)
+
+        self.queues["ingest"].enqueue_many.assert_called_once_with(
+            [job_datas[0], job_datas[2]], pipeline=pipe
+        )
+        self.queues["courtlistener"].enqueue_many.assert_called_once_with(
+            [job_datas[1]], pipeline=pipe
+        )
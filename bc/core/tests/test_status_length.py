@@ -0,0 +1,78 @@
+import re
+
+from django.test import SimpleTestCase
+
+from bc.core.utils.status.length import measure
+from bc.core.utils.status.templates import (
+    BLUESKY_FOLLOW_A_NEW_CASE,
+    MASTODON_POST_TEMPLATE,
+    THREADS_POST_TEMPLATE,
+    TWITTER_FOLLOW_A_NEW_CASE,
+)
+from bc.core.utils.tests.base import faker
+
+
+class MeasureTest(SimpleTestCase):
+    def test_counts_links_with_a_fixed_length(self):
+        length = measure("New filing: https://www.courtlistener.com/docket/1/")
+
+        self.assertEqual(length.for_platform("mastodon"), 12 + 23)
+        self.assertEqual(length.for_platform("twitter"), 12 + 23)
+        self.assertEqual(length.for_platform("threads"), 12 + 24)
+        # Plain URLs count with their full length in Bluesky
+        self.assertEqual(length.for_platform("bluesky"), 51)
+        # Templates without a platform use the most common link length
+        self.assertEqual(length.for_platform(None), 12 + 23)
+
+    def test_ignores_link_markup_in_bluesky(self):
+        length = measure("[Docket](https://bots.law/docket/) and more")
+
+        self.assertEqual(length.for_platform("bluesky"), 17)
+        self.assertEqual(length.for_platform("mastodon"), 19 + 23)
+
+    def test_finds_unfilled_items_outside_links(self):
+        self.assertTrue(measure("Docket {docket}").has_unfilled_items)
+        self.assertTrue(measure("{% if docket %}").has_unfilled_items)
+        self.assertFalse(
+            measure("https://bots.law/?q=%20{docket}").has_unfilled_items
+        )
+
+    def test_fits_checks_length_and_unfilled_items(self):
+        length = measure("https://bots.law/ {docket}")
+
+        self.assertFalse(length.fits("mastodon", 300))
+        self.assertTrue(measure("https://bots.law/ 1").fits("mastodon", 25))
+        self.assertFalse(measure("https://bots.law/ 1").fits("threads", 25))
+
+    def test_matches_the_regex_rules_on_rendered_posts(self):
+        url_pattern = re.compile(r"https?://\S+")
+        markup_pattern = re.compile(r"(?<=])\(\S+\)")
+        for _ in range(20):
+            values = {
+                "docket": faker.text(),
+                "description": faker.text(),
+                "doc_num": faker.random_int(),
+                "pdf_link": faker.url(),
+                "docket_link": faker.url(),
+                "docket_id": faker.random_int(),
+                "article_url": faker.url(),
+            }
+            for template in (
+                MASTODON_POST_TEMPLATE,
+                TWITTER_FOLLOW_A_NEW_CASE,
+                THREADS_POST_TEMPLATE,
+            ):
+                text, _ = template.format(**values)
+                link_length = 24 if template is THREADS_POST_TEMPLATE else 23
+                expected = len(url_pattern.sub("", text)) + link_length * len(
+                    url_pattern.findall(text)
+                )
+                self.assertEqual(
+                    measure(text).for_platform(template.platform), expected
+                )
+
+            text, _ = BLUESKY_FOLLOW_A_NEW_CASE.format(**values)
+            self.assertEqual(
+                measure(text).for_platform("bluesky"),
+                len(markup_pattern.sub("", text)),
+            )
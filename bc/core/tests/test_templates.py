@@ -1,6 +1,11 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
+from io import StringIO
 from unittest.mock import patch
 
+from django.core.management import call_command
+from django.template import Template
 from django.test import SimpleTestCase
 
 from bc.channel.tests.factories import fake_token
@@ -32,83 +37,83 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
         valid_multipliers = [5, 10, 20, 40, 47]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [48, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_mastodon_template_w_article(self):
         template = MASTODON_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 40]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     article_url=self.article_url,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [41, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     article_url=self.article_url,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_mastodon_template_w_date(self):
         template = MASTODON_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 40, 43]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     date_filed=self.date_filed,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [44, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     date_filed=self.date_filed,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_mastodon_template_w_initial_complaint(self):
         template = MASTODON_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 39]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -116,12 +121,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -129,14 +134,14 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_mastodon_template_w_article_date(self):
         template = MASTODON_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 36]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -144,19 +149,19 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     date_filed=self.date_filed,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [37, 40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     article_url=self.article_url,
                     date_filed=self.date_filed,
                 )
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_mastodon_template_w_article_initial_complaint(
         self,
@@ -165,7 +170,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
         valid_multipliers = [5, 10, 20, 32]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -174,12 +179,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [33, 40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -188,7 +193,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_mastodon_template_w_article_date_initial_complaint(
         self,
@@ -197,7 +202,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
         valid_multipliers = [5, 10, 20, 24, 26, 28]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -207,12 +212,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [30, 40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -222,7 +227,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_mastodon_template_w_date_initial_complaint(
         self,
@@ -231,7 +236,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
         valid_multipliers = [5, 10, 20, 35]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -240,12 +245,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [36, 40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -254,90 +259,90 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_twitter_simple_template(self):
         template = TWITTER_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 40, 43]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [44, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_twitter_template_w_article(self):
         template = TWITTER_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 36]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     article_url=self.article_url,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [37, 40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     article_url=self.article_url,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_twitter_template_w_date(self):
         template = TWITTER_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 39]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     date_filed=self.date_filed,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     date_filed=self.date_filed,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_twitter_template_w_initial_complaint(self):
         template = TWITTER_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 35]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -345,12 +350,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [36, 40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -358,14 +363,14 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_twitter_template_w_article_date(self):
         template = TWITTER_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 32]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -373,12 +378,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     date_filed=self.date_filed,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [33, 40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -386,7 +391,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     date_filed=self.date_filed,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_twitter_template_w_article_initial_complaint(
         self,
@@ -395,7 +400,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
         valid_multipliers = [5, 10, 20, 28]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -404,12 +409,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [29, 40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -418,7 +423,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_twitter_template_w_article_date_initial_complaint(
         self,
@@ -427,7 +432,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
         valid_multipliers = [5, 10, 20, 25]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -437,12 +442,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [26, 40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -452,7 +457,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_twitter_template_w_date_initial_complaint(
         self,
@@ -461,7 +466,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
         valid_multipliers = [5, 10, 20, 31]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -470,12 +475,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [32, 40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -484,90 +489,90 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_bluesky_simple_template(self):
         template = BLUESKY_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 40, 50, 50]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [51, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_bluesky_template_w_article(self):
         template = BLUESKY_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 40, 46]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     article_url=self.article_url,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [47, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     article_url=self.article_url,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_bluesky_template_w_date(self):
         template = BLUESKY_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 40, 46]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     date_filed=self.date_filed,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [47, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
                     date_filed=self.date_filed,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_bluesky_template_w_initial_complaint(self):
         template = BLUESKY_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 40, 47]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -575,12 +580,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [48, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -588,14 +593,14 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_bluesky_template_w_article_date(self):
         template = BLUESKY_FOLLOW_A_NEW_CASE
         valid_multipliers = [5, 10, 20, 40, 42]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -603,12 +608,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     date_filed=self.date_filed,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [43, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -616,7 +621,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     date_filed=self.date_filed,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_bluesky_template_w_article_initial_complaint(
         self,
@@ -625,7 +630,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
         valid_multipliers = [5, 10, 20, 40, 43]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -634,12 +639,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [44, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -648,7 +653,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_bluesky_template_w_date_initial_complaint(
         self,
@@ -657,7 +662,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
         valid_multipliers = [5, 10, 20, 40, 43]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -666,12 +671,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [44, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -680,7 +685,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
     def test_check_output_validity_bluesky_template_w_article_date_initial_complaint(
         self,
@@ -689,7 +694,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
         valid_multipliers = [5, 10, 20, 39]
         for multiplier in valid_multipliers:
             with self.subTest(multiplier=multiplier, valid=True):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -699,12 +704,12 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertTrue(template.is_valid)
+                self.assertTrue(result.is_valid)
 
         invalid_multipliers = [40, 50, 100]
         for multiplier in invalid_multipliers:
             with self.subTest(multiplier=multiplier, valid=False):
-                template.format(
+                result = template.format(
                     docket=multiplier * "short",
                     docket_link=self.docket_url,
                     docket_id=self.docket_id,
@@ -714,7 +719,7 @@ class NewSubscriptionValidTemplateTest(SimpleTestCase):
                     initial_complaint_link=self.initial_complaint_link,
                 )
 
-                self.assertFalse(template.is_valid)
+                self.assertFalse(result.is_valid)
 
 
 class MastodonTemplateTest(SimpleTestCase):
@@ -740,7 +745,7 @@ class MastodonTemplateTest(SimpleTestCase):
 
         for test in tests:
             test_class = MastodonTemplate(
-                link_placeholders=[], str_template=test["template"]
+                link_placeholders=(), str_template=test["template"]
             )
             result = test_class.count_fixed_characters()
             self.assertEqual(
@@ -780,7 +785,8 @@ class MastodonTemplateTest(SimpleTestCase):
 
         for test in tests:
             test_class = MastodonTemplate(
-                link_placeholders=test["links"], str_template=test["template"]
+                link_placeholders=tuple(test["links"]),
+                str_template=test["template"],
             )
             result = len(test_class)
             self.assertEqual(
@@ -791,7 +797,7 @@ class MastodonTemplateTest(SimpleTestCase):
 
     def test_truncate_descriptions(self):
         template = MastodonTemplate(
-            link_placeholders=["link"], str_template="{title}:{description}"
+            link_placeholders=("link",), str_template="{title}:{description}"
         )
 
         tests = (
@@ -809,6 +815,102 @@ class MastodonTemplateTest(SimpleTestCase):
                 msg=f"Failed with dict: {test}.\n{result} is longer than {template.max_characters}",
             )
 
+    @patch("bc.core.utils.status.base.Formatter")
+    @patch.object(Template, "render", autospec=True)
+    def test_format_reuses_template_metadata(
+        self, mock_render, mock_formatter
+    ):
+        mock_render.return_value = "text"
+        template = MastodonTemplate(
+            link_placeholders=("link",),
+            str_template="{% if title %}{{title}}{% endif %}: {{description}}",
+        )
+        self.assertEqual(template.template_fields, ["title", "description"])
+        mock_render.reset_mock()
+
+        template.format(title="title", description=400 * "a")
+
+        # Only the output is rendered
+        mock_render.assert_called_once()
+        mock_formatter.assert_not_called()
+
+
+class RenderResultTest(SimpleTestCase):
+    def test_unpacks_as_text_and_image(self):
+        template = MastodonTemplate(
+            link_placeholders=("link",), str_template="{title}: {link}"
+        )
+
+        result = template.format(title="title", link="https://bots.law/")
+        text, image = result
+
+        self.assertEqual(text, "title: https://bots.law/")
+        self.assertIsNone(image)
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.length, 7 + 23)
+        self.assertEqual(result.available_characters, 300 - 30)
+
+    def test_format_does_not_change_the_template(self):
+        template = MastodonTemplate(
+            link_placeholders=(), str_template="{docket}: {description}"
+        )
+
+        _, image = template.format(
+            border_color=(0, 0, 0), docket="docket", description=400 * "a"
+        )
+        _, default_image = template.format(
+            docket="docket", description=400 * "a"
+        )
+
+        self.assertEqual(image.border_color, (0, 0, 0))
+        self.assertEqual(default_image.border_color, (243, 195, 62))
+        with self.assertRaises(FrozenInstanceError):
+            template.border_color = (0, 0, 0)
+
+    def test_templates_are_hashable(self):
+        template = MastodonTemplate(
+            link_placeholders=("link",), str_template="{title}: {link}"
+        )
+        same_template = MastodonTemplate(
+            link_placeholders=("link",), str_template="{title}: {link}"
+        )
+
+        self.assertEqual(hash(template), hash(same_template))
+        self.assertEqual(len({template, same_template}), 1)
+
+    def test_can_render_from_several_threads(self):
+        dockets = [f"{i} {faker.text()}" for i in range(50)]
+
+        def render(docket: str) -> str:
+            text, _ = MASTODON_FOLLOW_A_NEW_CASE.format(
+                docket=docket,
+                docket_link=faker.url(),
+                docket_id=faker.random_int(),
+            )
+            return text
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            texts = list(executor.map(render, dockets))
+
+        for docket, text in zip(dockets, texts):
+            self.assertIn(docket, text)
+
+
+class BenchmarkTemplatesTest(SimpleTestCase):
+    def test_times_every_template(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark",
+            "--iterations=1",
+            "templates",
+            "--calls=1",
+            stdout=out,
+        )
+
+        self.assertIn("MASTODON_POST_TEMPLATE [format x1]", out.getvalue())
+        self.assertIn("THREADS_FOLLOW_A_NEW_CASE [create x1]", out.getvalue())
+
 
 class BlueskyTemplateTest(SimpleTestCase):
     @patch(
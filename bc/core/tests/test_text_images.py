@@ -1,8 +1,22 @@
-from textwrap import wrap
+from io import BytesIO, StringIO
+from textwrap import fill, wrap
+from unittest.mock import patch
 
-from django.test import SimpleTestCase
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+from PIL.ImageDraw import Draw
 
-from bc.core.utils.images import TextImage
+from bc.core.utils.fonts import get_font, preload_fonts
+from bc.core.utils.images import (
+    SponsoredThumbnail,
+    TextImage,
+    add_sponsored_text_to_thumbnails,
+    get_watermark_layer,
+    render_text_image,
+)
+from bc.core.utils.tests.base import faker
+from bc.core.utils.text_layout import get_font_metrics
 
 
 class TextImageTest(SimpleTestCase):
@@ -77,3 +91,181 @@ class TextImageTest(SimpleTestCase):
                 0,
                 msg=f"Failed with dict: {test}.\nthe description overflows the image",
             )
+
+    def test_can_render_empty_title_and_description(self):
+        for title, description in (
+            ("", "description"),
+            ("title", ""),
+            ("", ""),
+        ):
+            with self.subTest(title=title, description=description):
+                image = TextImage(title, description, (0, 0, 0)).to_bytes()
+
+                self.assertEqual(Image.open(BytesIO(image)).format, "PNG")
+
+
+class FontRegistryTest(SimpleTestCase):
+    def test_images_share_preloaded_fonts(self):
+        preload_fonts()
+
+        with patch("bc.core.utils.fonts.ImageFont.truetype") as mock_truetype:
+            text_image = TextImage("title", "description", (0, 0, 0))
+            other_image = TextImage("title", "description", (0, 0, 0))
+            thumbnail = SponsoredThumbnail(
+                "title", faker.image(size=(10, 10), image_format="png")
+            )
+
+        mock_truetype.assert_not_called()
+        self.assertIs(text_image.title_font, other_image.title_font)
+        self.assertIs(
+            thumbnail.title_font, get_font(thumbnail.title_font_path, 46)
+        )
+
+
+class FontMetricsTest(SimpleTestCase):
+    texts = [
+        "",
+        " ",
+        "m",
+        "Case: Braidwood Management v. Becerra (ACA prev. care challenge)",
+        "MOTION to Dismiss §1983 claims — Becerra’s reply, filed 04/10/2023",
+        "WAVY Tyjg., AV To LT Yo fi ffl",
+        "Line with a\nnewline and a\ttab",
+    ]
+
+    def test_measures_text_like_pillow(self):
+        for font_path in (
+            TextImage.title_font_path,
+            TextImage.desc_font_path,
+        ):
+            metrics = get_font_metrics(font_path, 24)
+            font = get_font(font_path, 24)
+            for text in self.texts:
+                with self.subTest(font=font_path, text=text):
+                    _, _, right, bottom = font.getbbox(text)
+                    self.assertEqual(metrics.get_right(text), right)
+                    self.assertEqual(metrics.get_bottom(text), bottom)
+                    self.assertEqual(
+                        metrics.get_length(text), font.getlength(text)
+                    )
+
+    def test_measures_multiline_text_like_pillow(self):
+        metrics = get_font_metrics(TextImage.desc_font_path, 24)
+        font = get_font(TextImage.desc_font_path, 24)
+        draw = Draw(Image.new("RGBA", (10, 10)))
+        text = " ".join(self.texts[3:6])
+
+        for lines in (wrap(text, 20), [*wrap(text, 40), "", "last line"]):
+            with self.subTest(lines=lines):
+                *_, right, bottom = draw.multiline_textbbox(
+                    (0, 0), "\n".join(lines), font, spacing=16
+                )
+                self.assertEqual(
+                    metrics.get_multiline_size(lines, 16), (right, bottom)
+                )
+
+    def test_text_image_measures_text_like_pillow(self):
+        instance = TextImage(
+            "Case: Braidwood Management v. Becerra (ACA prev. care challenge)",
+            20 * "Transcript Order Form: re 115 Notice of Appeal, ",
+            (0, 0, 0),
+        )
+        title = fill(instance.title, 30)
+        desc = fill(instance.description, 30)
+        draw = Draw(Image.new("RGBA", (10, 10)))
+
+        title_bbox = draw.multiline_textbbox(
+            (0, 0), title, instance.title_font, spacing=16
+        )
+        desc_bbox = draw.multiline_textbbox(
+            (0, 0), desc, instance.desc_font, spacing=16
+        )
+        *_, height = draw.multiline_textbbox(
+            (0, 0), f"{title}\n\n{desc}", instance.desc_font, spacing=16
+        )
+
+        self.assertEqual(
+            instance.get_bbox_dimensions(title.split("\n"), desc.split("\n")),
+            (max(title_bbox[2], desc_bbox[2]), height),
+        )
+
+
+@patch.object(TextImage, "render", return_value=b"image")
+class TextImageMemoizationTest(SimpleTestCase):
+    def setUp(self) -> None:
+        render_text_image.cache_clear()
+        self.addCleanup(render_text_image.cache_clear)
+
+    @override_settings(TEXT_IMAGE_ARTIFACTS=False)
+    def test_renders_each_image_once(self, mock_render):
+        images = [
+            TextImage("title", "description", (243, 195, 62)),
+            TextImage("title", "description", (243, 195, 62)),
+            TextImage("title", "description", (0, 0, 0)),
+        ]
+
+        for image in images:
+            self.assertEqual(image.to_bytes(), b"image")
+
+        # The first two images have the same content
+        self.assertEqual(mock_render.call_count, 2)
+
+    @override_settings(TEXT_IMAGE_ARTIFACTS=True)
+    @patch("bc.core.utils.images.store_artifacts")
+    @patch("bc.core.utils.images.get_artifacts")
+    def test_shares_images_through_artifacts(
+        self, mock_get_artifacts, mock_store_artifacts, mock_render
+    ):
+        mock_get_artifacts.side_effect = [None, [b"stored_image"]]
+
+        first = TextImage("title", "description", (243, 195, 62))
+        self.assertEqual(first.to_bytes(), b"image")
+        mock_store_artifacts.assert_called_once()
+        key = mock_store_artifacts.call_args.args[0]
+        self.assertTrue(key.startswith("text_image:"))
+
+        # Another process finds the image in the artifacts store
+        render_text_image.cache_clear()
+        second = TextImage("title", "description", (243, 195, 62))
+        self.assertEqual(second.to_bytes(), b"stored_image")
+        mock_get_artifacts.assert_called_with(key)
+        mock_render.assert_called_once()
+
+
+class WatermarkLayerTest(SimpleTestCase):
+    def setUp(self) -> None:
+        get_watermark_layer.cache_clear()
+        self.addCleanup(get_watermark_layer.cache_clear)
+
+    def test_draws_one_layer_per_message_and_size(self):
+        files = [
+            faker.image(size=(300, 400), image_format="png"),
+            faker.image(size=(300, 400), image_format="png"),
+            faker.image(size=(400, 300), image_format="png"),
+        ]
+
+        thumbnails = add_sponsored_text_to_thumbnails(files, "Sponsored")
+
+        self.assertEqual(len(thumbnails), 3)
+        cache_info = get_watermark_layer.cache_info()
+        self.assertEqual(cache_info.misses, 2)
+        self.assertEqual(cache_info.hits, 1)
+        with Image.open(BytesIO(thumbnails[2])) as img:
+            self.assertEqual(img.size, (400, 300))
+
+
+class BenchmarkTextImageTest(SimpleTestCase):
+    def test_times_layout_and_rendering(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark",
+            "--iterations=1",
+            "text-image",
+            "--length",
+            "50",
+            stdout=out,
+        )
+
+        self.assertIn("50 chars [layout]", out.getvalue())
+        self.assertIn("50 chars [render]", out.getvalue())
@@ -0,0 +1,154 @@
+import os
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from bc.core.utils.thumbnail_cache import (
+    DiskCacheTier,
+    make_thumbnail_cache_key,
+    pack_thumbnails,
+    unpack_thumbnails,
+)
+from bc.core.utils.thumbnails import get_thumbnails_from_range
+
+
+class ThumbnailCacheKeyTest(SimpleTestCase):
+    def test_key_depends_on_content_and_options(self):
+        key = make_thumbnail_cache_key(b"document", "[1,2,3]", 1920, "doctor")
+
+        self.assertEqual(
+            key,
+            make_thumbnail_cache_key(b"document", "[1, 2, 3]", 1920, "doctor"),
+        )
+        self.assertNotEqual(
+            key, make_thumbnail_cache_key(b"other", "[1,2,3]", 1920, "doctor")
+        )
+        self.assertNotEqual(
+            key, make_thumbnail_cache_key(b"document", "[1,2]", 1920, "doctor")
+        )
+        self.assertNotEqual(
+            key,
+            make_thumbnail_cache_key(b"document", "[1,2,3]", 800, "doctor"),
+        )
+        self.assertNotEqual(
+            key,
+            make_thumbnail_cache_key(b"document", "[1,2,3]", 1920, "pdfium"),
+        )
+
+    def test_key_of_file_matches_key_of_its_content(self):
+        document = BytesIO(b"document")
+        document.seek(4)
+
+        key = make_thumbnail_cache_key(document, "[1,2,3]", 1920, "doctor")
+
+        self.assertEqual(
+            key,
+            make_thumbnail_cache_key(b"document", "[1,2,3]", 1920, "doctor"),
+        )
+        # The file is rewound so it can be sent to Doctor
+        self.assertEqual(document.tell(), 0)
+
+    def test_can_pack_and_unpack_thumbnails(self):
+        thumbnails = [b"\x89PNG", b"", b"\x00" * 10]
+
+        self.assertEqual(
+            unpack_thumbnails(pack_thumbnails(thumbnails)), thumbnails
+        )
+
+
+class DiskCacheTierTest(SimpleTestCase):
+    def setUp(self) -> None:
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tier = DiskCacheTier(Path(tmp_dir.name), max_bytes=20)
+
+    def test_can_store_and_read_entries(self):
+        self.tier.set("key", b"thumbnail")
+
+        self.assertEqual(self.tier.get("key"), b"thumbnail")
+        self.assertIsNone(self.tier.get("missing"))
+
+    def test_can_store_empty_thumbnail_list(self):
+        self.tier.set("key", pack_thumbnails([]))
+
+        self.assertEqual(unpack_thumbnails(self.tier.get("key")), [])
+
+    def test_evicts_least_recently_used_entries(self):
+        self.tier.set("first", b"a" * 8)
+        self.tier.set("second", b"b" * 8)
+        # Make the first entry the oldest one and then read it
+        os.utime(self.tier._get_path("first"), ns=(0, 0))
+        os.utime(self.tier._get_path("second"), ns=(1, 1))
+        self.tier.get("first")
+
+        self.tier.set("third", b"c" * 8)
+
+        self.assertEqual(self.tier.get("first"), b"a" * 8)
+        self.assertIsNone(self.tier.get("second"))
+        self.assertEqual(self.tier.get("third"), b"c" * 8)
+
+    def test_ignores_entries_over_budget(self):
+        self.tier.set("key", b"a" * 21)
+
+        self.assertIsNone(self.tier.get("key"))
+
+
+@patch("bc.core.utils.thumbnails.cache_thumbnails")
+@patch("bc.core.utils.thumbnails.get_cached_thumbnails")
+@patch("bc.core.utils.thumbnails.request_thumbnails_from_doctor")
+class GetThumbnailsFromRangeTest(SimpleTestCase):
+    def test_returns_cached_thumbnails(
+        self, mock_doctor, mock_get_cached, mock_cache
+    ):
+        mock_get_cached.return_value = [b"thumbnail"]
+
+        thumbnails = get_thumbnails_from_range(BytesIO(b"document"), "[1,2]")
+
+        self.assertEqual(thumbnails, [b"thumbnail"])
+        mock_doctor.assert_not_called()
+        mock_cache.assert_not_called()
+
+    def test_caches_thumbnails_on_miss(
+        self, mock_doctor, mock_get_cached, mock_cache
+    ):
+        mock_get_cached.return_value = None
+        mock_doctor.return_value = [b"thumbnail"]
+
+        document = BytesIO(b"document")
+        thumbnails = get_thumbnails_from_range(document, "[1,2]")
+
+        self.assertEqual(thumbnails, [b"thumbnail"])
+        mock_doctor.assert_called_once_with(document, "[1,2]")
+        mock_cache.assert_called_once_with(
+            make_thumbnail_cache_key(b"document", "[1,2]", 1920, "doctor"),
+            [b"thumbnail"],
+        )
+
+    def test_clips_page_range_to_page_count(
+        self, mock_doctor, mock_get_cached, mock_cache
+    ):
+        mock_get_cached.return_value = None
+        mock_doctor.return_value = [b"thumbnail"]
+
+        document = BytesIO(b"document")
+        get_thumbnails_from_range(document, "[1,2,3,4]", page_count=1)
+
+        mock_doctor.assert_called_once_with(document, "[1]")
+        mock_cache.assert_called_once_with(
+            make_thumbnail_cache_key(b"document", "[1]", 1920, "doctor"),
+            [b"thumbnail"],
+        )
+
+    def test_skips_documents_without_requested_pages(
+        self, mock_doctor, mock_get_cached, mock_cache
+    ):
+        thumbnails = get_thumbnails_from_range(
+            BytesIO(b"document"), "[2,3]", page_count=1
+        )
+
+        self.assertEqual(thumbnails, [])
+        mock_get_cached.assert_not_called()
+        mock_doctor.assert_not_called()
@@ -0,0 +1,113 @@
+import sys
+from io import BytesIO, StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+
+from bc.core.utils.thumbnails import (
+    DoctorThumbnailEngine,
+    PdfiumThumbnailEngine,
+    clip_page_range,
+    get_thumbnail_engine,
+)
+
+
+class GetThumbnailEngineTest(SimpleTestCase):
+    @override_settings(THUMBNAIL_ENGINE="doctor")
+    def test_uses_engine_from_settings(self):
+        self.assertIsInstance(get_thumbnail_engine(), DoctorThumbnailEngine)
+
+    @override_settings(THUMBNAIL_ENGINE="doctor")
+    def test_can_pick_engine_by_name(self):
+        self.assertIsInstance(
+            get_thumbnail_engine("pdfium"), PdfiumThumbnailEngine
+        )
+
+    @override_settings(THUMBNAIL_ENGINE="ghostscript")
+    def test_raises_on_unknown_engine(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_thumbnail_engine()
+
+
+class ClipPageRangeTest(SimpleTestCase):
+    def test_removes_pages_after_the_last_one(self):
+        self.assertEqual(clip_page_range("[1,2,3,4]", 2), "[1,2]")
+        self.assertEqual(clip_page_range("[3, 4]", 2), "[]")
+
+    def test_keeps_range_if_page_count_is_unknown(self):
+        self.assertEqual(clip_page_range("[1,2,3,4]", None), "[1,2,3,4]")
+        self.assertEqual(clip_page_range("[1,2,3,4]", 0), "[1,2,3,4]")
+
+
+class PdfiumThumbnailEngineTest(SimpleTestCase):
+    def make_pdfium_module(self, page_sizes: list[tuple[float, float]]):
+        pages = []
+        for size in page_sizes:
+            page = MagicMock()
+            page.get_size.return_value = size
+            page.render.return_value.to_pil.return_value = Image.new(
+                "RGB", (2, 2)
+            )
+            pages.append(page)
+
+        pdf = MagicMock()
+        pdf.__len__.return_value = len(pages)
+        pdf.__getitem__.side_effect = pages.__getitem__
+        module = MagicMock()
+        module.PdfDocument.return_value = pdf
+        return module, pdf, pages
+
+    def test_renders_requested_pages(self):
+        module, pdf, pages = self.make_pdfium_module(
+            [(612, 792), (792, 612), (612, 792)]
+        )
+
+        with patch.dict(sys.modules, {"pypdfium2": module}):
+            thumbnails = PdfiumThumbnailEngine().render(
+                BytesIO(b"document"), "[2,3,4]"
+            )
+
+        # The document only has three pages
+        self.assertEqual(len(thumbnails), 2)
+        self.assertTrue(thumbnails[0].startswith(b"\x89PNG"))
+        pages[0].render.assert_not_called()
+        # The longest side of each page is scaled to the max dimension
+        pages[1].render.assert_called_once_with(scale=1920 / 792)
+        pages[2].render.assert_called_once_with(scale=1920 / 792)
+        pdf.close.assert_called_once()
+
+    def test_raises_if_pypdfium2_is_missing(self):
+        with (
+            patch.dict(sys.modules, {"pypdfium2": None}),
+            self.assertRaises(ImproperlyConfigured),
+        ):
+            PdfiumThumbnailEngine().render(BytesIO(b"document"), "[1]")
+
+
+@patch.object(PdfiumThumbnailEngine, "render")
+@patch.object(DoctorThumbnailEngine, "render")
+class BenchmarkThumbnailsTest(SimpleTestCase):
+    def test_runs_every_engine_on_every_file(self, mock_doctor, mock_pdfium):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "sample.pdf"
+            path.write_bytes(b"%PDF-1.7")
+            out = StringIO()
+
+            call_command(
+                "benchmark",
+                "--iterations=3",
+                "thumbnails",
+                "--file",
+                str(path),
+                stdout=out,
+            )
+
+        self.assertEqual(mock_doctor.call_count, 3)
+        self.assertEqual(mock_pdfium.call_count, 3)
+        self.assertIn("sample.pdf [doctor]", out.getvalue())
+        self.assertIn("sample.pdf [pdfium]", out.getvalue())
@@ -0,0 +1,75 @@
+import hashlib
+
+from django.conf import settings
+
+from bc.core.utils.redis import make_redis_interface
+
+r = make_redis_interface("ARTIFACTS", decode_responses=False)
+
+
+def _get_empty_marker_key(key: str) -> str:
+    return f"{key}:empty"
+
+
+def store_artifacts(key: str, artifacts: list[bytes]) -> None:
+    """
+    Stores a list of binary artifacts for ARTIFACTS_TTL seconds, replacing
+    the previous version of the list.
+
+    Redis doesn't keep empty lists, so an empty list is stored as a marker
+    key. That way a result without artifacts is reused like any other.
+
+    Args:
+        key (str): The key of the artifacts.
+        artifacts (list[bytes]): The binary objects to store.
+    """
+    empty_marker_key = _get_empty_marker_key(key)
+    with r.pipeline() as pipe:
+        pipe.delete(key, empty_marker_key)
+        if artifacts:
+            pipe.rpush(key, *artifacts)
+            pipe.expire(key, settings.ARTIFACTS_TTL)
+        else:
+            pipe.set(empty_marker_key, 1, ex=settings.ARTIFACTS_TTL)
+        pipe.execute()
+
+
+def get_artifacts(key: str) -> list[bytes] | None:
+    """
+    Returns the list of binary artifacts stored with the given key.
+
+    Args:
+        key (str): The key of the artifacts.
+
+    Returns:
+        list[bytes] | None: The artifacts in the order they were stored or
+        None if they're not available.
+    """
+    with r.pipeline() as pipe:
+        pipe.lrange(key, 0, -1)
+        pipe.exists(_get_empty_marker_key(key))
+        artifacts, is_empty = pipe.execute()
+    if artifacts:
+        return artifacts
+    return [] if is_empty else None
+
+
+def put_artifacts(prefix: str, artifacts: list[bytes]) -> str:
+    """
+    Stores a list of binary artifacts under a key derived from their content
+    and returns the key, so jobs can carry the key instead of the bytes.
+    Storing the same list twice reuses the key.
+
+    Args:
+        prefix (str): Prefix of the key.
+        artifacts (list[bytes]): The binary objects to store.
+
+    Returns:
+        str: The key of the artifacts.
+    """
+    digest = hashlib.sha256()
+    for artifact in artifacts:
+        digest.update(hashlib.sha256(artifact).digest())
+    key = f"{prefix}:{digest.hexdigest()}"
+    store_artifacts(key, artifacts)
+    return key
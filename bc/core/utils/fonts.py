@@ -0,0 +1,62 @@
+import logging
+from functools import cache
+
+from django.contrib.staticfiles import finders
+from PIL import ImageFont
+from PIL.ImageFont import FreeTypeFont
+
+logger = logging.getLogger(__name__)
+
+BOLD_FONT = "fonts/CooperHewitt-Bold.otf"
+MEDIUM_FONT = "fonts/CooperHewitt-Medium.otf"
+LIGHT_FONT = "fonts/CooperHewitt-Light.otf"
+
+# Fonts and sizes used by the image classes, loaded when the app starts.
+PRELOADED_FONTS: tuple[tuple[str, int], ...] = (
+    # TextImage
+    (BOLD_FONT, 24),
+    (LIGHT_FONT, 24),
+    # SponsoredThumbnail
+    (BOLD_FONT, 46),
+    (MEDIUM_FONT, 22),
+)
+
+
+@cache
+def find_font(name: str) -> str | None:
+    """
+    Returns the absolute path of a font in the static files.
+
+    Args:
+        name (str): path of the font relative to the static directories.
+
+    Returns:
+        str | None: the absolute path or None if the font doesn't exist.
+    """
+    return finders.find(name)
+
+
+@cache
+def get_font(path: str, size: int) -> FreeTypeFont:
+    """
+    Returns a font from the process-wide registry. Each font file is read
+    and parsed once per size, and every image shares the same object.
+
+    Args:
+        path (str): absolute path of the font file.
+        size (int): size of the font in points.
+
+    Returns:
+        FreeTypeFont: the loaded font.
+    """
+    return ImageFont.truetype(path, size=size)
+
+
+def preload_fonts() -> None:
+    """Loads the fonts used by the image classes into the registry."""
+    for name, size in PRELOADED_FONTS:
+        path = find_font(name)
+        if not path:
+            logger.warning(f"Could not find the font {name}")
+            continue
+        get_font(path, size)
@@ -1,24 +1,40 @@
+import hashlib
 import io
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
 from math import ceil, sqrt
-from textwrap import fill, wrap
+from textwrap import wrap
 
-from django.contrib.staticfiles import finders
-from PIL import Image, ImageFont, ImageOps
+from django.conf import settings
+from PIL import Image, ImageOps
 from PIL.Image import Image as ImageCls
-from PIL.ImageDraw import Draw, ImageDraw
+from PIL.ImageDraw import Draw
+from PIL.ImageFont import FreeTypeFont
+
+from bc.core.utils.artifacts import get_artifacts, store_artifacts
+from bc.core.utils.fonts import (
+    BOLD_FONT,
+    LIGHT_FONT,
+    MEDIUM_FONT,
+    find_font,
+    get_font,
+)
+from bc.core.utils.text_layout import get_font_metrics
 
 logger = logging.getLogger(__name__)
 
+# Number of rendered text images kept in memory by each process
+TEXT_IMAGE_CACHE_SIZE = 64
+
 
 @dataclass
 class TextImage:
     title: str
     description: str
     border_color: tuple[int, ...]
-    title_font_path: str | None = finders.find("fonts/CooperHewitt-Bold.otf")
-    desc_font_path: str | None = finders.find("fonts/CooperHewitt-Light.otf")
+    title_font_path: str | None = find_font(BOLD_FONT)
+    desc_font_path: str | None = find_font(LIGHT_FONT)
     font_size: int = 24
     line_spacing: int = 16
     padding: float = 10.0
@@ -29,11 +45,13 @@ class TextImage:
     height: int = field(init=False)
 
     def __post_init__(self):
-        self.title_font = ImageFont.truetype(
-            self.title_font_path, size=self.font_size
+        self.title_font = get_font(self.title_font_path, self.font_size)
+        self.desc_font = get_font(self.desc_font_path, self.font_size)
+        self.title_metrics = get_font_metrics(
+            self.title_font_path, self.font_size
         )
-        self.desc_font = ImageFont.truetype(
-            self.desc_font_path, size=self.font_size
+        self.desc_metrics = get_font_metrics(
+            self.desc_font_path, self.font_size
         )
         self.line_height = self.font_size + self.line_spacing
 
@@ -49,8 +67,7 @@ class TextImage:
         Returns:
             int: Length of given text.
         """
-        bounding_box = self.desc_font.getbbox(str)
-        return bounding_box[2]
+        return self.desc_metrics.get_right(str)
 
     def get_available_space(self, wrapped: list[str]) -> int:
         """
@@ -64,7 +81,9 @@ class TextImage:
         Returns:
             int: number of available pixels in the horizontal axis
         """
-        return self.width - self.get_text_length(max(wrapped, key=len))
+        return self.width - self.get_text_length(
+            max(wrapped, key=len, default="")
+        )
 
     def get_height_approximation(self, length: int) -> int:
         """
@@ -127,24 +146,28 @@ class TextImage:
             int: max number of characters
         """
         reference_length = self.get_text_length("m")
-        max_character = ceil(self.width / reference_length)
+        # wrap() needs at least one character per line
+        max_character = max(ceil(self.width / reference_length), 1)
 
         # create a list of lines which are at most 'max_character' long
         wrapped_desc = wrap(self.description, max_character)
-
-        while self.get_available_space(wrapped_desc) > reference_length:
-            increment = (
-                self.get_available_space(wrapped_desc) / reference_length
-            )
+        available_space = self.get_available_space(wrapped_desc)
+
+        # Lines longer than the longest text don't change the wrapping
+        longest_text = max(len(self.title), len(self.description))
+        while (
+            available_space > reference_length and max_character < longest_text
+        ):
+            increment = available_space / reference_length
             wrapped_desc = wrap(
                 self.description, max_character + ceil(increment)
             )
-            wrapped_title = wrap(self.title, max_character + ceil(increment))
+            available_space = self.get_available_space(wrapped_desc)
             # check if the new max number of characters won't overflow the rectangle
-            if (
-                self.get_available_space(wrapped_desc) <= 0
-                or self.get_available_space(wrapped_title) <= 0
-            ):
+            if available_space <= 0:
+                break
+            wrapped_title = wrap(self.title, max_character + ceil(increment))
+            if self.get_available_space(wrapped_title) <= 0:
                 break
             max_character += ceil(increment)
 
@@ -162,7 +185,9 @@ class TextImage:
         Returns:
             tuple[int, int]: (width, height) dimension with padding
         """
-        longest_str_width = self.get_text_length(max(wrapped, key=len))
+        longest_str_width = self.get_text_length(
+            max(wrapped, key=len, default="")
+        )
 
         # check if any of the lines of the paragraph overflows the rectangle
         if longest_str_width > self.width:
@@ -177,37 +202,33 @@ class TextImage:
         return ceil(width), ceil(height)
 
     def get_bbox_dimensions(
-        self, canvas: ImageDraw, title: str, desc: str
+        self, title_lines: list[str], desc_lines: list[str]
     ) -> tuple[int, int]:
         """
         Returns the dimensions(width and height, in pixels) of the text(title and
         description) when rendered.
 
+        The title and the description are drawn with a blank line between
+        them, and the height is measured using the font of the description.
+
         Args:
-            canvas (Draw): 2D drawing interface for PIL images.
-            title (str): Title to render
-            desc (str): Description to render.
+            title_lines (list[str]): Lines of the title to render.
+            desc_lines (list[str]): Lines of the description to render.
 
         Returns:
             tuple[int,int]: (width, height) dimensions
         """
-
-        title_bbox = canvas.multiline_textbbox(
-            (0, 0), title, self.title_font, spacing=self.line_spacing
+        title_width, _ = self.title_metrics.get_multiline_size(
+            title_lines, self.line_spacing
         )
-
-        desc_bbox = canvas.multiline_textbbox(
-            (0, 0), desc, self.desc_font, spacing=self.line_spacing
+        desc_width, _ = self.desc_metrics.get_multiline_size(
+            desc_lines, self.line_spacing
         )
-
-        *_, height = canvas.multiline_textbbox(
-            (0, 0),
-            f"{title}\n\n{desc}",
-            self.desc_font,
-            spacing=self.line_spacing,
+        _, height = self.desc_metrics.get_multiline_size(
+            [*title_lines, "", *desc_lines], self.line_spacing
         )
 
-        width = title_bbox[2] if title_bbox[2] > desc_bbox[2] else desc_bbox[2]
+        width = title_width if title_width > desc_width else desc_width
 
         return width, height
 
@@ -234,20 +255,20 @@ class TextImage:
         self.width, _ = self.get_initial_dimensions()
         max_character_count = self.get_max_character_count()
         # wrap the title and the description using the max_character_count
-        wrapped_title = wrap(self.description, max_character_count)
-        wrapped_desc = wrap(self.title, max_character_count)
+        title_lines = wrap(self.title, max_character_count)
+        desc_lines = wrap(self.description, max_character_count)
         self.width, self.height = self.get_dimensions_with_padding(
-            wrapped_title + wrapped_desc
+            desc_lines + title_lines
         )
 
         self.img = Image.new("RGBA", (self.width, self.height), color="white")
         draw = Draw(self.img)
 
-        multi_line_title = fill(self.title, max_character_count)
-        multi_line_desc = fill(self.description, max_character_count)
+        multi_line_title = "\n".join(title_lines)
+        multi_line_desc = "\n".join(desc_lines)
 
         bbox_width, bbox_height = self.get_bbox_dimensions(
-            draw, multi_line_title, multi_line_desc
+            title_lines, desc_lines
         )
 
         anchor_x, anchor_y = self.get_anchor_coordinates(
@@ -263,11 +284,8 @@ class TextImage:
             spacing=self.line_spacing,
         )
 
-        *_, title_height = draw.multiline_textbbox(
-            (0, 0),
-            multi_line_title,
-            self.title_font,
-            spacing=self.line_spacing,
+        _, title_height = self.title_metrics.get_multiline_size(
+            title_lines, self.line_spacing
         )
 
         # Draw the description of the image
@@ -281,7 +299,15 @@ class TextImage:
 
         return ImageOps.expand(self.img, border=10, fill=self.border_color)
 
-    def to_bytes(self) -> bytes:
+    @property
+    def content_key(self) -> tuple:
+        """
+        Returns the values that define the content of the image, the fields
+        set when the image is created.
+        """
+        return tuple(getattr(self, f.name) for f in fields(self) if f.init)
+
+    def render(self) -> bytes:
         buffer = io.BytesIO()
 
         # image.save expects a file-like as a argument
@@ -291,6 +317,183 @@ class TextImage:
         # Turn the BytesIO object back into a bytes object
         return buffer.getvalue()
 
+    def to_bytes(self) -> bytes:
+        """
+        Returns the rendered image. Images with the same content are rendered
+        once per process (and once per ARTIFACTS_TTL when
+        TEXT_IMAGE_ARTIFACTS is enabled), so every channel that posts the
+        same text image shares the bytes.
+        """
+        return render_text_image(self.content_key)
+
+
+def get_text_image_key(content_key: tuple) -> str:
+    digest = hashlib.sha256(repr(content_key).encode()).hexdigest()
+    return f"text_image:{digest}"
+
+
+@lru_cache(maxsize=TEXT_IMAGE_CACHE_SIZE)
+def render_text_image(content_key: tuple) -> bytes:
+    """
+    Renders a TextImage and memoizes the bytes on its content.
+
+    Args:
+        content_key (tuple): values of the init fields of the TextImage, in
+        the order they're declared.
+
+    Returns:
+        bytes: the rendered image.
+    """
+    if not settings.TEXT_IMAGE_ARTIFACTS:
+        return TextImage(*content_key).render()
+
+    key = get_text_image_key(content_key)
+    stored = get_artifacts(key)
+    if stored:
+        return stored[0]
+
+    image = TextImage(*content_key).render()
+    store_artifacts(key, [image])
+    return image
+
+
+# Number of watermark layers kept in memory by each process. Every page of
+# a document usually has the same size, so a few layers cover most events.
+WATERMARK_CACHE_SIZE = 32
+
+
+def get_text_box_dimensions(
+    title: str,
+    small_text: str,
+    title_font: FreeTypeFont,
+    small_font: FreeTypeFont,
+) -> tuple[int, int]:
+    """
+    Returns the dimensions(width and height, in pixels) of a text box to render
+    the sponsored text.
+
+    Returns:
+        tuple[int,int]: (width, height) dimensions
+    """
+    title_w, title_h = title_font.getbbox(title)[-2:]
+    small_w, small_h = small_font.getbbox(small_text)[-2:]
+
+    bbox_height = title_h + small_h
+    bbox_width = max(title_w, small_w)
+
+    return (bbox_width, bbox_height)
+
+
+def fill_text_box(
+    title: str,
+    small_text: str,
+    title_font: FreeTypeFont,
+    small_font: FreeTypeFont,
+) -> ImageCls:
+    """
+    Creates a canvas for the text box and draw the sponsored text inside it
+
+    This method computes the anchors for each line of the sponsor message so
+    the whole message looks centered in the text box.
+
+    Returns:
+        Image: text box image filled with the sponsored text.
+    """
+    text_box_width, text_box_height = get_text_box_dimensions(
+        title, small_text, title_font, small_font
+    )
+
+    text_box_w_padding = (
+        int(text_box_width * 1.1),
+        int(text_box_height * 1.1),
+    )
+
+    text_box = Image.new(
+        "RGBA",
+        text_box_w_padding,
+        (255, 255, 255, 0),
+    )
+    # get a drawing context
+    text_box_draw = Draw(text_box)
+
+    # Draw the title centered in the text box
+    title_w, title_h = title_font.getbbox(title)[-2:]
+    text_box_draw.text(
+        (
+            (text_box_w_padding[0] - title_w) // 2,
+            0.1 * text_box_height // 2,
+        ),
+        title,
+        fill=(25, 25, 25, 128),
+        font=title_font,
+    )
+
+    # Draw the small text centered in the text box
+    small_w, _ = small_font.getbbox(small_text)[-2:]
+    text_box_draw.text(
+        (
+            (text_box_w_padding[0] - small_w) // 2,
+            0.1 * text_box_height // 2 + title_h + 5,
+        ),
+        small_text,
+        fill=(25, 25, 25, 164),
+        font=small_font,
+    )
+
+    return text_box
+
+
+@lru_cache(maxsize=WATERMARK_CACHE_SIZE)
+def get_watermark_layer(
+    title: str,
+    small_text: str,
+    size: tuple[int, int],
+    margin: int,
+    title_font_path: str,
+    small_font_path: str,
+) -> ImageCls:
+    """
+    Returns a transparent layer of the given size with the sponsored text
+    rotated 270 degree CCW and placed along the right edge.
+
+    The layer only depends on the message and the size of the canvas, so it's
+    drawn once per process and shared by every thumbnail with the same size.
+    Callers must not modify the returned image.
+
+    Args:
+        title (str): the sponsor message.
+        small_text (str): the text below the sponsor message.
+        size (tuple[int, int]): (width, height) of the thumbnail.
+        margin (int): distance between the text and the edge, in pixels.
+        title_font_path (str): absolute path of the font of the message.
+        small_font_path (str): absolute path of the font of the small text.
+
+    Returns:
+        Image: the watermark layer.
+    """
+    text_box = fill_text_box(
+        title,
+        small_text,
+        get_font(title_font_path, 46),
+        get_font(small_font_path, 22),
+    )
+
+    # Rotate the text box
+    rotated_text_box = text_box.rotate(
+        angle=270, expand=True, fillcolor=(0, 0, 0, 0)
+    )
+    rotated_text_box_size = rotated_text_box.size
+
+    # make a transparent image for the text
+    overlay_layer = Image.new("RGBA", size, (255, 255, 255, 0))
+
+    # Compute the coordinates to place the text in the overlay layer
+    x = size[0] - rotated_text_box_size[0] - margin
+    y = (size[1] - rotated_text_box_size[1]) // 2
+    overlay_layer.paste(rotated_text_box, (x, y))
+
+    return overlay_layer
+
 
 @dataclass
 class SponsoredThumbnail:
@@ -299,99 +502,24 @@ class SponsoredThumbnail:
     format: str = "png"
     margin: int = 40
     small_text: str | None = None
-    title_font_path: str | None = finders.find("fonts/CooperHewitt-Bold.otf")
-    small_font_path: str | None = finders.find("fonts/CooperHewitt-Medium.otf")
-    text_box: ImageCls = field(init=False)
+    title_font_path: str | None = find_font(BOLD_FONT)
+    small_font_path: str | None = find_font(MEDIUM_FONT)
     background: ImageCls = field(init=False)
     overlay_layer: ImageCls = field(init=False)
 
     def __post_init__(self) -> None:
-        self.title_font = ImageFont.truetype(self.title_font_path, 46)
-        self.small_font = ImageFont.truetype(self.small_font_path, 22)
+        self.title_font = get_font(self.title_font_path, 46)
+        self.small_font = get_font(self.small_font_path, 22)
         self.background = Image.open(io.BytesIO(self.thumbnail)).convert(
             "RGBA"
         )
-        # make a transparent image for the text
-        self.overlay_layer = Image.new(
-            "RGBA", self.background.size, (255, 255, 255, 0)
-        )
         if not self.small_text:
             self.small_text = "Learn more about supporting Free Law Project at https://bots.law/sponsors/"
 
-    def get_text_box_dimensions(self) -> tuple[int, int]:
-        """
-        Returns the dimensions(width and height, in pixels) of a text box to render
-        the sponsored text.
-
-        Returns:
-            tuple[int,int]: (width, height) dimensions
-        """
-        title_w, title_h = self.title_font.getbbox(self.title)[-2:]
-        small_w, small_h = self.small_font.getbbox(self.small_text)[-2:]
-
-        bbox_height = title_h + small_h
-        bbox_width = max(title_w, small_w)
-
-        return (bbox_width, bbox_height)
-
-    def _fill_text_box(self) -> ImageCls:
-        """
-        Creates a canvas for the text box and draw the sponsored text inside it
-
-        This method computes the anchors for each line of the sponsor message so
-        the whole message looks centered in the text box.
-
-        Returns:
-            Image: text box image filled with the sponsored text.
-        """
-        text_box_width, text_box_height = self.get_text_box_dimensions()
-
-        text_box_w_padding = (
-            int(text_box_width * 1.1),
-            int(text_box_height * 1.1),
-        )
-
-        text_box = Image.new(
-            "RGBA",
-            text_box_w_padding,
-            (255, 255, 255, 0),
-        )
-        # get a drawing context
-        text_box_draw = Draw(text_box)
-
-        # Draw the title centered in the text box
-        title_w, title_h = self.title_font.getbbox(self.title)[-2:]
-        text_box_draw.text(
-            (
-                (text_box_w_padding[0] - title_w) // 2,
-                0.1 * text_box_height // 2,
-            ),
-            self.title,
-            fill=(25, 25, 25, 128),
-            font=self.title_font,
-        )
-
-        # Draw the small text centered in the text box
-        small_w, _ = self.small_font.getbbox(self.small_text)[-2:]
-        text_box_draw.text(
-            (
-                (text_box_w_padding[0] - small_w) // 2,
-                0.1 * text_box_height // 2 + title_h + 5,
-            ),
-            self.small_text,
-            fill=(25, 25, 25, 164),
-            font=self.small_font,
-        )
-
-        return text_box
-
     def add_sponsored_text(self) -> None:
         """
         Adds the sponsored text to the thumbnail.
 
-        This method gets the text box and rotates it 270 degree CCW
-        to place it along the left edge of the thumbnail.
-
         If We paste the text box directly into the thumbnail, the
         sponsored message won't use the opacity property. The PIL docs
         has an example to draw partial opacity text and shows that this
@@ -402,26 +530,18 @@ class SponsoredThumbnail:
         - Alpha composite these two images(the blank canvas and the background)
         together to obtain the desired result.
 
-        This function pastes the text box into a canvas called overlay_layer(the
-        blank canvas described in the first step above) and then uses the
-        alpha_composite method to get the desired result.
+        The blank canvas with the text (the overlay layer) is taken from the
+        cache of get_watermark_layer, so only the second step runs for each
+        thumbnail.
         """
-        # Get the text box
-        self.text_box = self._fill_text_box()
-
-        # Rotate the text box
-        rotated_text_box = self.text_box.rotate(
-            angle=270, expand=True, fillcolor=(0, 0, 0, 0)
+        self.overlay_layer = get_watermark_layer(
+            self.title,
+            self.small_text,
+            self.background.size,
+            self.margin,
+            self.title_font_path,
+            self.small_font_path,
         )
-        rotated_text_box_size = rotated_text_box.size
-
-        # Compute the coordinates to place the text in the overlay layer
-        overlay_size = self.overlay_layer.size
-        x = overlay_size[0] - rotated_text_box_size[0] - self.margin
-        y = (overlay_size[1] - rotated_text_box_size[1]) // 2
-
-        # Place the text in the
-        self.overlay_layer.paste(rotated_text_box, (x, y))
 
         # Combine the overlay layer and the background
         self.background = Image.alpha_composite(
@@ -452,24 +572,6 @@ def add_sponsored_text_to_thumbnails(
     return watermarked_thumbnails
 
 
-def convert_to_jpeg(
-    image: bytes,
-    quality: int = 85,
-) -> bytes:
-    # Load the image from bytes
-    with Image.open(io.BytesIO(image)) as img:
-        # Ensure image is in RGB mode (JPEG requirement, no transparency)
-        if img.mode != "RGB":
-            img = img.convert("RGB")
-
-        # Save the converted image to JPEG format
-        jpeg_image = io.BytesIO()
-        img.save(jpeg_image, format="JPEG", quality=quality)
-        jpeg_image.seek(0)  # Move to the beginning of the byte stream
-
-    return jpeg_image.getvalue()
-
-
 def resize_image(
     image: bytes,
     min_width: int | None = None,
@@ -0,0 +1,251 @@
+import io
+from dataclasses import dataclass
+
+from PIL import Image
+from PIL.Image import Image as ImageCls
+
+from bc.core.utils.images import resize_image
+
+# Range of qualities tried when a JPEG image has to fit a size limit
+MAX_JPEG_QUALITY = 85
+MIN_JPEG_QUALITY = 40
+
+# Images that don't fit a size limit at the minimum quality are scaled down
+# by this factor until they do.
+DOWNSCALE_FACTOR = 0.8
+MAX_DOWNSCALES = 5
+
+# Tolerance used to compare aspect ratios, since the cropped sizes are
+# rounded to whole pixels.
+ASPECT_RATIO_TOLERANCE = 0.01
+
+
+@dataclass(frozen=True)
+class MediaSpec:
+    """
+    Describes the images a platform accepts.
+
+    Attributes:
+        formats (tuple[str, ...]): PIL names of the accepted formats, in
+        order of preference.
+        max_bytes (int | None): max size of each file.
+        min_width (int | None): min width of each image.
+        max_width (int | None): max width of each image.
+        min_aspect_ratio (float | None): min width/height ratio.
+        max_aspect_ratio (float | None): max width/height ratio.
+    """
+
+    formats: tuple[str, ...]
+    max_bytes: int | None = None
+    min_width: int | None = None
+    max_width: int | None = None
+    min_aspect_ratio: float | None = None
+    max_aspect_ratio: float | None = None
+
+    @property
+    def has_size_limits(self) -> bool:
+        return any(
+            limit is not None
+            for limit in (
+                self.min_width,
+                self.max_width,
+                self.min_aspect_ratio,
+                self.max_aspect_ratio,
+            )
+        )
+
+
+# Platforms that are not listed here take the PNG images as they are.
+MEDIA_SPECS: dict[str, MediaSpec] = {
+    # The size limit is specified in the app.bsky.embed.images lexicon
+    "bluesky": MediaSpec(formats=("PNG", "JPEG"), max_bytes=1_000_000),
+    "threads": MediaSpec(
+        formats=("JPEG",),
+        max_bytes=8 * 1024 * 1024,
+        min_width=320,
+        max_width=1440,
+        min_aspect_ratio=4 / 5,
+        max_aspect_ratio=1.91,
+    ),
+}
+
+
+def get_mime_type(image: bytes) -> str:
+    """Returns the MIME type of an image by reading its header."""
+    with Image.open(io.BytesIO(image)) as img:
+        return Image.MIME[img.format]
+
+
+def fits_spec(image: bytes, spec: MediaSpec) -> bool:
+    """
+    Checks whether an image already meets the requirements of a platform.
+    Only the header of the image is read, so this check is cheap.
+
+    Args:
+        image (bytes): the image to check.
+        spec (MediaSpec): the requirements of the platform.
+
+    Returns:
+        bool: whether the image can be uploaded as is.
+    """
+    if spec.max_bytes is not None and len(image) > spec.max_bytes:
+        return False
+
+    with Image.open(io.BytesIO(image)) as img:
+        if img.format not in spec.formats:
+            return False
+        width, height = img.size
+
+    aspect_ratio = width / height
+    return not (
+        (spec.min_width is not None and width < spec.min_width)
+        or (spec.max_width is not None and width > spec.max_width)
+        or (
+            spec.min_aspect_ratio is not None
+            and aspect_ratio < spec.min_aspect_ratio - ASPECT_RATIO_TOLERANCE
+        )
+        or (
+            spec.max_aspect_ratio is not None
+            and aspect_ratio > spec.max_aspect_ratio + ASPECT_RATIO_TOLERANCE
+        )
+    )
+
+
+def _save(img: ImageCls, image_format: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == "JPEG" and img.mode != "RGB":
+        # JPEG images don't support transparency
+        img = img.convert("RGB")
+    img.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def encode_jpeg(img: ImageCls, max_bytes: int | None) -> bytes:
+    """
+    Encodes an image as JPEG using the best quality that fits the size limit.
+
+    The quality is picked with a binary search between MIN_JPEG_QUALITY and
+    MAX_JPEG_QUALITY. When the image doesn't fit at the minimum quality, it's
+    scaled down and the search runs again.
+
+    Args:
+        img (Image): the image to encode.
+        max_bytes (int | None): max size of the file.
+
+    Returns:
+        bytes: the JPEG file. It may still go over the limit if the image
+        doesn't fit after MAX_DOWNSCALES attempts.
+    """
+    data = _save(img, "JPEG", quality=MAX_JPEG_QUALITY)
+    if max_bytes is None or len(data) <= max_bytes:
+        return data
+
+    for _ in range(MAX_DOWNSCALES):
+        low, high = MIN_JPEG_QUALITY, MAX_JPEG_QUALITY - 1
+        best = None
+        while low <= high:
+            quality = (low + high) // 2
+            data = _save(img, "JPEG", quality=quality)
+            if len(data) <= max_bytes:
+                best = data
+                low = quality + 1
+            else:
+                high = quality - 1
+        if best is not None:
+            return best
+
+        width, height = img.size
+        img = img.resize(
+            (int(width * DOWNSCALE_FACTOR), int(height * DOWNSCALE_FACTOR)),
+            Image.Resampling.LANCZOS,
+        )
+
+    return data
+
+
+def fit_image_to_spec(image: bytes, spec: MediaSpec) -> bytes:
+    """
+    Converts an image so it meets the requirements of a platform. Images
+    that already meet them are returned unchanged.
+
+    Args:
+        image (bytes): the original image.
+        spec (MediaSpec): the requirements of the platform.
+
+    Returns:
+        bytes: the converted image.
+    """
+    if fits_spec(image, spec):
+        return image
+
+    if spec.has_size_limits:
+        image = resize_image(
+            image=image,
+            min_width=spec.min_width,
+            max_width=spec.max_width,
+            min_aspect_ratio=spec.min_aspect_ratio,
+            max_aspect_ratio=spec.max_aspect_ratio,
+        )
+
+    with Image.open(io.BytesIO(image)) as img:
+        original_format = img.format
+        img.load()
+
+    data = image
+    for image_format in spec.formats:
+        if image_format == "JPEG":
+            data = encode_jpeg(img, spec.max_bytes)
+        elif image_format != original_format:
+            data = _save(img, image_format)
+        else:
+            data = image
+        if spec.max_bytes is None or len(data) <= spec.max_bytes:
+            break
+    return data
+
+
+class MediaVariants:
+    """
+    The variants of a set of images for each platform.
+
+    Each variant is computed the first time a platform asks for it and
+    reused for the rest of the channels of the same platform.
+    """
+
+    def __init__(self, images: list[bytes] | None) -> None:
+        self.images = images
+        self._variants: dict[str, list[bytes]] = {}
+
+    def get(self, name: str | None) -> list[bytes] | None:
+        """
+        Args:
+            name (str | None): key of the platform in MEDIA_SPECS. Platforms
+            without specs get the original images.
+
+        Returns:
+            list[bytes] | None: the images converted for the platform.
+        """
+        if not self.images or name not in MEDIA_SPECS:
+            return self.images
+
+        if name not in self._variants:
+            self._variants[name] = make_media_variant(self.images, name)
+        return self._variants[name]
+
+
+def make_media_variant(images: list[bytes], name: str | None) -> list[bytes]:
+    """
+    Converts a list of images for a platform.
+
+    Args:
+        images (list[bytes]): the original images.
+        name (str | None): key of the platform in MEDIA_SPECS. Platforms
+        without specs get the original images.
+
+    Returns:
+        list[bytes]: the converted images.
+    """
+    if name not in MEDIA_SPECS:
+        return images
+    spec = MEDIA_SPECS[name]
+    return [fit_image_to_spec(image, spec) for image in images]
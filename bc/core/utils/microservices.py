@@ -1,31 +1,112 @@
+import os
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import IO
+from uuid import uuid4
 from zipfile import ZipFile
 
 import requests
 from django.conf import settings
 
+THUMBNAIL_MAX_DIMENSION = 1920
+ZIP_CHUNK_SIZE = 64 * 1024
 
-def get_thumbnails_from_range(document: bytes, page_range: str) -> list[bytes]:
+
+class MultipartFileBody:
+    """
+    A multipart/form-data request body that reads the file from its handle
+    while the request is sent.
+
+    requests builds multipart bodies in memory, so this class is passed as
+    the `data` of a request instead. Its `len` attribute is used to set the
+    Content-Length header and the body is read in blocks by http.client.
     """
-    Returns a list that contains a thumbnail(as a binary object) for each
-    page requested.
+
+    def __init__(
+        self, fields: dict[str, str], file_name: str, file: IO[bytes]
+    ) -> None:
+        boundary = uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+
+        head = "".join(
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n"
+            for name, value in fields.items()
+        )
+        head += (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; '
+            f'filename="{file_name}"\r\n\r\n'
+        )
+        tail = f"\r\n--{boundary}--\r\n"
+
+        file_size = file.seek(0, os.SEEK_END)
+        file.seek(0)
+        self.len = len(head.encode()) + file_size + len(tail.encode())
+        self._parts: list[IO[bytes]] = [
+            BytesIO(head.encode()),
+            file,
+            BytesIO(tail.encode()),
+        ]
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while self._parts and size != 0:
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b"".join(chunks)
+
+
+def request_thumbnails_from_doctor(
+    document: IO[bytes], page_range: str
+) -> list[bytes]:
+    """
+    Asks Doctor to render a thumbnail for each page requested.
+
+    The document is streamed from its file handle, so it's never fully
+    loaded in memory.
 
     Args:
-        document (bytes): document content as bytes
+        document (IO[bytes]): file handle of the document
         page_range (str): str representation of the list of pages requested
 
     Returns:
         list[bytes]: list of thumbnails
+
+    Raises:
+        requests.HTTPError: if Doctor returns an error response.
     """
-    thumbnails = requests.post(
+    body = MultipartFileBody(
+        {"pages": page_range, "max_dimension": str(THUMBNAIL_MAX_DIMENSION)},
+        "dummy.pdf",
+        document,
+    )
+    response = requests.post(
         f"{settings.DOCTOR_HOST}/convert/pdf/thumbnails/",
-        data={"pages": page_range, "max_dimension": "1920"},
-        files={"file": ("dummy.pdf", document)},
+        data=body,
+        headers={"Content-Type": body.content_type},
+        stream=True,
         timeout=60,
     )
+    with response:
+        # Error pages aren't zip files, so fail before reading the body
+        response.raise_for_status()
 
-    zipfile = ZipFile(BytesIO(thumbnails.content))
-    return [
-        zipfile.open(file_name).read()
-        for file_name in sorted(zipfile.namelist())
-    ]
+        # The zip index is at the end of the file, so the response is spooled
+        # before the entries are read one by one.
+        with SpooledTemporaryFile(
+            max_size=settings.PDF_SPOOL_MEMORY_SIZE
+        ) as archive:
+            for chunk in response.iter_content(ZIP_CHUNK_SIZE):
+                archive.write(chunk)
+            with ZipFile(archive) as zipfile:
+                return [
+                    zipfile.read(file_name)
+                    for file_name in sorted(zipfile.namelist())
+                ]
@@ -0,0 +1,111 @@
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from fnmatch import fnmatchcase
+from typing import Any
+
+from django.conf import settings
+from django_rq.queues import Queue, get_queue
+from redis import Redis
+from redis.client import Pipeline
+from rq.job import Job
+from rq.queue import EnqueueData
+
+
+def get_route_name(func: Callable) -> str:
+    """
+    Returns the dotted path used to look up a function in RQ_ROUTES. Bound
+    methods include the name of their class, so connector methods look like
+    `bc.channel.utils.connectors.masto.MastodonConnector.add_status`.
+    """
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def get_queue_name(func: Callable) -> str:
+    """
+    Returns the name of the queue assigned to the given function. Keys of
+    RQ_ROUTES are shell-style patterns and the first match wins. Functions
+    without a route use the default queue.
+    """
+    route_name = get_route_name(func)
+    for pattern, queue_name in settings.RQ_ROUTES.items():
+        if fnmatchcase(route_name, pattern):
+            return queue_name
+    return "default"
+
+
+class QueueRouter:
+    """
+    Sends each job to the queue assigned to its function in RQ_ROUTES.
+
+    This class exposes the part of the Queue API used to enqueue jobs, so a
+    module can keep a single `queue` object no matter the workload of the
+    jobs it creates. Every queue lives in the same Redis database, so jobs
+    in one queue can depend on jobs from another one.
+    """
+
+    def __init__(self) -> None:
+        self._queues: dict[str, Queue] = {}
+
+    def get_queue(self, name: str) -> Queue:
+        if name not in self._queues:
+            self._queues[name] = get_queue(name)
+        return self._queues[name]
+
+    def get_queue_for(self, func: Callable) -> Queue:
+        return self.get_queue(get_queue_name(func))
+
+    @property
+    def connection(self) -> Redis:
+        return self.get_queue("default").connection
+
+    @property
+    def is_async(self) -> bool:
+        return self.get_queue("default").is_async
+
+    def enqueue(self, f: Callable, *args, **kwargs) -> Job:
+        return self.get_queue_for(f).enqueue(f, *args, **kwargs)
+
+    def enqueue_in(
+        self, time_delta: timedelta, func: Callable, *args, **kwargs
+    ) -> Job:
+        return self.get_queue_for(func).enqueue_in(
+            time_delta, func, *args, **kwargs
+        )
+
+    def enqueue_at(
+        self, datetime: datetime, f: Callable, *args, **kwargs
+    ) -> Job:
+        return self.get_queue_for(f).enqueue_at(datetime, f, *args, **kwargs)
+
+    def create_job(self, func: Callable, **kwargs: Any) -> Job:
+        return self.get_queue_for(func).create_job(func, **kwargs)
+
+    def schedule_job(
+        self,
+        job: Job,
+        datetime: datetime,
+        pipeline: Pipeline | None = None,
+    ) -> Job:
+        return self.get_queue(job.origin).schedule_job(
+            job, datetime, pipeline=pipeline
+        )
+
+    def enqueue_many(
+        self,
+        job_datas: list[EnqueueData],
+        pipeline: Pipeline | None = None,
+    ) -> list[Job]:
+        job_datas_per_queue: dict[str, list[EnqueueData]] = defaultdict(list)
+        for job_data in job_datas:
+            queue_name = get_queue_name(job_data.func)
+            job_datas_per_queue[queue_name].append(job_data)
+
+        jobs = []
+        for queue_name, queue_job_datas in job_datas_per_queue.items():
+            jobs.extend(
+                self.get_queue(queue_name).enqueue_many(
+                    queue_job_datas, pipeline=pipeline
+                )
+            )
+        return jobs
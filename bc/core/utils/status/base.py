@@ -1,6 +1,9 @@
 import re
-from dataclasses import dataclass
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from functools import partial
 from string import Formatter
+from typing import ClassVar
 
 from django.template import Context, NodeList, Template
 from django.template.base import VariableNode
@@ -9,6 +12,8 @@ from django.template.defaulttags import IfNode
 from bc.core.utils.images import TextImage
 from bc.core.utils.string_utils import trunc
 
+from .length import measure
+
 
 class InvalidTemplate(Exception):
     pass
@@ -21,14 +26,103 @@ class AlwaysBlankValueDict(dict):
         return ""
 
 
-@dataclass
+CONTROL_TAG_PATTERN = re.compile(r"{%[^%]*%}", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """
+    The output of a template for one post.
+
+    It can be unpacked as `text, image = template.format(...)`.
+
+    Attributes:
+        text (str): the text of the post.
+        image (TextImage | None): image with the full description, when it
+        doesn't fit in the text.
+        is_valid (bool): whether the text fits the platform and has no
+        unfilled placeholders.
+        length (int): number of characters of the text, as counted by the
+        platform.
+        max_characters (int): max number of characters of the platform.
+    """
+
+    text: str
+    image: TextImage | None
+    is_valid: bool
+    length: int
+    max_characters: int
+
+    @property
+    def available_characters(self) -> int:
+        return self.max_characters - self.length
+
+    def __iter__(self) -> Iterator:
+        return iter((self.text, self.image))
+
+
+@dataclass(frozen=True)
 class BaseTemplate:
+    """
+    Template of the posts of a platform.
+
+    Templates are immutable and `format` doesn't change them, so the same
+    object can be shared by every channel and used from several threads.
+    """
+
     str_template: str
-    link_placeholders: list[str]
+    link_placeholders: tuple[str, ...]
     max_characters: int
     border_color: tuple[int, ...] = (243, 195, 62)
-    is_valid: bool = True
-    _django_template: Template | None = None
+    # Name of the platform whose rules are used to count the characters
+    platform: ClassVar[str | None] = None
+
+    # Parts of the template computed once by `__post_init__`
+    _django_template: Template | None = field(
+        init=False, repr=False, compare=False
+    )
+    _fixed_characters: int = field(init=False, repr=False, compare=False)
+    _template_fields: list[str] = field(init=False, repr=False, compare=False)
+    _counted_fields: list[str] = field(init=False, repr=False, compare=False)
+    _fixed_space: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Computes the parts of the template that don't depend on the values of
+        the placeholders, so `format` only does the work that changes from
+        one post to the next.
+        """
+        # The dataclass is frozen, so the attributes are set directly
+        set_attr = partial(object.__setattr__, self)
+        set_attr(
+            "_django_template",
+            Template(self.str_template) if self._is_django_template else None,
+        )
+        set_attr("_fixed_characters", self._render_fixed_characters())
+        set_attr("_template_fields", self._parse_template_fields())
+
+        excluded = {*self.link_placeholders, "description"}
+        set_attr(
+            "_counted_fields",
+            [
+                field_name
+                for field_name in self._template_fields
+                if field_name and field_name not in excluded
+            ],
+        )
+        # Flow control tags are removed from the output
+        control_tags_length = (
+            sum(
+                len(tag)
+                for tag in CONTROL_TAG_PATTERN.findall(self.str_template)
+            )
+            if self.django_template
+            else 0
+        )
+        set_attr(
+            "_fixed_space",
+            self.max_characters - len(self) - control_tags_length,
+        )
 
     def __len__(self) -> int:
         """Returns the length of the template without the placeholders
@@ -38,13 +132,19 @@ class BaseTemplate:
         """
         return self.count_fixed_characters()
 
-    def count_fixed_characters(self):
+    def count_fixed_characters(self) -> int:
+        """Returns the number of fixed characters, computed when the template
+        is created."""
+        return self._fixed_characters
+
+    def _render_fixed_characters(self) -> int:
         """Returns the number of fixed characters
 
         this method removes all the placerholders in the str_template
         using a dictionary that returns a blank string for each key
         and then computes the len of the new string.
         """
+        clean_template: str
         if self.django_template:
             clean_template = self.django_template.render(
                 Context(AlwaysBlankValueDict())
@@ -62,54 +162,29 @@ class BaseTemplate:
         this method ignores all the links in the str_template because Mastodon
         uses a fixed length for them.
         """
-        excluded = self.link_placeholders.copy()
-        excluded.append("description")
-
         placeholder_characters = sum(
-            [
-                len(str(kwargs.get(field_name)))
-                for field_name in self.template_fields
-                if field_name and field_name not in excluded
-            ]
+            len(str(kwargs.get(field_name)))
+            for field_name in self._counted_fields
         )
-        if self.django_template:
-            # Remove flow control tags from the template
-            placeholder_characters += sum(
-                [
-                    len(x)
-                    for x in re.findall(
-                        r"{%[^%]*%}", self.str_template, re.MULTILINE
-                    )
-                ]
-            )
-
-        return self.max_characters - len(self) - placeholder_characters
-
-    def _check_output_validity(self, text: str) -> bool:
+        return self._fixed_space - placeholder_characters
+
+    def format(
+        self,
+        *args,
+        border_color: tuple[int, ...] | None = None,
+        **kwargs,
+    ) -> RenderResult:
         """
-        Checks whether the provided text exceeds the maximum allowed length.
-
-        Strips links from the output text since they use a fixed character
-        count.
+        Renders the template with the given values.
 
         Args:
-            text (str): The text to be evaluated.
+            border_color (tuple[int, ...] | None): border color of the image
+            with the full description. Defaults to the one of the template.
+            **kwargs: values of the placeholders.
 
         Returns:
-            bool: True if the text length is within the limit, False otherwise.
+            RenderResult: the text, the image and the length of the post.
         """
-        url_pattern = r"https?://\S+"
-        url_count = len(re.findall(url_pattern, text))
-        linkless_output = re.sub(url_pattern, "", text)
-        unfilled_template_items = re.findall(r"({\w+}|{%|%})", linkless_output)
-
-        # Twitter and Mastodon both count links as 23 chars at present
-        return (
-            len(linkless_output) + (23 * url_count) <= self.max_characters
-            and len(unfilled_template_items) == 0
-        )
-
-    def format(self, *args, **kwargs) -> tuple[str, TextImage | None]:
         image = None
 
         if "description" in kwargs:
@@ -119,7 +194,7 @@ class BaseTemplate:
                 image = TextImage(
                     f"{docket}",
                     kwargs["description"],
-                    border_color=self.border_color,
+                    border_color=border_color or self.border_color,
                 )
                 kwargs["description"] = trunc(
                     kwargs["description"],
@@ -131,9 +206,14 @@ class BaseTemplate:
         else:
             text = self.str_template.format(**kwargs)
 
-        self.is_valid = self._check_output_validity(text)
-
-        return text, image
+        length = measure(text)
+        return RenderResult(
+            text,
+            image,
+            length.fits(self.platform, self.max_characters),
+            length.for_platform(self.platform),
+            self.max_characters,
+        )
 
     @property
     def _is_django_template(self) -> bool:
@@ -152,9 +232,6 @@ class BaseTemplate:
         Returns:
             Template: Django template object
         """
-
-        if not self._django_template and self._is_django_template:
-            self._django_template = Template(self.str_template)
         return self._django_template
 
     @property
@@ -164,6 +241,9 @@ class BaseTemplate:
         Returns:
             list[str]: list of fields in the template
         """
+        return self._template_fields
+
+    def _parse_template_fields(self) -> list[str]:
         if self.django_template:
             return _get_node_list_fields(
                 self.django_template.compile_nodelist()
@@ -176,8 +256,9 @@ class BaseTemplate:
             ]
 
 
-@dataclass
+@dataclass(frozen=True)
 class MastodonTemplate(BaseTemplate):
+    platform: ClassVar[str | None] = "mastodon"
     max_characters: int = 300
 
     def __len__(self) -> int:
@@ -189,8 +270,9 @@ class MastodonTemplate(BaseTemplate):
         return 23 * len(self.link_placeholders) + self.count_fixed_characters()
 
 
-@dataclass
+@dataclass(frozen=True)
 class TwitterTemplate(BaseTemplate):
+    platform: ClassVar[str | None] = "twitter"
     max_characters: int = 280
 
     def __len__(self) -> int:
@@ -202,27 +284,15 @@ class TwitterTemplate(BaseTemplate):
         return 23 * len(self.link_placeholders) + self.count_fixed_characters()
 
 
-@dataclass
+@dataclass(frozen=True)
 class BlueskyTemplate(BaseTemplate):
+    platform: ClassVar[str | None] = "bluesky"
     max_characters: int = 300
 
-    def _check_output_validity(self, text: str) -> bool:
-        """This method overrides `Template._check_output_validity`.
-
-        Strips links from the output text since they form part of the custom
-        markup language.
-        """
-        cleaned_text = re.sub(r"(?<=])\(\S+\)", "", text)
-        unfilled_template_items = re.findall(r"({\w+}|{%|%})", cleaned_text)
-
-        return (
-            len(cleaned_text) <= self.max_characters
-            and len(unfilled_template_items) == 0
-        )
-
 
-@dataclass
+@dataclass(frozen=True)
 class ThreadsTemplate(BaseTemplate):
+    platform: ClassVar[str | None] = "threads"
     max_characters: int = 300
 
     def __len__(self) -> int:
@@ -0,0 +1,136 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Number of characters a link counts for in the platforms that shorten them.
+# Threads truncates links longer than 24 characters, so they take up to 24.
+LINK_LENGTHS: dict[str, int] = {
+    "mastodon": 23,
+    "twitter": 23,
+    "threads": 24,
+}
+DEFAULT_LINK_LENGTH = 23
+
+# Platforms where links are written with the markup `[text](url)` and only
+# the text counts. Plain URLs count with their full length.
+MARKUP_PLATFORMS = {"bluesky"}
+
+# The alternatives are tried in order at each position, so a markup link is
+# read as a whole before its URL.
+TOKEN_PATTERN = re.compile(
+    r"(?P<markup>(?<=])\((?P<target>\S+)\))"
+    r"|(?P<url>https?://\S+)"
+    r"|(?P<unfilled>{\w+}|{%|%})"
+)
+URL_PREFIX_PATTERN = re.compile(r"https?://")
+
+# Number of measured messages kept in memory by each process
+MEASURE_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class MessageLength:
+    """
+    The pieces of a message that count toward its length.
+
+    Attributes:
+        plain_characters (int): characters outside links.
+        url_count (int): number of plain URLs.
+        url_characters (int): characters of the plain URLs.
+        markup_url_count (int): number of URLs inside link markup.
+        markup_plain_characters (int): characters of the link markup that
+        aren't URLs, counted by the platforms without markup.
+        has_unfilled_items (bool): whether the message has placeholders or
+        template tags that weren't filled.
+    """
+
+    plain_characters: int
+    url_count: int
+    url_characters: int
+    markup_url_count: int
+    markup_plain_characters: int
+    has_unfilled_items: bool
+
+    def for_platform(self, platform: str | None) -> int:
+        """
+        Returns the length of the message under the counting rules of a
+        platform.
+
+        Args:
+            platform (str | None): name of the platform. Unknown platforms
+            and None count links like Twitter and Mastodon.
+
+        Returns:
+            int: number of characters.
+        """
+        if platform in MARKUP_PLATFORMS:
+            return self.plain_characters + self.url_characters
+
+        link_length = (
+            LINK_LENGTHS.get(platform, DEFAULT_LINK_LENGTH)
+            if platform is not None
+            else DEFAULT_LINK_LENGTH
+        )
+        return (
+            self.plain_characters
+            + self.markup_plain_characters
+            + link_length * (self.url_count + self.markup_url_count)
+        )
+
+    def fits(self, platform: str | None, max_characters: int) -> bool:
+        """Checks whether the message is complete and fits a platform."""
+        return (
+            not self.has_unfilled_items
+            and self.for_platform(platform) <= max_characters
+        )
+
+
+@lru_cache(maxsize=MEASURE_CACHE_SIZE)
+def measure(text: str) -> MessageLength:
+    """
+    Scans a message once and splits it in the pieces needed to compute its
+    length in every platform.
+
+    Args:
+        text (str): the rendered message.
+
+    Returns:
+        MessageLength: the length accounting of the message.
+    """
+    position = 0
+    plain_characters = 0
+    url_count = url_characters = 0
+    markup_url_count = markup_plain_characters = 0
+    has_unfilled_items = False
+
+    for token in TOKEN_PATTERN.finditer(text):
+        start, end = token.span()
+        plain_characters += start - position
+        position = end
+
+        match token.lastgroup:
+            case "markup":
+                target = token["target"]
+                if URL_PREFIX_PATTERN.match(target):
+                    # The parentheses are plain text in the other platforms
+                    markup_url_count += 1
+                    markup_plain_characters += 2
+                else:
+                    markup_plain_characters += end - start
+            case "url":
+                url_count += 1
+                url_characters += end - start
+            case "unfilled":
+                has_unfilled_items = True
+                plain_characters += end - start
+
+    plain_characters += len(text) - position
+
+    return MessageLength(
+        plain_characters=plain_characters,
+        url_count=url_count,
+        url_characters=url_characters,
+        markup_url_count=markup_url_count,
+        markup_plain_characters=markup_plain_characters,
+        has_unfilled_items=has_unfilled_items,
+    )
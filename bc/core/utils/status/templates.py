@@ -1,5 +1,3 @@
-import re
-
 from .base import (
     BlueskyTemplate,
     MastodonTemplate,
@@ -7,29 +5,8 @@ from .base import (
     TwitterTemplate,
 )
 
-DO_NOT_POST = re.compile(
-    r"""(
-    pro\shac\svice|                 #pro hac vice
-    notice\sof\sappearance|         #notice of appearance
-    certificate\sof\sdisclosure|    #certificate of disclosure
-    corporate\sdisclosure|          #corporate disclosure
-    add\sand\sterminate\sattorneys| #add and terminate attorneys
-    none                            #entries with bad data
-    )""",
-    re.VERBOSE | re.IGNORECASE,
-)
-
-DO_NOT_PAY = re.compile(
-    r"""(
-    withdraw\sas\sattorney|         # withdraw as attorney
-    summons\s.*\sexecuted|          # summons .* executed
-    none
-    )""",
-    re.VERBOSE | re.IGNORECASE,
-)
-
 MASTODON_POST_TEMPLATE = MastodonTemplate(
-    link_placeholders=["pdf_link", "docket_link"],
+    link_placeholders=("pdf_link", "docket_link"),
     str_template="""New filing: "{docket}"
 Doc #{doc_num}: {description}
 
@@ -41,7 +18,7 @@ Docket: {docket_link}
 
 
 MASTODON_MINUTE_TEMPLATE = MastodonTemplate(
-    link_placeholders=["docket_link"],
+    link_placeholders=("docket_link",),
     str_template="""New minute entry in {docket}: {description}
 
 Docket: {docket_link}
@@ -50,7 +27,7 @@ Docket: {docket_link}
 )
 
 MASTODON_FOLLOW_A_NEW_CASE = MastodonTemplate(
-    link_placeholders=["docket_link", "initial_complaint_link", "article_url"],
+    link_placeholders=("docket_link", "initial_complaint_link", "article_url"),
     str_template="""{% autoescape off %}I'm now following {{docket}}:{% if date_filed %}
 
 Filed: {{date_filed}}{% endif %}
@@ -66,7 +43,7 @@ Context: {{article_url}}{% endif %}
 
 
 TWITTER_POST_TEMPLATE = TwitterTemplate(
-    link_placeholders=["pdf_link"],
+    link_placeholders=("pdf_link",),
     str_template="""New filing: "{docket}"
 Doc #{doc_num}: {description}
 
@@ -76,7 +53,7 @@ PDF: {pdf_link}
 )
 
 TWITTER_MINUTE_TEMPLATE = TwitterTemplate(
-    link_placeholders=["docket_link"],
+    link_placeholders=("docket_link",),
     str_template="""New minute entry in {docket}: {description}
 
 Docket: {docket_link}
@@ -85,7 +62,7 @@ Docket: {docket_link}
 )
 
 TWITTER_FOLLOW_A_NEW_CASE = TwitterTemplate(
-    link_placeholders=["docket_link", "initial_complaint_link", "article_url"],
+    link_placeholders=("docket_link", "initial_complaint_link", "article_url"),
     str_template="""{% autoescape off %}I'm now following {{docket}}:{% if date_filed %}
 
 Filed: {{date_filed}}{% endif %}
@@ -100,7 +77,7 @@ Context: {{article_url}}{% endif %}
 )
 
 BLUESKY_FOLLOW_A_NEW_CASE = BlueskyTemplate(
-    link_placeholders=["docket_link", "article_url", "initial_complaint_link"],
+    link_placeholders=("docket_link", "article_url", "initial_complaint_link"),
     # Remove extra newlines caused by empty template blocks
     str_template="""{% autoescape off %}I'm now following {{docket}}:{% if date_filed %}
 
@@ -112,7 +89,7 @@ Filed: {{date_filed}}{% endif %}
 )
 
 BLUESKY_POST_TEMPLATE = BlueskyTemplate(
-    link_placeholders=["pdf_link", "docket_link"],
+    link_placeholders=("pdf_link", "docket_link"),
     str_template="""New filing: "{docket}"
 Doc #{doc_num}: {description}
 
@@ -122,7 +99,7 @@ Doc #{doc_num}: {description}
 )
 
 BLUESKY_MINUTE_TEMPLATE = BlueskyTemplate(
-    link_placeholders=["docket_link"],
+    link_placeholders=("docket_link",),
     str_template="""New minute entry in {docket}: {description}
 
 [View Full Case]({docket_link})
@@ -131,7 +108,7 @@ BLUESKY_MINUTE_TEMPLATE = BlueskyTemplate(
 )
 
 THREADS_POST_TEMPLATE = ThreadsTemplate(
-    link_placeholders=["pdf_link", "docket_link"],
+    link_placeholders=("pdf_link", "docket_link"),
     str_template="""New filing: "{docket}"
 Doc #{doc_num}: {description}
 
@@ -142,7 +119,7 @@ Docket: {docket_link}
 )
 
 THREADS_MINUTE_TEMPLATE = ThreadsTemplate(
-    link_placeholders=["docket_link"],
+    link_placeholders=("docket_link",),
     str_template="""New minute entry in {docket}: {description}
 
 Docket: {docket_link}
@@ -151,7 +128,7 @@ Docket: {docket_link}
 )
 
 THREADS_FOLLOW_A_NEW_CASE = ThreadsTemplate(
-    link_placeholders=["docket_link", "initial_complaint_link", "article_url"],
+    link_placeholders=("docket_link", "initial_complaint_link", "article_url"),
     str_template="""{% autoescape off %}I'm now following {{docket}}:{% if date_filed %}
 
 Filed: {{date_filed}}{% endif %}
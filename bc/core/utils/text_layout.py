@@ -0,0 +1,126 @@
+from functools import cache
+from math import floor
+
+from PIL.ImageFont import FreeTypeFont
+
+from bc.core.utils.fonts import get_font
+
+
+class FontMetrics:
+    """
+    Measures text using metrics of single glyphs that are cached for the
+    lifetime of the process.
+
+    Without a complex layout engine, FreeType places each glyph after the
+    advance of the previous one plus the kerning of the pair. So:
+
+    - The advance of a line is the sum of the advances of its glyphs and the
+      kerning of each pair.
+    - The right edge of a line is the advance of every glyph but the last
+      one plus the right edge of the last glyph drawn at that position.
+      Positions are multiples of 1/64 pixel, so the right edge of each glyph
+      is cached per fractional position.
+    - The bottom of a line is the lowest bottom of its glyphs.
+
+    The results are the same as the ones of `FreeTypeFont.getbbox`, but
+    measuring a line doesn't need to lay out every glyph with FreeType.
+    """
+
+    def __init__(self, font: FreeTypeFont) -> None:
+        self.font = font
+        self._advances: dict[str, float] = {}
+        self._kerning: dict[tuple[str, str], float] = {}
+        self._right_edges: dict[tuple[str, int], int] = {}
+        self._bottoms: dict[str, int] = {}
+        # Distance between the lines of multiline text without spacing,
+        # computed the same way as ImageDraw.
+        self.line_height = int(font.getbbox("A", "L")[3])
+
+    def _get_advance(self, char: str) -> float:
+        advance = self._advances.get(char)
+        if advance is None:
+            advance = self._advances[char] = self.font.getlength(char)
+        return advance
+
+    def _get_kerning(self, pair: tuple[str, str]) -> float:
+        kerning = self._kerning.get(pair)
+        if kerning is None:
+            kerning = self._kerning[pair] = (
+                self.font.getlength(pair[0] + pair[1])
+                - self._get_advance(pair[0])
+                - self._get_advance(pair[1])
+            )
+        return kerning
+
+    def _get_right_edge(self, char: str, fraction: int) -> int:
+        key = (char, fraction)
+        right_edge = self._right_edges.get(key)
+        if right_edge is None:
+            mask, offset = self.font.getmask2(
+                char, "L", start=(fraction / 64, 0)
+            )
+            right_edge = self._right_edges[key] = offset[0] + mask.size[0]
+        return right_edge
+
+    def _get_bottom(self, char: str) -> int:
+        bottom = self._bottoms.get(char)
+        if bottom is None:
+            bottom = self._bottoms[char] = int(self.font.getbbox(char)[3])
+        return bottom
+
+    def get_length(self, text: str) -> float:
+        """Returns the advance of the text, like `FreeTypeFont.getlength`."""
+        length = sum(self._get_advance(char) for char in text)
+        length += sum(self._get_kerning(pair) for pair in zip(text, text[1:]))
+        return length
+
+    def get_right(self, text: str) -> int:
+        """
+        Returns the right edge of the text when rendered in a single line,
+        like `FreeTypeFont.getbbox(text)[2]`.
+        """
+        if not text:
+            return 0
+        position = self.get_length(text[:-1])
+        if len(text) > 1:
+            position += self._get_kerning((text[-2], text[-1]))
+        pixels = floor(position)
+        fraction = round((position - pixels) * 64)
+        return pixels + self._get_right_edge(text[-1], fraction)
+
+    def get_bottom(self, text: str) -> int:
+        """
+        Returns the bottom edge of the text when rendered in a single line,
+        like `FreeTypeFont.getbbox(text)[3]`.
+        """
+        return max((self._get_bottom(char) for char in text), default=0)
+
+    def get_multiline_size(
+        self, lines: list[str], spacing: int
+    ) -> tuple[int, int]:
+        """
+        Returns the right and bottom edges of left-aligned multiline text,
+        like `ImageDraw.multiline_textbbox((0, 0), text)[2:]`.
+
+        Args:
+            lines (list[str]): lines of the text without final newlines.
+            spacing (int): number of pixels between lines.
+
+        Returns:
+            tuple[int, int]: (right, bottom) edges
+        """
+        right = max((self.get_right(line) for line in lines), default=0)
+        bottom = max(
+            (
+                index * (self.line_height + spacing) + self.get_bottom(line)
+                for index, line in enumerate(lines)
+            ),
+            default=0,
+        )
+        return right, bottom
+
+
+@cache
+def get_font_metrics(path: str, size: int) -> FontMetrics:
+    """Returns the shared metrics of a font from the font registry."""
+    return FontMetrics(get_font(path, size))
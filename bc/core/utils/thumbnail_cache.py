@@ -0,0 +1,264 @@
+import hashlib
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import IO
+
+from django.conf import settings
+from redis import Redis
+
+from bc.core.utils.redis import make_redis_interface
+
+r = make_redis_interface("ARTIFACTS", decode_responses=False)
+
+REDIS_PREFIX = "thumbnail_cache"
+STATS_KEY = f"{REDIS_PREFIX}:stats"
+
+# Number of bytes read at once when hashing a file
+HASH_CHUNK_SIZE = 2**18
+
+
+def make_thumbnail_cache_key(
+    document: bytes | IO[bytes],
+    page_range: str,
+    max_dimension: int,
+    engine: str,
+) -> str:
+    """
+    Returns a content-addressed key for the thumbnails of a document.
+
+    Args:
+        document (bytes | IO[bytes]): document content as bytes or a file
+        handle. Files are hashed in chunks and rewound afterwards.
+        page_range (str): str representation of the list of pages requested
+        max_dimension (int): max size in pixels of the thumbnails
+        engine (str): name of the engine that renders the thumbnails, since
+        each engine gives slightly different images.
+
+    Returns:
+        str: the sha256 of the document, the pages, the dimension and the
+        engine.
+    """
+    if isinstance(document, bytes):
+        digest = hashlib.sha256(document)
+    else:
+        digest = hashlib.sha256()
+        document.seek(0)
+        while chunk := document.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        document.seek(0)
+    pages = page_range.replace(" ", "")
+    return f"{digest.hexdigest()}:{pages}:{max_dimension}:{engine}"
+
+
+def pack_thumbnails(thumbnails: list[bytes]) -> bytes:
+    """Serializes a list of thumbnails using length-prefixed chunks."""
+    return b"".join(
+        struct.pack(">I", len(thumbnail)) + thumbnail
+        for thumbnail in thumbnails
+    )
+
+
+def unpack_thumbnails(blob: bytes) -> list[bytes]:
+    """Reads a list of thumbnails serialized by `pack_thumbnails`."""
+    thumbnails = []
+    offset = 0
+    while offset < len(blob):
+        (size,) = struct.unpack_from(">I", blob, offset)
+        offset += 4
+        thumbnails.append(blob[offset : offset + size])
+        offset += size
+    return thumbnails
+
+
+class DiskCacheTier:
+    """
+    Stores the cached thumbnails in a local directory. The modification time
+    of each file is updated when it's read, and the least recently used
+    files are removed once the directory goes over its byte budget.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _get_path(self, key: str) -> Path:
+        file_name = hashlib.sha256(key.encode()).hexdigest()
+        return self.directory / f"{file_name}.bin"
+
+    def get(self, key: str) -> bytes | None:
+        if not self.max_bytes:
+            return None
+
+        path = self._get_path(key)
+        try:
+            blob = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return blob
+
+    def set(self, key: str, blob: bytes) -> None:
+        if not self.max_bytes or len(blob) > self.max_bytes:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as tmp_file:
+            tmp_file.write(blob)
+        os.replace(tmp_file.name, self._get_path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used files until the budget is met."""
+        entries = []
+        total_bytes = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".bin"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total_bytes += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+
+class RedisCacheTier:
+    """
+    Stores the cached thumbnails in Redis so every worker can reuse them.
+
+    The last access time of each entry is kept in a sorted set and its size
+    in a hash. The total size is kept in a counter, so the entries with the
+    lowest score can be evicted once the tier goes over its byte budget.
+    """
+
+    def __init__(self, redis: Redis, max_bytes: int) -> None:
+        self.r = redis
+        self.max_bytes = max_bytes
+        self.lru_key = f"{REDIS_PREFIX}:lru"
+        self.sizes_key = f"{REDIS_PREFIX}:sizes"
+        self.bytes_key = f"{REDIS_PREFIX}:bytes"
+
+    def _get_entry_key(self, key: str) -> str:
+        return f"{REDIS_PREFIX}:entry:{key}"
+
+    def get(self, key: str) -> bytes | None:
+        if not self.max_bytes:
+            return None
+
+        with self.r.pipeline() as pipe:
+            pipe.get(self._get_entry_key(key))
+            pipe.zadd(self.lru_key, {key: time.time()}, xx=True)
+            blob, _ = pipe.execute()
+        return blob
+
+    def set(self, key: str, blob: bytes) -> None:
+        if not self.max_bytes or len(blob) > self.max_bytes:
+            return
+
+        with self.r.pipeline() as pipe:
+            pipe.set(self._get_entry_key(key), blob)
+            pipe.hsetnx(self.sizes_key, key, len(blob))
+            pipe.zadd(self.lru_key, {key: time.time()})
+            _, is_new_entry, _ = pipe.execute()
+
+        # Entries are content-addressed, so overwriting an existing one
+        # doesn't change the size of the tier.
+        if is_new_entry:
+            total_bytes = self.r.incrby(self.bytes_key, len(blob))
+            self.evict(total_bytes)
+
+    def evict(self, total_bytes: int) -> None:
+        """Removes the least recently used entries until the budget is met."""
+        while total_bytes > self.max_bytes:
+            # ZPOPMIN is atomic, so only one worker evicts each entry.
+            popped = self.r.zpopmin(self.lru_key)
+            if not popped:
+                break
+
+            key = popped[0][0].decode()
+            with self.r.pipeline() as pipe:
+                pipe.hget(self.sizes_key, key)
+                pipe.hdel(self.sizes_key, key)
+                pipe.delete(self._get_entry_key(key))
+                size, _, _ = pipe.execute()
+            total_bytes = self.r.decrby(self.bytes_key, int(size or 0))
+
+
+disk_tier = DiskCacheTier(
+    Path(settings.THUMBNAIL_CACHE_DIR), settings.THUMBNAIL_CACHE_DISK_BYTES
+)
+redis_tier = RedisCacheTier(r, settings.THUMBNAIL_CACHE_REDIS_BYTES)
+
+
+def get_cached_thumbnails(key: str) -> list[bytes] | None:
+    """
+    Looks up the thumbnails in the disk tier and then in the Redis tier.
+    Hits in the Redis tier are copied to the disk tier.
+
+    Args:
+        key (str): key returned by `make_thumbnail_cache_key`.
+
+    Returns:
+        list[bytes] | None: the cached thumbnails or None on a miss.
+    """
+    blob = disk_tier.get(key)
+    if blob is not None:
+        r.hincrby(STATS_KEY, "disk_hits")
+        return unpack_thumbnails(blob)
+
+    blob = redis_tier.get(key)
+    if blob is not None:
+        r.hincrby(STATS_KEY, "redis_hits")
+        disk_tier.set(key, blob)
+        return unpack_thumbnails(blob)
+
+    r.hincrby(STATS_KEY, "misses")
+    return None
+
+
+def cache_thumbnails(key: str, thumbnails: list[bytes]) -> None:
+    """
+    Stores the thumbnails in both tiers. An empty list is cached as well,
+    so documents without thumbnails aren't rendered again.
+
+    Args:
+        key (str): key returned by `make_thumbnail_cache_key`.
+        thumbnails (list[bytes]): list of thumbnails
+    """
+    blob = pack_thumbnails(thumbnails)
+    disk_tier.set(key, blob)
+    redis_tier.set(key, blob)
+
+
+def get_thumbnail_cache_stats() -> dict[str, int | float]:
+    """
+    Returns the number of hits per tier, the number of misses and the hit
+    rate of the cache across every worker.
+    """
+    fields = ("disk_hits", "redis_hits", "misses")
+    stats = {
+        field: int(value or 0)
+        for field, value in zip(fields, r.hmget(STATS_KEY, fields))
+    }
+    lookups = sum(stats.values())
+    hits = stats["disk_hits"] + stats["redis_hits"]
+    return {
+        **stats,
+        "redis_bytes": int(r.get(redis_tier.bytes_key) or 0),
+        "hit_rate": hits / lookups if lookups else 0.0,
+    }
+
+
+def reset_thumbnail_cache_stats() -> None:
+    r.delete(STATS_KEY)
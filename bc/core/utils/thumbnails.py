@@ -0,0 +1,166 @@
+import json
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import IO
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from bc.core.utils.microservices import (
+    THUMBNAIL_MAX_DIMENSION,
+    request_thumbnails_from_doctor,
+)
+from bc.core.utils.thumbnail_cache import (
+    cache_thumbnails,
+    get_cached_thumbnails,
+    make_thumbnail_cache_key,
+)
+
+
+class ThumbnailEngine(ABC):
+    """
+    Renders a PNG thumbnail for some pages of a PDF document. The longest
+    side of each thumbnail is THUMBNAIL_MAX_DIMENSION pixels.
+    """
+
+    name: str
+
+    @abstractmethod
+    def render(self, document: IO[bytes], page_range: str) -> list[bytes]:
+        """
+        Args:
+            document (IO[bytes]): file handle of the document
+            page_range (str): str representation of the list of pages
+            requested, like "[1,2,3]". Pages the document doesn't have are
+            skipped.
+
+        Returns:
+            list[bytes]: list of thumbnails in the order of the pages.
+        """
+
+
+class DoctorThumbnailEngine(ThumbnailEngine):
+    """Uploads the document to the Doctor microservice."""
+
+    name = "doctor"
+
+    def render(self, document: IO[bytes], page_range: str) -> list[bytes]:
+        return request_thumbnails_from_doctor(document, page_range)
+
+
+class PdfiumThumbnailEngine(ThumbnailEngine):
+    """
+    Rasterizes the pages requested in the worker process using PDFium, so
+    the document doesn't go through the network and no zip file is built.
+
+    This engine needs the optional pypdfium2 package. PDFium isn't thread
+    safe, so this engine must not be used from several threads at once.
+    """
+
+    name = "pdfium"
+
+    def render(self, document: IO[bytes], page_range: str) -> list[bytes]:
+        try:
+            import pypdfium2 as pdfium
+        except ImportError as e:
+            raise ImproperlyConfigured(
+                "The pdfium thumbnail engine needs the pypdfium2 package."
+            ) from e
+
+        document.seek(0)
+        pdf = pdfium.PdfDocument(document)
+        try:
+            thumbnails = []
+            for page_number in json.loads(page_range):
+                if not 1 <= page_number <= len(pdf):
+                    continue
+                page = pdf[page_number - 1]
+                width, height = page.get_size()
+                bitmap = page.render(
+                    scale=THUMBNAIL_MAX_DIMENSION / max(width, height)
+                )
+                buffer = BytesIO()
+                bitmap.to_pil().save(buffer, format="PNG")
+                thumbnails.append(buffer.getvalue())
+                page.close()
+        finally:
+            pdf.close()
+            document.seek(0)
+        return thumbnails
+
+
+THUMBNAIL_ENGINES: dict[str, type[ThumbnailEngine]] = {
+    DoctorThumbnailEngine.name: DoctorThumbnailEngine,
+    PdfiumThumbnailEngine.name: PdfiumThumbnailEngine,
+}
+
+
+def get_thumbnail_engine(name: str | None = None) -> ThumbnailEngine:
+    """
+    Returns the thumbnail engine with the given name.
+
+    Args:
+        name (str | None): name of the engine. Defaults to the value of the
+        THUMBNAIL_ENGINE setting.
+
+    Returns:
+        ThumbnailEngine: an instance of the engine.
+    """
+    name = name or settings.THUMBNAIL_ENGINE
+    try:
+        return THUMBNAIL_ENGINES[name]()
+    except KeyError as e:
+        raise ImproperlyConfigured(
+            f"Unknown thumbnail engine {name!r}. Valid engines are: "
+            f"{', '.join(THUMBNAIL_ENGINES)}."
+        ) from e
+
+
+def clip_page_range(page_range: str, page_count: int | None) -> str:
+    """
+    Removes the pages that come after the last page of the document from a
+    page range.
+
+    Args:
+        page_range (str): str representation of a list of pages
+        page_count (int | None): number of pages of the document. The range
+        is returned as is when the number is unknown.
+
+    Returns:
+        str: the clipped page range, like "[1,2]".
+    """
+    if not page_count:
+        return page_range
+    pages = [page for page in json.loads(page_range) if page <= page_count]
+    return json.dumps(pages, separators=(",", ":"))
+
+
+def get_thumbnails_from_range(
+    document: IO[bytes], page_range: str, page_count: int | None = None
+) -> list[bytes]:
+    """
+    Returns a list that contains a thumbnail(as a binary object) for each
+    page requested.
+
+    Args:
+        document (IO[bytes]): file handle of the document
+        page_range (str): str representation of the list of pages requested
+        page_count (int | None): number of pages of the document, used to
+        skip the pages it doesn't have.
+
+    Returns:
+        list[bytes]: list of thumbnails
+    """
+    page_range = clip_page_range(page_range, page_count)
+    if page_range == "[]":
+        return []
+
+    engine = get_thumbnail_engine()
+    key = make_thumbnail_cache_key(
+        document, page_range, THUMBNAIL_MAX_DIMENSION, engine.name
+    )
+    thumbnails = get_cached_thumbnails(key)
+    if thumbnails is None:
+        thumbnails = engine.render(document, page_range)
+        cache_thumbnails(key, thumbnails)
+    return thumbnails
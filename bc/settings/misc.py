@@ -5,4 +5,94 @@ env = environ.FileAwareEnv()
 # Numbers of seconds the app should wait to process a webhook
 WEBHOOK_DELAY_TIME = env.int("WEBHOOK_DELAY_TIME", default=120)
 
+# Numbers of seconds a webhook idempotency key is remembered after the
+# webhook is handled
+WEBHOOK_IDEMPOTENCY_TTL = env.int(
+    "WEBHOOK_IDEMPOTENCY_TTL", default=60 * 60 * 24 * 2
+)
+
+# Numbers of seconds a webhook that's being handled keeps its idempotency key
+# reserved. This frees the key if the process handling the webhook dies.
+WEBHOOK_IN_PROGRESS_TTL = env.int("WEBHOOK_IN_PROGRESS_TTL", default=60)
+
+# Numbers of seconds a webhook event is considered a duplicate of an earlier
+# event for the same document
+DUPLICATED_DOCUMENT_WINDOW = env.int(
+    "DUPLICATED_DOCUMENT_WINDOW", default=60 * 60 * 24
+)
+
+# Numbers of seconds the RECAP document of a webhook event is kept in the
+# in-flight registry so duplicates don't have to look it up again
+DOCUMENT_IN_FLIGHT_TTL = env.int("DOCUMENT_IN_FLIGHT_TTL", default=60 * 10)
+
+# Numbers of seconds a docket from CL is used without asking CL if it
+# changed, and numbers of seconds it's kept to revalidate it using a
+# conditional request
+DOCKET_CACHE_TTL = env.int("DOCKET_CACHE_TTL", default=60 * 5)
+DOCKET_CACHE_MAX_AGE = env.int("DOCKET_CACHE_MAX_AGE", default=60 * 60 * 24)
+
+# Numbers of seconds each process uses its compiled filter rules before
+# checking if they changed
+FILTER_RULES_CHECK_INTERVAL = env.int("FILTER_RULES_CHECK_INTERVAL", default=5)
+
 DOCTOR_HOST = env("DOCTOR_HOST", default="http://bc2-doctor:5050")
+
+# Engine used to render the thumbnails of documents. "doctor" uploads them
+# to Doctor and "pdfium" renders them in the worker with pypdfium2.
+THUMBNAIL_ENGINE = env("THUMBNAIL_ENGINE", default="doctor")
+
+# Documents from CL bigger than PDF_MAX_DOWNLOAD_SIZE bytes are not
+# downloaded. While downloading, documents up to PDF_SPOOL_MEMORY_SIZE bytes
+# are kept in memory and bigger ones are written to a temporary file.
+PDF_MAX_DOWNLOAD_SIZE = env.int(
+    "PDF_MAX_DOWNLOAD_SIZE", default=100 * 1024 * 1024
+)
+PDF_SPOOL_MEMORY_SIZE = env.int(
+    "PDF_SPOOL_MEMORY_SIZE", default=10 * 1024 * 1024
+)
+
+# Thumbnail cache. The disk tier is local to each worker and the Redis tier
+# is shared by all of them. Set a budget to 0 to disable its tier.
+THUMBNAIL_CACHE_DIR = env(
+    "THUMBNAIL_CACHE_DIR", default="/tmp/bigcases2/thumbnails"
+)
+THUMBNAIL_CACHE_DISK_BYTES = env.int(
+    "THUMBNAIL_CACHE_DISK_BYTES", default=512 * 1024 * 1024
+)
+THUMBNAIL_CACHE_REDIS_BYTES = env.int(
+    "THUMBNAIL_CACHE_REDIS_BYTES", default=256 * 1024 * 1024
+)
+
+# Numbers of seconds the rendered artifacts of a webhook event (thumbnails,
+# images) are kept so every channel can reuse them
+ARTIFACTS_TTL = env.int("ARTIFACTS_TTL", default=60 * 60 * 2)
+
+# Whether rendered text images are shared by the workers through the
+# artifacts store, besides the in-memory cache of each process
+TEXT_IMAGE_ARTIFACTS = env.bool("TEXT_IMAGE_ARTIFACTS", default=False)
+
+# Posting rate limits. Each value is the number of posts allowed in a period
+# and the length of the period in seconds. Service limits are shared by all
+# the channels of the same service, while channel limits apply to each
+# account. Both use token buckets, so bursts up to the number of posts are
+# allowed.
+SERVICE_POST_RATE_LIMITS = {
+    "twitter": (300, 60 * 60 * 3),
+    "mastodon": (120, 60),
+    "bluesky": (120, 60),
+    "threads": (60, 60),
+}
+CHANNEL_POST_RATE_LIMITS = {
+    "twitter": (100, 60 * 60 * 24),
+    "mastodon": (300, 60 * 60 * 3),
+    "bluesky": (1_500, 60 * 60),
+    "threads": (250, 60 * 60 * 24),
+}
+
+# Numbers of seconds a post is delayed after a rate-limited response that
+# doesn't say when the limit resets
+RATE_LIMIT_DEFAULT_WAIT = env.int("RATE_LIMIT_DEFAULT_WAIT", default=60 * 15)
+
+# Maximum number of images a connector uploads at the same time while
+# creating a post
+MEDIA_UPLOAD_MAX_WORKERS = env.int("MEDIA_UPLOAD_MAX_WORKERS", default=4)
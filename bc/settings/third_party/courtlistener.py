@@ -5,3 +5,12 @@ env = environ.FileAwareEnv()
 COURTLISTENER_API_KEY = env("COURTLISTENER_API_KEY", default="")
 
 COURTLISTENER_ALLOW_IPS = ["34.210.230.218", "54.189.59.91"]
+
+# HTTP client. Requests are retried with an exponential backoff when the
+# connection fails or the server answers with a 429 or a 5xx error.
+COURTLISTENER_TIMEOUT = env.float("COURTLISTENER_TIMEOUT", default=5)
+COURTLISTENER_MAX_RETRIES = env.int("COURTLISTENER_MAX_RETRIES", default=3)
+COURTLISTENER_BACKOFF_FACTOR = env.float(
+    "COURTLISTENER_BACKOFF_FACTOR", default=0.5
+)
+COURTLISTENER_POOL_SIZE = env.int("COURTLISTENER_POOL_SIZE", default=10)
@@ -9,4 +9,5 @@ REDIS_PORT = env("REDIS_PORT", default=6379)
 REDIS_DATABASES = {
     "QUEUE": 0,
     "CACHE": 1,
+    "ARTIFACTS": 2,
 }
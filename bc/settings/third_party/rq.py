@@ -8,11 +8,41 @@ env = environ.FileAwareEnv()
 
 RQ_SHOW_ADMIN_LINK = True
 
+# Jobs are split in queues by workload, so a backlog of slow jobs doesn't
+# delay the rest:
+#   - ingest: cheap database jobs that handle incoming webhooks.
+#   - courtlistener: jobs that call the CourtListener API.
+#   - posts: jobs that create posts in the channels.
+#   - render: jobs that download documents and render thumbnails.
+#   - default: everything else, like CloudFront invalidations and emails.
+RQ_QUEUE_NAMES = ["ingest", "courtlistener", "posts", "render", "default"]
+
 RQ_QUEUES = {
-    "default": {
+    queue_name: {
         "URL": f"{REDIS_HOST}:{REDIS_PORT}",
         "DB": REDIS_DATABASES["QUEUE"],
-    },
+    }
+    for queue_name in RQ_QUEUE_NAMES
+}
+
+# Maps the dotted path of each task to its queue. Keys are shell-style
+# patterns, the first match wins and tasks without a route use the default
+# queue. See bc.core.utils.queues.QueueRouter.
+RQ_ROUTES = {
+    "bc.subscription.tasks.process_filing_webhook_event": "ingest",
+    "bc.subscription.tasks.check_webhook_before_posting": "courtlistener",
+    "bc.subscription.tasks.check_initial_complaint_before_posting": (
+        "courtlistener"
+    ),
+    "bc.subscription.tasks.process_fetch_webhook_event": "courtlistener",
+    "bc.subscription.tasks.prefetch_documents_for_webhook_events": (
+        "courtlistener"
+    ),
+    "bc.subscription.utils.courtlistener.*": "courtlistener",
+    "bc.subscription.tasks.render_thumbnails_for_webhook_event": "render",
+    "bc.subscription.tasks.make_post_for_webhook_event": "posts",
+    "bc.channel.tasks.post_status": "posts",
+    "bc.channel.utils.connectors.*.add_status": "posts",
 }
 
 RQ_MAX_NUMBER_OF_RETRIES: int = env.int("RQ_MAX_NUMBER_OF_RETRIES", default=3)
@@ -2,10 +2,10 @@ from decimal import Decimal
 
 from django.conf import settings
 from django.db.models import QuerySet
-from django_rq.queues import get_queue
 from rq import Retry
 
 from bc.channel.models import Group
+from bc.core.utils.queues import QueueRouter
 from bc.sponsorship.selectors import get_sponsorships_for_subscription
 from bc.sponsorship.utils import (
     get_email_threshold_index,
@@ -15,7 +15,7 @@ from bc.subscription.types import Document
 
 from .models import Transaction
 
-queue = get_queue("default")
+queue = QueueRouter()
 
 
 def log_purchase(
@@ -3,15 +3,15 @@ from django.db import transaction as db_transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.urls import reverse
-from django_rq.queues import get_queue
 from rq import Retry
 
 from bc.core.utils.cloudfront import create_cache_invalidation
+from bc.core.utils.queues import QueueRouter
 
 from .models import Sponsorship, Transaction
 from .utils import update_sponsorships_current_amount
 
-queue = get_queue("default")
+queue = QueueRouter()
 
 
 @receiver(post_save, sender=Sponsorship)
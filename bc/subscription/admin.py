@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import FilingWebhookEvent, Subscription
+from .models import FilingWebhookEvent, FilterRule, Subscription
 
 
 class ChannelInline(admin.StackedInline):
@@ -21,5 +21,12 @@ class SubscriptionAdmin(admin.ModelAdmin):
     list_filter = ("channel__group",)
 
 
+class FilterRuleAdmin(admin.ModelAdmin):
+    list_display = ("pattern", "is_regex", "action", "group", "enabled")
+    list_filter = ("action", "enabled", "group")
+    search_fields = ("pattern", "note")
+
+
 admin.site.register(Subscription, SubscriptionAdmin)
 admin.site.register(FilingWebhookEvent)
+admin.site.register(FilterRule, FilterRuleAdmin)
@@ -1,60 +1,49 @@
-from datetime import timedelta
 from http import HTTPStatus
 
 from django.conf import settings
-from django.core.cache import cache
-from django_rq.queues import get_queue
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rq import Retry
 
-from bc.subscription.exceptions import (
-    IdempotencyKeyMissing,
-    WebhookNotSupported,
-)
+from bc.core.utils.queues import QueueRouter
+from bc.subscription.exceptions import WebhookNotSupported
 
 from .api_permissions import AllowListPermission
 from .models import FilingWebhookEvent, Subscription
 from .tasks import (
-    check_webhook_before_posting,
+    enqueue_jobs_for_webhook_events,
     enqueue_posts_for_docket_alert,
     enqueue_posts_for_new_case,
     process_fetch_webhook_event,
-    process_filing_webhook_event,
 )
+from .utils.idempotency import idempotent_webhook
 
-queue = get_queue("default")
+queue = QueueRouter()
 
 
 @api_view(["POST"])
 @permission_classes([AllowListPermission])
+@idempotent_webhook
 def handle_docket_alert_webhook(request: Request) -> Response:
     """
     Receives a docket alert webhook from CourtListener.
     """
-
-    idempotency_key = request.headers.get("Idempotency-Key")
-    if not idempotency_key:
-        raise IdempotencyKeyMissing()
-
     data = request.data
     if data["webhook"]["event_type"] != 1:
         raise WebhookNotSupported()
 
-    cache_idempotency_key = cache.get(idempotency_key)
-    if cache_idempotency_key:
-        return Response(status=HTTPStatus.OK)
-
     sorted_results = sorted(
         data["payload"]["results"], key=lambda d: d["recap_sequence_number"]
     )
+    filings: list[FilingWebhookEvent] = []
+    filings_wo_document: list[FilingWebhookEvent] = []
     for result in sorted_results:
         cl_docket_id = result["docket"]
         long_description = result["description"]
         document_number = result.get("entry_number")
         for doc in result["recap_documents"]:
-            filing = FilingWebhookEvent.objects.create(
+            filing = FilingWebhookEvent(
                 docket_id=cl_docket_id,
                 pacer_doc_id=doc["pacer_doc_id"],
                 doc_id=doc["id"],
@@ -63,65 +52,45 @@ def handle_docket_alert_webhook(request: Request) -> Response:
                 short_description=doc["description"],
                 long_description=long_description,
             )
-
-            if doc["filepath_local"]:
-                webhook_event_handler = queue.enqueue(
-                    process_filing_webhook_event,
-                    filing.pk,
-                )
-            else:
-                webhook_event_handler = queue.enqueue_in(
-                    timedelta(seconds=settings.WEBHOOK_DELAY_TIME),
-                    process_filing_webhook_event,
-                    filing.pk,
-                )
-
-            queue.enqueue(
-                check_webhook_before_posting,
-                filing.pk,
-                depends_on=webhook_event_handler,
-                retry=Retry(
-                    max=settings.RQ_MAX_NUMBER_OF_RETRIES,
-                    interval=settings.RQ_POST_RETRY_INTERVALS,
-                ),
-            )
-
-    # Save the idempotency key for two days after the webhook is handled
-    cache.set(idempotency_key, True, 60 * 60 * 24 * 2)
+            filings.append(filing)
+            if not doc["filepath_local"]:
+                filings_wo_document.append(filing)
+
+    # Store every document of the payload using a single query. Postgres
+    # returns the primary keys, so the events can be enqueued right away.
+    FilingWebhookEvent.objects.bulk_create(filings)
+    enqueue_jobs_for_webhook_events(
+        filings, {filing.pk for filing in filings_wo_document}
+    )
 
     return Response(request.data, status=HTTPStatus.CREATED)
 
 
 @api_view(["POST"])
 @permission_classes([AllowListPermission])
+@idempotent_webhook
 def handle_recap_fetch_webhook(request: Request) -> Response:
     """
     Receives a recap fetch webhook from CourtListener.
     """
-    idempotency_key = request.headers.get("Idempotency-Key")
-    if not idempotency_key:
-        raise IdempotencyKeyMissing()
 
     data = request.data
     if data["webhook"]["event_type"] != 3:
         raise WebhookNotSupported()
 
-    cache_idempotency_key = cache.get(idempotency_key)
-    if cache_idempotency_key:
-        return Response(status=HTTPStatus.OK)
-
-    webhook_record: FilingWebhookEvent | Subscription
-    try:
-        # checks whether the document of the fetch webhook belongs to a filing webhook
-        webhook_record = FilingWebhookEvent.objects.get(
+    webhook_record: FilingWebhookEvent | Subscription | None
+    # checks whether the document of the fetch webhook belongs to a filing
+    # webhook. We can receive the same docket entry in different webhooks,
+    # so the purchase belongs to the earliest one and the others are
+    # marked as duplicates.
+    webhook_record = (
+        FilingWebhookEvent.objects.filter(
             doc_id=data["payload"]["recap_document"]
         )
-    except FilingWebhookEvent.MultipleObjectsReturned:
-        # we have received the same docket entry in different webhooks
-        webhook_record = FilingWebhookEvent.objects.filter(  # type: ignore
-            doc_id=data["payload"]["recap_document"]
-        ).first()
-    except FilingWebhookEvent.DoesNotExist:
+        .order_by("pk")
+        .first()
+    )
+    if not webhook_record:
         # if we dont have a filing webhook related to the document, It must be an initial complaint
         webhook_record = Subscription.objects.get(
             cl_docket_id=data["payload"]["docket"]
@@ -152,7 +121,4 @@ def handle_recap_fetch_webhook(request: Request) -> Response:
             ),
         )
 
-    # Save the idempotency key for two days after the webhook is handled
-    cache.set(idempotency_key, True, 60 * 60 * 24 * 2)
-
     return Response(request.data, status=HTTPStatus.OK)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from bc.subscription.utils.cl_client import (
+    get_courtlistener_stats,
+    reset_courtlistener_stats,
+)
+
+
+class Command(BaseCommand):
+    help = "Shows the latency and the errors of the CourtListener endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after showing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_courtlistener_stats()
+        if not stats:
+            self.stdout.write("No requests recorded.")
+
+        for endpoint, values in stats.items():
+            self.stdout.write(
+                f"{endpoint}: {values['calls']} calls, "
+                f"{values['errors']} errors, "
+                f"{values['avg_latency'] * 1000:.0f} ms on average"
+            )
+
+        if options["reset"]:
+            reset_courtlistener_stats()
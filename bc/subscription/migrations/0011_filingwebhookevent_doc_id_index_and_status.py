@@ -0,0 +1,36 @@
+# Generated by Django 5.1.9 on 2026-10-18 17:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("subscription", "0010_alter_filingwebhookevent_pacer_doc_id"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="filingwebhookevent",
+            name="status",
+            field=models.SmallIntegerField(
+                choices=[
+                    (1, "Awaiting processing in queue."),
+                    (2, "Item processed successfully."),
+                    (3, "Item encountered an error while processing."),
+                    (4, "Item is currently being processed."),
+                    (5, "Item ignored"),
+                    (6, "Awaiting for document purchase"),
+                    (7, "Document purchase failed"),
+                    (8, "Document handled by an earlier item"),
+                ],
+                default=1,
+                help_text="The current status of this upload. Possible values are: (1): Awaiting processing in queue., (2): Item processed successfully., (3): Item encountered an error while processing., (4): Item is currently being processed., (5): Item ignored, (6): Awaiting for document purchase, (7): Document purchase failed, (8): Document handled by an earlier item",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="filingwebhookevent",
+            index=models.Index(
+                fields=["doc_id"], name="subscriptio_doc_id_fcf299_idx"
+            ),
+        ),
+    ]
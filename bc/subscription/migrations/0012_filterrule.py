@@ -0,0 +1,132 @@
+# Generated by Django 5.1.9 on 2026-10-18 18:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The junk filters that were hard-coded in bc.core.utils.status.templates
+IGNORE_PATTERNS = (
+    (r"pro\shac\svice", "pro hac vice"),
+    (r"notice\sof\sappearance", "notice of appearance"),
+    (r"certificate\sof\sdisclosure", "certificate of disclosure"),
+    (r"corporate\sdisclosure", "corporate disclosure"),
+    (r"add\sand\sterminate\sattorneys", "add and terminate attorneys"),
+    (r"none", "entries with bad data"),
+)
+DO_NOT_PURCHASE_PATTERNS = (
+    (r"withdraw\sas\sattorney", "withdraw as attorney"),
+    (r"summons\s.*\sexecuted", "summons executed"),
+    (r"none", "entries with bad data"),
+)
+
+
+def add_default_rules(apps, schema_editor):
+    FilterRule = apps.get_model("subscription", "FilterRule")
+    FilterRule.objects.bulk_create(
+        [
+            FilterRule(
+                action=action, pattern=pattern, is_regex=True, note=note
+            )
+            for action, patterns in (
+                (1, IGNORE_PATTERNS),
+                (2, DO_NOT_PURCHASE_PATTERNS),
+            )
+            for pattern, note in patterns
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("channel", "0009_alter_channel_service"),
+        ("subscription", "0011_filingwebhookevent_doc_id_index_and_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FilterRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "date_created",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        help_text="The moment when the item was created.",
+                    ),
+                ),
+                (
+                    "date_modified",
+                    models.DateTimeField(
+                        auto_now=True,
+                        db_index=True,
+                        help_text="The last moment when the item was modified. A value in year 1750 indicates the value is unknown",
+                    ),
+                ),
+                (
+                    "action",
+                    models.SmallIntegerField(
+                        choices=[
+                            (1, "Don't post the entry"),
+                            (2, "Don't purchase the document"),
+                        ],
+                        default=1,
+                        help_text="What happens to the entries whose description matches.",
+                    ),
+                ),
+                (
+                    "pattern",
+                    models.CharField(
+                        help_text="Phrase or regular expression searched in the description of docket entries. Matches ignore case.",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "is_regex",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Designates whether the pattern is a regular expression. Otherwise, the pattern is matched as a phrase and its spaces match any whitespace.",
+                    ),
+                ),
+                (
+                    "enabled",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Designates whether this rule is used.",
+                    ),
+                ),
+                (
+                    "note",
+                    models.CharField(
+                        blank=True,
+                        help_text="Why the rule was added.",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "group",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="The group whose posts are filtered by this rule. Rules without a group apply to every group.",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="filter_rules",
+                        to="channel.group",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.RunPython(
+            add_default_rules, reverse_code=migrations.RunPython.noop
+        ),
+    ]
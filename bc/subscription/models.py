@@ -1,6 +1,9 @@
+import re
+
+from django.core.exceptions import ValidationError
 from django.db import models
 
-from bc.channel.models import Channel
+from bc.channel.models import Channel, Group
 from bc.core.models import AbstractDateTimeModel
 
 from .utils.courtlistener import map_cl_to_pacer_id
@@ -127,6 +130,7 @@ class FilingWebhookEvent(AbstractDateTimeModel):
     IGNORED = 5
     WAITING_FOR_DOCUMENT = 6
     PURCHASE_FAILED = 7
+    DUPLICATED = 8
     CHOICES = (
         (SCHEDULED, "Awaiting processing in queue."),
         (SUCCESSFUL, "Item processed successfully."),
@@ -135,6 +139,7 @@ class FilingWebhookEvent(AbstractDateTimeModel):
         (IGNORED, "Item ignored"),
         (WAITING_FOR_DOCUMENT, "Awaiting for document purchase"),
         (PURCHASE_FAILED, "Document purchase failed"),
+        (DUPLICATED, "Document handled by an earlier item"),
     )
 
     docket_id = models.IntegerField(
@@ -196,6 +201,7 @@ class FilingWebhookEvent(AbstractDateTimeModel):
         indexes = [
             models.Index(fields=["docket_id"]),
             models.Index(fields=["pacer_doc_id"]),
+            models.Index(fields=["doc_id"]),
         ]
 
     @property
@@ -249,3 +255,73 @@ class FilingWebhookEvent(AbstractDateTimeModel):
             description += f" from {self.subscription.docket_name}"
 
         return description
+
+
+class FilterRule(AbstractDateTimeModel):
+    IGNORE = 1
+    DO_NOT_PURCHASE = 2
+    ACTIONS = (
+        (IGNORE, "Don't post the entry"),
+        (DO_NOT_PURCHASE, "Don't purchase the document"),
+    )
+
+    group = models.ForeignKey(
+        Group,
+        help_text=(
+            "The group whose posts are filtered by this rule. Rules without a "
+            "group apply to every group."
+        ),
+        related_name="filter_rules",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+    )
+    action = models.SmallIntegerField(
+        help_text="What happens to the entries whose description matches.",
+        default=IGNORE,
+        choices=ACTIONS,
+    )
+    pattern = models.CharField(
+        help_text=(
+            "Phrase or regular expression searched in the description of "
+            "docket entries. Matches ignore case."
+        ),
+        max_length=255,
+    )
+    is_regex = models.BooleanField(
+        help_text=(
+            "Designates whether the pattern is a regular expression. "
+            "Otherwise, the pattern is matched as a phrase and its spaces "
+            "match any whitespace."
+        ),
+        default=False,
+    )
+    enabled = models.BooleanField(
+        help_text="Designates whether this rule is used.",
+        default=True,
+    )
+    note = models.CharField(
+        help_text="Why the rule was added.",
+        max_length=255,
+        blank=True,
+    )
+
+    @property
+    def regex(self) -> str:
+        if self.is_regex:
+            return self.pattern
+        return r"\s+".join(re.escape(word) for word in self.pattern.split())
+
+    def clean(self) -> None:
+        if self.action == self.DO_NOT_PURCHASE and self.group_id:
+            raise ValidationError(
+                {"group": "Purchase rules apply to every group."}
+            )
+        try:
+            re.compile(self.regex)
+        except re.error as e:
+            raise ValidationError({"pattern": f"Invalid pattern: {e}"})
+
+    def __str__(self) -> str:
+        scope = self.group.name if self.group else "All groups"
+        return f"{self.pk}: {self.pattern} ({scope})"
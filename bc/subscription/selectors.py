@@ -1,6 +1,9 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db.models import QuerySet
 
-from .models import Subscription
+from .models import FilingWebhookEvent, Subscription
 
 
 def get_subscription_by_case_id(case_id) -> Subscription | None:
@@ -19,3 +22,68 @@ def get_subscriptions_for_big_cases() -> QuerySet[Subscription]:
         .distinct("cl_docket_id")
         .all()
     )
+
+
+def get_original_webhook_event(
+    webhook_event: FilingWebhookEvent,
+) -> FilingWebhookEvent | None:
+    """
+    Returns the earliest webhook event that received the same document in
+    the last DUPLICATED_DOCUMENT_WINDOW seconds.
+
+    Events are compared by primary key, so every copy of a document agrees
+    on which one is the original even when they're checked at the same time.
+
+    Args:
+        webhook_event (FilingWebhookEvent): The event to check.
+
+    Returns:
+        FilingWebhookEvent | None: The original event or None if the given
+        event is the first one for its document.
+    """
+    if not webhook_event.doc_id:
+        return None
+
+    window_start = webhook_event.date_created - timedelta(
+        seconds=settings.DUPLICATED_DOCUMENT_WINDOW
+    )
+    return (
+        FilingWebhookEvent.objects.filter(
+            doc_id=webhook_event.doc_id,
+            subscription=webhook_event.subscription,
+            pk__lt=webhook_event.pk,
+            date_created__gte=window_start,
+        )
+        .exclude(
+            status__in=[
+                FilingWebhookEvent.FAILED,
+                FilingWebhookEvent.IGNORED,
+                FilingWebhookEvent.DUPLICATED,
+            ]
+        )
+        .order_by("pk")
+        .first()
+    )
+
+
+def get_duplicated_webhook_events(
+    webhook_event: FilingWebhookEvent,
+) -> QuerySet[FilingWebhookEvent]:
+    """
+    Returns the events that were marked as duplicates of the given one.
+
+    Args:
+        webhook_event (FilingWebhookEvent): The original event.
+
+    Returns:
+        QuerySet[FilingWebhookEvent]: The later events for the same document.
+    """
+    if not webhook_event.doc_id:
+        return FilingWebhookEvent.objects.none()
+
+    return FilingWebhookEvent.objects.filter(
+        doc_id=webhook_event.doc_id,
+        subscription=webhook_event.subscription,
+        pk__gt=webhook_event.pk,
+        status=FilingWebhookEvent.DUPLICATED,
+    ).order_by("pk")
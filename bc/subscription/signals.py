@@ -1,14 +1,17 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django_rq.queues import get_queue
 from rq import Retry
 
 from bc.core.utils.cloudfront import create_cache_invalidation
+from bc.core.utils.queues import QueueRouter
 
-from .models import Subscription
+from .models import FilterRule, Subscription
+from .utils.docket_cache import invalidate_cached_docket
+from .utils.filters import invalidate_filter_rules
 
-queue = get_queue("default")
+queue = QueueRouter()
 
 
 @receiver(post_save, sender=Subscription)
@@ -27,3 +30,35 @@ def subscription_handler(sender, instance=None, created=False, **kwargs):
                 interval=settings.RQ_RETRY_INTERVAL,
             ),
         )
+
+
+@receiver(pre_save, sender=Subscription)
+def docket_change_handler(sender, instance=None, **kwargs):
+    # Linking a case to another docket should show the latest data from
+    # CourtListener the next time either docket is looked up.
+    if instance._state.adding:
+        return
+
+    previous_docket_id = (
+        Subscription.objects.filter(pk=instance.pk)
+        .values_list("cl_docket_id", flat=True)
+        .first()
+    )
+    if previous_docket_id != instance.cl_docket_id:
+        invalidate_cached_docket(previous_docket_id)
+        invalidate_cached_docket(instance.cl_docket_id)
+
+
+@receiver(post_delete, sender=Subscription)
+def docket_cache_handler(sender, instance=None, **kwargs):
+    # Removing a case should show the latest data from CourtListener if
+    # the docket is followed again.
+    invalidate_cached_docket(instance.cl_docket_id)
+
+
+@receiver(post_save, sender=FilterRule)
+@receiver(post_delete, sender=FilterRule)
+def filter_rule_handler(sender, instance=None, **kwargs):
+    # Every process compiles the rules again the next time it checks an
+    # entry, once the change is committed.
+    transaction.on_commit(invalidate_filter_rules)
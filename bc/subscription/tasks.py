@@ -1,25 +1,47 @@
-from datetime import date, datetime
+import logging
+from datetime import UTC, date, datetime, timedelta
 from typing import Literal
+from uuid import uuid4
 
 from django.conf import settings
 from django.db import transaction
-from django_rq.queues import Queue, get_queue
+from django_rq.queues import Queue
 from rq import Retry
+from rq.job import Callback, Dependency, Job, JobStatus
 
 from bc.channel.models import Channel, Post
 from bc.channel.selectors import (
     get_channels_per_subscription,
     get_sponsored_groups_per_subscription,
 )
+from bc.channel.tasks import post_status
+from bc.channel.utils.rate_limits import (
+    add_status_with_rate_limits,
+    delay_on_rate_limit,
+)
+from bc.core.utils.artifacts import (
+    get_artifacts,
+    put_artifacts,
+    store_artifacts,
+)
 from bc.core.utils.images import add_sponsored_text_to_thumbnails
-from bc.core.utils.microservices import get_thumbnails_from_range
+from bc.core.utils.media import (
+    MEDIA_SPECS,
+    MediaVariants,
+    make_media_variant,
+)
+from bc.core.utils.queues import QueueRouter
 from bc.core.utils.status.selectors import (
     get_new_case_template,
     get_template_for_channel,
 )
-from bc.core.utils.status.templates import DO_NOT_PAY, DO_NOT_POST
+from bc.core.utils.thumbnails import get_thumbnails_from_range
 from bc.sponsorship.selectors import check_active_sponsorships
 from bc.sponsorship.services import log_purchase
+from bc.subscription.selectors import (
+    get_duplicated_webhook_events,
+    get_original_webhook_event,
+)
 from bc.subscription.utils.courtlistener import (
     DocketDict,
     DocumentDict,
@@ -27,14 +49,32 @@ from bc.subscription.utils.courtlistener import (
     is_bankruptcy,
     lookup_docket_by_cl_id,
     lookup_document_by_doc_id,
+    lookup_documents_by_doc_ids,
     lookup_initial_complaint,
     purchase_pdf_by_doc_id,
 )
+from bc.subscription.utils.exceptions import DocumentTooLarge
+from bc.subscription.utils.filters import (
+    get_filtered_group_ids,
+    is_junk_entry,
+    should_purchase_document,
+)
+from bc.subscription.utils.in_flight import (
+    get_document_in_flight,
+    register_document_in_flight,
+    register_documents_in_flight,
+)
 
 from .models import FilingWebhookEvent, Subscription
 from .types import Document
 
-queue: Queue = get_queue("default")
+logger = logging.getLogger(__name__)
+
+queue = QueueRouter()
+
+# Pages rendered for the posts of a docket alert. Templates that include an
+# image only use the first three.
+THUMBNAIL_PAGE_RANGE = "[1,2,3,4]"
 
 
 def enqueue_posts_for_new_case(
@@ -57,8 +97,17 @@ def enqueue_posts_for_new_case(
 
     files = None
     if document_url:
-        document = download_pdf_from_cl(document_url)
-        files = get_thumbnails_from_range(document, "[1,2,3,4]")
+        page_count = (
+            initial_document["page_count"] if initial_document else None
+        )
+        try:
+            with download_pdf_from_cl(document_url) as document:
+                files = get_thumbnails_from_range(
+                    document, "[1,2,3,4]", page_count
+                )
+        except DocumentTooLarge as e:
+            # Post without thumbnails instead of failing the job
+            logger.warning(e)
 
     docket: DocketDict | None = None
     date_filed: date
@@ -94,12 +143,16 @@ def enqueue_posts_for_new_case(
         "Petition" if is_bankruptcy(subscription.cl_court_id) else "Complaint"
     )
 
+    # Each platform variant of the thumbnails is rendered once and shared
+    # by the channels of the same platform. Sponsored thumbnails are
+    # watermarked once per sponsor message, always from the original files.
+    media = MediaVariants(files)
+    sponsored_media: dict[str, MediaVariants] = {}
+    # The jobs only carry the key of the thumbnails in the artifacts store.
+    thumbnails_keys: dict[tuple[str | None, str | None], str | None] = {}
     for channel in get_channels_per_subscription(subscription.pk):
         template = get_new_case_template(channel.service)
 
-        if channel.group:
-            template.border_color = channel.group.border_color_rgb
-
         message, _ = template.format(
             docket=subscription.name_with_summary,
             docket_link=subscription.cl_url,
@@ -110,21 +163,32 @@ def enqueue_posts_for_new_case(
             initial_complaint_link=initial_complaint_link,
         )
 
-        channel.validate_access_token()
-        api = channel.get_api_wrapper()
-
+        channel_media = media
         sponsor_message = None
         sponsorships_for_channel = channel.group.sponsorships.all()  # type: ignore
         if check_sponsor_message and sponsorships_for_channel and files:
             sponsorship = sponsorships_for_channel[0]
             sponsor_message = sponsorship.watermark_message
-            files = add_sponsored_text_to_thumbnails(files, sponsor_message)
+            if sponsor_message not in sponsored_media:
+                sponsored_media[sponsor_message] = MediaVariants(
+                    add_sponsored_text_to_thumbnails(files, sponsor_message)
+                )
+            channel_media = sponsored_media[sponsor_message]
+
+        media_key = (sponsor_message, channel.media_variant)
+        if media_key not in thumbnails_keys:
+            thumbnails = channel_media.get(channel.media_variant)
+            thumbnails_keys[media_key] = (
+                put_artifacts("thumbnails:new_case", thumbnails)
+                if thumbnails
+                else None
+            )
 
         queue.enqueue(
-            api.add_status,
+            post_status,
+            channel.pk,
             message,
-            None,
-            files,
+            thumbnails_key=thumbnails_keys[media_key],
             retry=Retry(
                 max=settings.RQ_MAX_NUMBER_OF_RETRIES,
                 interval=settings.RQ_POST_RETRY_INTERVALS,
@@ -136,6 +200,7 @@ def enqueue_posts_for_docket_alert(
     webhook_event: FilingWebhookEvent,
     document_url: str | None = None,
     check_sponsor_message: bool = False,
+    page_count: int | None = None,
 ) -> None:
     """
     Enqueue jobs to create a post in the available channels after
@@ -147,13 +212,39 @@ def enqueue_posts_for_docket_alert(
         check_sponsor_message (bool, optional): designates whether this method
             should check. the sponsorships field and compute the sponsor_message
             for each channel. Defaults to False.
+        page_count (int | None): number of pages of the document.
     """
     if not webhook_event.subscription:
         return
 
-    for channel in get_channels_per_subscription(
-        webhook_event.subscription.pk
-    ):
+    # Skip the groups whose own rules filter the entry
+    filtered_group_ids = get_filtered_group_ids(webhook_event.description)
+    channels = [
+        channel
+        for channel in get_channels_per_subscription(
+            webhook_event.subscription.pk
+        )
+        if channel.group_id not in filtered_group_ids
+    ]
+
+    # Download the document and render its thumbnails once for all the
+    # channels. The posts still run if this job fails and render the
+    # thumbnails by themselves.
+    depends_on = None
+    if document_url and channels:
+        render_job = queue.enqueue(
+            render_thumbnails_for_webhook_event,
+            webhook_event.pk,
+            document_url,
+            page_count,
+            retry=Retry(
+                max=settings.RQ_MAX_NUMBER_OF_RETRIES,
+                interval=settings.RQ_RETRY_INTERVAL,
+            ),
+        )
+        depends_on = Dependency(jobs=[render_job.id], allow_failure=True)
+
+    for channel in channels:
         sponsor_message = None
         sponsorships_for_channel = channel.group.sponsorships.all()  # type: ignore
         if check_sponsor_message and sponsorships_for_channel:
@@ -166,6 +257,8 @@ def enqueue_posts_for_docket_alert(
             webhook_event.pk,
             document_url,
             sponsor_message,
+            page_count,
+            depends_on=depends_on,
             retry=Retry(
                 max=settings.RQ_MAX_NUMBER_OF_RETRIES,
                 interval=settings.RQ_POST_RETRY_INTERVALS,
@@ -173,6 +266,258 @@ def enqueue_posts_for_docket_alert(
         )
 
 
+def get_thumbnails_key(fwe_pk: int, page_range: str) -> str:
+    return f"thumbnails:filing_webhook:{fwe_pk}:{page_range}"
+
+
+def get_thumbnails_for_webhook_event(
+    fwe_pk: int,
+    document_url: str,
+    page_count: int | None = None,
+    media_variant: str | None = None,
+) -> list[bytes]:
+    """
+    Returns the thumbnails of the document of a webhook event.
+
+    The thumbnails are read from the artifact store. They're only
+    downloaded and rendered when they're not available, and the result is
+    stored so the rest of the channels can reuse it. The variants for each
+    platform are stored the same way.
+
+    Args:
+        fwe_pk (int): The PK of the FilingWebhookEvent record.
+        document_url (str): URL path to download the document.
+        page_count (int | None): number of pages of the document.
+        media_variant (str | None): key of the platform in MEDIA_SPECS.
+        Defaults to the original thumbnails.
+
+    Returns:
+        list[bytes]: A thumbnail for each page in THUMBNAIL_PAGE_RANGE that
+        the document has.
+    """
+    if media_variant in MEDIA_SPECS:
+        variant_key = get_thumbnails_key(
+            fwe_pk, f"{THUMBNAIL_PAGE_RANGE}:{media_variant}"
+        )
+        variant = get_artifacts(variant_key)
+        if variant is None:
+            variant = make_media_variant(
+                get_thumbnails_for_webhook_event(
+                    fwe_pk, document_url, page_count
+                ),
+                media_variant,
+            )
+            store_artifacts(variant_key, variant)
+        return variant
+
+    key = get_thumbnails_key(fwe_pk, THUMBNAIL_PAGE_RANGE)
+    thumbnails = get_artifacts(key)
+    if thumbnails is None:
+        try:
+            with download_pdf_from_cl(document_url) as document:
+                thumbnails = get_thumbnails_from_range(
+                    document, THUMBNAIL_PAGE_RANGE, page_count
+                )
+        except DocumentTooLarge as e:
+            # Post without thumbnails instead of failing the job
+            logger.warning(e)
+            thumbnails = []
+        store_artifacts(key, thumbnails)
+    return thumbnails
+
+
+def render_thumbnails_for_webhook_event(
+    fwe_pk: int, document_url: str, page_count: int | None = None
+) -> int:
+    """Renders the thumbnails of a webhook event before its posts run.
+
+    :param fwe_pk: The PK of the FilingWebhookEvent record.
+    :param document_url: URL path to download the document.
+    :param page_count: The number of pages of the document.
+    :return: The number of thumbnails available for the posts.
+    """
+    return len(
+        get_thumbnails_for_webhook_event(fwe_pk, document_url, page_count)
+    )
+
+
+def prefetch_documents_for_webhook_events(doc_ids: list[int]) -> int:
+    """Looks up the RECAP documents of a webhook using batched requests.
+
+    The documents are stored in the in-flight registry, so the
+    `check_webhook_before_posting` jobs of the webhook don't have to look
+    them up one by one. Errors are only logged because each check job falls
+    back to its own lookup.
+
+    :param doc_ids: The document ids from CL.
+    :return: The number of documents found.
+    """
+    try:
+        documents = lookup_documents_by_doc_ids(doc_ids)
+    except Exception as e:
+        logger.warning(f"Could not prefetch the documents {doc_ids}:\n{e}")
+        return 0
+
+    register_documents_in_flight(documents)
+    return len(documents)
+
+
+def handle_failed_webhook_check(job: Job, connection, *exc_info) -> None:
+    """Hands the document of a failed webhook event to its duplicates.
+
+    Duplicated events are dropped because the earliest event posts about
+    the document. When the check job of that event fails for good, the
+    event is marked as failed and the check of its first duplicate runs
+    again, so that duplicate takes over the document.
+
+    :param job: The `check_webhook_before_posting` job that failed.
+    :param connection: The Redis connection of the job.
+    """
+    if job.should_retry:
+        return
+
+    fwe_pk, *_ = job.args
+    filing_webhook_event = FilingWebhookEvent.objects.get(pk=fwe_pk)
+    filing_webhook_event.status = FilingWebhookEvent.FAILED
+    filing_webhook_event.save(update_fields=["status"])
+
+    duplicate = get_duplicated_webhook_events(filing_webhook_event).first()
+    if not duplicate:
+        return
+
+    duplicate.status = FilingWebhookEvent.SUCCESSFUL
+    duplicate.save(update_fields=["status"])
+    queue.enqueue(
+        check_webhook_before_posting,
+        duplicate.pk,
+        retry=Retry(
+            max=settings.RQ_MAX_NUMBER_OF_RETRIES,
+            interval=settings.RQ_POST_RETRY_INTERVALS,
+        ),
+        on_failure=Callback(handle_failed_webhook_check),
+    )
+
+
+def enqueue_jobs_for_webhook_events(
+    webhook_events: list[FilingWebhookEvent], delayed_pks: set[int]
+) -> None:
+    """
+    Enqueue the jobs to process and check a batch of webhook events.
+
+    Each event gets a `process_filing_webhook_event` job and a
+    `check_webhook_before_posting` job that depends on it. The jobs of the
+    whole batch are written to Redis using a single pipeline, so the number
+    of round trips doesn't grow with the number of documents in the
+    webhook.
+
+    When the webhook has more than one document available in RECAP, a
+    `prefetch_documents_for_webhook_events` job looks them up in a single
+    request and the check jobs of those events wait for it.
+
+    Args:
+        webhook_events (list[FilingWebhookEvent]): Saved webhook events.
+        delayed_pks (set[int]): PKs of the events whose document is not
+            available yet. Their processing is delayed by WEBHOOK_DELAY_TIME.
+    """
+    retry = Retry(
+        max=settings.RQ_MAX_NUMBER_OF_RETRIES,
+        interval=settings.RQ_POST_RETRY_INTERVALS,
+    )
+    on_check_failure = Callback(handle_failed_webhook_check)
+
+    doc_ids = sorted(
+        {
+            webhook_event.doc_id
+            for webhook_event in webhook_events
+            if webhook_event.doc_id and webhook_event.pk not in delayed_pks
+        }
+    )
+    prefetch_documents = len(doc_ids) > 1
+
+    if not queue.is_async:
+        # Synchronous queues run each job as soon as it's enqueued, so the
+        # dependents must be registered using the regular API.
+        if prefetch_documents:
+            queue.enqueue(prefetch_documents_for_webhook_events, doc_ids)
+        for webhook_event in webhook_events:
+            if webhook_event.pk in delayed_pks:
+                webhook_event_handler = queue.enqueue_in(
+                    timedelta(seconds=settings.WEBHOOK_DELAY_TIME),
+                    process_filing_webhook_event,
+                    webhook_event.pk,
+                )
+            else:
+                webhook_event_handler = queue.enqueue(
+                    process_filing_webhook_event, webhook_event.pk
+                )
+            queue.enqueue(
+                check_webhook_before_posting,
+                webhook_event.pk,
+                depends_on=webhook_event_handler,
+                retry=retry,
+                on_failure=on_check_failure,
+            )
+        return
+
+    scheduled_time = datetime.now(UTC) + timedelta(
+        seconds=settings.WEBHOOK_DELAY_TIME
+    )
+    with queue.connection.pipeline() as pipe:
+        process_jobs = []
+        prefetch_job_id = None
+        if prefetch_documents:
+            prefetch_job_id = uuid4().hex
+            process_jobs.append(
+                Queue.prepare_data(
+                    prefetch_documents_for_webhook_events,
+                    args=(doc_ids,),
+                    job_id=prefetch_job_id,
+                )
+            )
+
+        for webhook_event in webhook_events:
+            process_job_id = uuid4().hex
+            if webhook_event.pk in delayed_pks:
+                queue.schedule_job(
+                    queue.create_job(
+                        process_filing_webhook_event,
+                        args=(webhook_event.pk,),
+                        job_id=process_job_id,
+                    ),
+                    scheduled_time,
+                    pipeline=pipe,
+                )
+            else:
+                process_jobs.append(
+                    Queue.prepare_data(
+                        process_filing_webhook_event,
+                        args=(webhook_event.pk,),
+                        job_id=process_job_id,
+                    )
+                )
+
+            # The process job was just created, so the check job is always
+            # deferred until it finishes. Failed dependencies don't block the
+            # check: it falls back to its own lookup when the prefetch fails
+            # and skips events that were not processed.
+            dependencies = [process_job_id]
+            if prefetch_job_id and webhook_event.doc_id in doc_ids:
+                dependencies.append(prefetch_job_id)
+            check_job = queue.create_job(
+                check_webhook_before_posting,
+                args=(webhook_event.pk,),
+                depends_on=Dependency(jobs=dependencies, allow_failure=True),
+                retry=retry,
+                on_failure=on_check_failure,
+                status=JobStatus.DEFERRED,
+            )
+            check_job.register_dependency(pipeline=pipe)
+            check_job.save(pipeline=pipe)
+
+        queue.enqueue_many(process_jobs, pipeline=pipe)
+        pipe.execute()
+
+
 @transaction.atomic
 def process_filing_webhook_event(fwe_pk: int) -> FilingWebhookEvent:
     """Process an event from a CL webhook.
@@ -231,14 +576,25 @@ def check_webhook_before_posting(fwe_pk: int):
         )
 
     # check the description to filter junk docket entries
-    if DO_NOT_POST.search(filing_webhook_event.description):
+    if is_junk_entry(filing_webhook_event.description):
         filing_webhook_event.status = FilingWebhookEvent.IGNORED
         filing_webhook_event.save(update_fields=["status"])
         return filing_webhook_event
 
+    # check if the same document was received in an earlier webhook. The
+    # first event takes care of the lookup, purchase and posts, and hands
+    # them to this event if its check fails for good.
+    if get_original_webhook_event(filing_webhook_event):
+        filing_webhook_event.status = FilingWebhookEvent.DUPLICATED
+        filing_webhook_event.save(update_fields=["status"])
+        return filing_webhook_event
+
     # check if the document is available or there's a sponsorship to purchase it.
     document_url = None
-    cl_document = lookup_document_by_doc_id(filing_webhook_event.doc_id)
+    cl_document = get_document_in_flight(filing_webhook_event.doc_id)
+    if not cl_document:
+        cl_document = lookup_document_by_doc_id(filing_webhook_event.doc_id)
+        register_document_in_flight(filing_webhook_event.doc_id, cl_document)
     if cl_document["filepath_local"]:
         document_url = cl_document["filepath_local"]
     else:
@@ -248,7 +604,7 @@ def check_webhook_before_posting(fwe_pk: int):
         if (
             sponsorship
             and filing_webhook_event.pacer_doc_id
-            and not DO_NOT_PAY.search(filing_webhook_event.description)
+            and should_purchase_document(filing_webhook_event.description)
         ):
             purchase_pdf_by_doc_id(
                 filing_webhook_event.doc_id, filing_webhook_event.docket_id
@@ -260,7 +616,11 @@ def check_webhook_before_posting(fwe_pk: int):
             return filing_webhook_event
 
     # Got the document or no sponsorship. Tweet and toot.
-    enqueue_posts_for_docket_alert(filing_webhook_event, document_url)
+    enqueue_posts_for_docket_alert(
+        filing_webhook_event,
+        document_url,
+        page_count=cl_document["page_count"],
+    )
 
     return filing_webhook_event
 
@@ -332,7 +692,10 @@ def process_fetch_webhook_event(
         filing_webhook_event.save(update_fields=["status"])
 
         subscription = filing_webhook_event.subscription
+        # the document was just purchased, so the registry is refreshed with
+        # the version that includes the path to download the file.
         cl_document = lookup_document_by_doc_id(filing_webhook_event.doc_id)
+        register_document_in_flight(filing_webhook_event.doc_id, cl_document)
     else:
         subscription = Subscription.objects.get(pk=record_pk)
         cl_document = lookup_initial_complaint(subscription.cl_docket_id)
@@ -364,19 +727,23 @@ def process_fetch_webhook_event(
         log_purchase(sponsor_groups, subscription.pk, document)
 
     if record_type == "filing_webhook":
-        enqueue_posts_for_docket_alert(filing_webhook_event, pdf_path, True)
+        enqueue_posts_for_docket_alert(
+            filing_webhook_event, pdf_path, True, cl_document["page_count"]
+        )
     else:
         enqueue_posts_for_new_case(subscription, pdf_path, True, cl_document)
 
     return record_pk
 
 
+@delay_on_rate_limit
 @transaction.atomic
 def make_post_for_webhook_event(
     channel_pk: int,
     fwe_pk: int,
     document_url: str | None,
     sponsor_text: str | None = None,
+    page_count: int | None = None,
 ) -> Post:
     """Post a new status in the given channel using the data of the given webhook
     event and subscription.
@@ -386,6 +753,7 @@ def make_post_for_webhook_event(
         fwe_pk (int): The PK of the FilingWebhookEvent record.
         document_url (str | None): URL path to download the document.
         sponsor_text (str | None): sponsor message to include in the thumbnails.
+        page_count (int | None): number of pages of the document.
 
     Returns:
         Post: A post object with the data of the new status that was created
@@ -403,10 +771,10 @@ def make_post_for_webhook_event(
         channel.service, filing_webhook_event.document_number
     )
 
-    if channel.group:
-        template.border_color = channel.group.border_color_rgb
-
     message, image = template.format(
+        border_color=(
+            channel.group.border_color_rgb if channel.group else None
+        ),
         docket=filing_webhook_event.subscription.name_with_summary,
         description=filing_webhook_event.description,
         doc_num=filing_webhook_event.document_number_with_attachment,
@@ -417,17 +785,26 @@ def make_post_for_webhook_event(
 
     files = None
     if document_url:
-        document = download_pdf_from_cl(document_url)
-        thumbnail_range = "[1,2,3]" if image else "[1,2,3,4]"
-        files = get_thumbnails_from_range(document, thumbnail_range)
+        # Sponsored thumbnails are converted after adding the watermark
+        files = get_thumbnails_for_webhook_event(
+            fwe_pk,
+            document_url,
+            page_count,
+            None if sponsor_text else channel.media_variant,
+        )
+        if image:
+            files = files[:3]
 
     if sponsor_text and files:
         files = add_sponsored_text_to_thumbnails(files, sponsor_text)
+        files = make_media_variant(files, channel.media_variant)
 
     channel.validate_access_token()
 
     api = channel.get_api_wrapper()
-    api_post_id = api.add_status(message, image, files)
+    api_post_id = add_status_with_rate_limits(
+        channel, api, message, image, files
+    )
 
     return Post.objects.create(
         filing_webhook_event=filing_webhook_event,
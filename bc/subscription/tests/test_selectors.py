@@ -1,9 +1,14 @@
 from django.test import TestCase
 
 from bc.channel.tests.factories import ChannelFactory, GroupFactory
-from bc.subscription.selectors import get_subscriptions_for_big_cases
+from bc.subscription.models import FilingWebhookEvent
+from bc.subscription.selectors import (
+    get_duplicated_webhook_events,
+    get_original_webhook_event,
+    get_subscriptions_for_big_cases,
+)
 
-from .factories import SubscriptionFactory
+from .factories import FilingWebhookEventFactory, SubscriptionFactory
 
 
 class GetSubscriptionsForBigCasesTests(TestCase):
@@ -18,3 +23,80 @@ class GetSubscriptionsForBigCasesTests(TestCase):
     def test_can_list_big_cases_subscriptions(self):
         big_cases_subscriptions = get_subscriptions_for_big_cases()
         self.assertEqual(big_cases_subscriptions.count(), 2)
+
+
+class GetOriginalWebhookEventTests(TestCase):
+    subscription = None
+    original = None
+    duplicate = None
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.subscription = SubscriptionFactory()
+        cls.original = FilingWebhookEventFactory(
+            doc_id=1234, subscription=cls.subscription
+        )
+        cls.duplicate = FilingWebhookEventFactory(
+            doc_id=1234, subscription=cls.subscription
+        )
+
+    def test_can_find_earlier_event_for_document(self):
+        self.assertEqual(
+            get_original_webhook_event(self.duplicate), self.original
+        )
+        self.assertIsNone(get_original_webhook_event(self.original))
+
+    def test_skips_events_that_were_not_handled(self):
+        ignored = FilingWebhookEventFactory(
+            doc_id=5678,
+            subscription=self.subscription,
+            status=FilingWebhookEvent.IGNORED,
+        )
+        webhook_event = FilingWebhookEventFactory(
+            doc_id=ignored.doc_id, subscription=self.subscription
+        )
+
+        self.assertIsNone(get_original_webhook_event(webhook_event))
+
+    def test_skips_events_without_document(self):
+        webhook_event = FilingWebhookEventFactory(
+            subscription=self.subscription
+        )
+
+        self.assertIsNone(get_original_webhook_event(webhook_event))
+
+
+class GetDuplicatedWebhookEventsTests(TestCase):
+    subscription = None
+    original = None
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.subscription = SubscriptionFactory()
+        cls.original = FilingWebhookEventFactory(
+            doc_id=1234, subscription=cls.subscription
+        )
+
+    def test_can_list_duplicates_of_event(self):
+        duplicates = [
+            FilingWebhookEventFactory(
+                doc_id=self.original.doc_id,
+                subscription=self.subscription,
+                status=FilingWebhookEvent.DUPLICATED,
+            )
+            for _ in range(2)
+        ]
+        FilingWebhookEventFactory(
+            doc_id=self.original.doc_id, subscription=self.subscription
+        )
+
+        self.assertEqual(
+            list(get_duplicated_webhook_events(self.original)), duplicates
+        )
+
+    def test_skips_events_without_document(self):
+        webhook_event = FilingWebhookEventFactory(
+            subscription=self.subscription
+        )
+
+        self.assertFalse(get_duplicated_webhook_events(webhook_event).exists())
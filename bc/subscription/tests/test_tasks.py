@@ -1,25 +1,34 @@
+from io import BytesIO
 from unittest.mock import MagicMock, call, patch
 
-from django.test import TestCase
+import requests
+from django.test import SimpleTestCase, TestCase
 
 from bc.channel.models import Channel, Post
+from bc.channel.tasks import post_status
 from bc.channel.tests.factories import ChannelFactory, GroupFactory
+from bc.core.utils.artifacts import put_artifacts
 from bc.core.utils.status.templates import (
     BLUESKY_FOLLOW_A_NEW_CASE,
     MASTODON_FOLLOW_A_NEW_CASE,
 )
 from bc.core.utils.tests.base import faker
 from bc.sponsorship.tests.factories import SponsorshipFactory
-from bc.subscription.models import FilingWebhookEvent
+from bc.subscription.models import FilingWebhookEvent, FilterRule
 from bc.subscription.tasks import (
     check_initial_complaint_before_posting,
     check_webhook_before_posting,
+    enqueue_jobs_for_webhook_events,
     enqueue_posts_for_docket_alert,
     enqueue_posts_for_new_case,
+    handle_failed_webhook_check,
     make_post_for_webhook_event,
+    prefetch_documents_for_webhook_events,
     process_fetch_webhook_event,
     process_filing_webhook_event,
+    render_thumbnails_for_webhook_event,
 )
+from bc.subscription.utils.filters import invalidate_filter_rules
 
 from .factories import FilingWebhookEventFactory, SubscriptionFactory
 
@@ -52,6 +61,175 @@ class ProcessFilingWebhookEventTest(TestCase):
         self.assertEqual(webhook.status, FilingWebhookEvent.FAILED)
 
 
+@patch("bc.subscription.tasks.queue")
+class EnqueueJobsForWebhookEventsTest(TestCase):
+    webhook_events = None
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.webhook_events = [FilingWebhookEventFactory() for _ in range(3)]
+
+    def test_can_enqueue_batch_using_one_pipeline(self, mock_queue):
+        mock_queue.is_async = True
+        delayed_event = self.webhook_events[1]
+
+        enqueue_jobs_for_webhook_events(
+            self.webhook_events, {delayed_event.pk}
+        )
+
+        pipe = mock_queue.connection.pipeline().__enter__()
+        pipe.execute.assert_called_once()
+
+        # Only the events with a document are enqueued right away
+        mock_queue.enqueue_many.assert_called_once()
+        process_jobs, *_ = mock_queue.enqueue_many.call_args.args
+        self.assertEqual(
+            [job_data.args for job_data in process_jobs],
+            [(self.webhook_events[0].pk,), (self.webhook_events[2].pk,)],
+        )
+        mock_queue.schedule_job.assert_called_once()
+
+        # Each event gets a check job deferred until its process job finishes
+        check_job = mock_queue.create_job()
+        self.assertEqual(check_job.register_dependency.call_count, 3)
+        mock_queue.enqueue.assert_not_called()
+        mock_queue.enqueue_in.assert_not_called()
+
+    def test_prefetches_documents_of_batch(self, mock_queue):
+        mock_queue.is_async = True
+        webhook_events = [
+            FilingWebhookEventFactory(doc_id=doc_id)
+            for doc_id in (300, 100, 200)
+        ]
+        delayed_event = webhook_events[2]
+
+        enqueue_jobs_for_webhook_events(webhook_events, {delayed_event.pk})
+
+        process_jobs, *_ = mock_queue.enqueue_many.call_args.args
+        prefetch_job, *_ = process_jobs
+        self.assertEqual(
+            prefetch_job.func, prefetch_documents_for_webhook_events
+        )
+        self.assertEqual(prefetch_job.args, ([100, 300],))
+
+        # The check jobs of the prefetched documents wait for the prefetch,
+        # but still run when it fails
+        dependencies = [
+            create_call.kwargs["depends_on"]
+            for create_call in mock_queue.create_job.call_args_list
+            if create_call.args[0] == check_webhook_before_posting
+        ]
+        self.assertEqual(
+            [len(dependency.dependencies) for dependency in dependencies],
+            [2, 2, 1],
+        )
+        self.assertEqual(dependencies[0].dependencies[1], prefetch_job.job_id)
+        self.assertTrue(
+            all(dependency.allow_failure for dependency in dependencies)
+        )
+
+    def test_can_enqueue_batch_in_sync_queue(self, mock_queue):
+        mock_queue.is_async = False
+
+        enqueue_jobs_for_webhook_events(
+            self.webhook_events, {self.webhook_events[0].pk}
+        )
+
+        self.assertEqual(mock_queue.enqueue.call_count, 5)
+        mock_queue.enqueue_in.assert_called_once()
+        mock_queue.enqueue_many.assert_not_called()
+
+        # The duplicates of an event are requeued if its check fails
+        check_call = mock_queue.enqueue.call_args
+        self.assertEqual(check_call.args[0], check_webhook_before_posting)
+        self.assertEqual(
+            check_call.kwargs["on_failure"].func, handle_failed_webhook_check
+        )
+
+
+@patch("bc.subscription.tasks.queue")
+class HandleFailedWebhookCheckTest(TestCase):
+    subscription = None
+    webhook_event = None
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.subscription = SubscriptionFactory()
+        cls.webhook_event = FilingWebhookEventFactory(
+            doc_id=1234,
+            subscription=cls.subscription,
+            status=FilingWebhookEvent.SUCCESSFUL,
+        )
+
+    def make_job(self, should_retry=False):
+        return MagicMock(
+            args=(self.webhook_event.pk,), should_retry=should_retry
+        )
+
+    def test_requeues_first_duplicate(self, mock_queue):
+        duplicates = [
+            FilingWebhookEventFactory(
+                doc_id=self.webhook_event.doc_id,
+                subscription=self.subscription,
+                status=FilingWebhookEvent.DUPLICATED,
+            )
+            for _ in range(2)
+        ]
+
+        handle_failed_webhook_check(self.make_job(), None)
+
+        self.webhook_event.refresh_from_db()
+        self.assertEqual(self.webhook_event.status, FilingWebhookEvent.FAILED)
+        for duplicate in duplicates:
+            duplicate.refresh_from_db()
+        self.assertEqual(duplicates[0].status, FilingWebhookEvent.SUCCESSFUL)
+        self.assertEqual(duplicates[1].status, FilingWebhookEvent.DUPLICATED)
+        mock_queue.enqueue.assert_called_once()
+        self.assertEqual(
+            mock_queue.enqueue.call_args.args,
+            (check_webhook_before_posting, duplicates[0].pk),
+        )
+
+    def test_waits_for_the_last_retry(self, mock_queue):
+        handle_failed_webhook_check(self.make_job(should_retry=True), None)
+
+        self.webhook_event.refresh_from_db()
+        self.assertEqual(
+            self.webhook_event.status, FilingWebhookEvent.SUCCESSFUL
+        )
+        mock_queue.enqueue.assert_not_called()
+
+
+@patch("bc.subscription.tasks.register_documents_in_flight")
+@patch("bc.subscription.tasks.lookup_documents_by_doc_ids")
+class PrefetchDocumentsForWebhookEventsTest(SimpleTestCase):
+    def test_registers_documents_in_flight(self, mock_lookup, mock_register):
+        documents = {
+            doc_id: {
+                "id": doc_id,
+                "absolute_url": faker.url(),
+                "filepath_local": "",
+                "page_count": 1,
+                "pacer_doc_id": "051023651280",
+            }
+            for doc_id in (1, 2)
+        }
+        mock_lookup.return_value = documents
+
+        found = prefetch_documents_for_webhook_events([1, 2, 3])
+
+        self.assertEqual(found, 2)
+        mock_lookup.assert_called_once_with([1, 2, 3])
+        mock_register.assert_called_once_with(documents)
+
+    def test_ignores_lookup_errors(self, mock_lookup, mock_register):
+        for error in (requests.HTTPError(), ValueError(), KeyError("id")):
+            mock_lookup.side_effect = error
+
+            self.assertEqual(prefetch_documents_for_webhook_events([1, 2]), 0)
+        mock_register.assert_not_called()
+
+
 @patch("bc.subscription.tasks.lookup_document_by_doc_id")
 class CheckWebhookBeforePostingTest(TestCase):
     webhook_event = None
@@ -67,6 +245,13 @@ class CheckWebhookBeforePostingTest(TestCase):
             status=FilingWebhookEvent.SUCCESSFUL,
         )
 
+    def setUp(self) -> None:
+        registry_patcher = patch(
+            "bc.subscription.tasks.get_document_in_flight", return_value=None
+        )
+        self.mock_registry = registry_patcher.start()
+        self.addCleanup(registry_patcher.stop)
+
     def test_raise_exception_for_webhook_no_subscription(self, mock_lookup):
         webhook_event_no_subscription = FilingWebhookEventFactory(
             subscription=None, status=FilingWebhookEvent.SUCCESSFUL
@@ -92,24 +277,29 @@ class CheckWebhookBeforePostingTest(TestCase):
         self, mock_enqueue, mock_lookup
     ):
         filepath = "recap/gov.uscourts.mied.365816/gov.uscourts.mied.365816.1.0_12.pdf"
-        mock_lookup.return_value = {"filepath_local": filepath}
+        mock_lookup.return_value = {
+            "filepath_local": filepath,
+            "page_count": 2,
+        }
 
         check_webhook_before_posting(self.webhook_event.id)
         mock_lookup.assert_called_with(self.webhook_event.doc_id)
-        mock_enqueue.assert_called_with(self.webhook_event, filepath)
+        mock_enqueue.assert_called_with(
+            self.webhook_event, filepath, page_count=2
+        )
 
     @patch("bc.subscription.tasks.enqueue_posts_for_docket_alert")
     @patch("bc.subscription.tasks.download_pdf_from_cl")
     def test_can_create_post_for_webhook_no_document(
         self, mock_download, mock_enqueue, mock_lookup
     ):
-        mock_lookup.return_value = {"filepath_local": ""}
+        mock_lookup.return_value = {"filepath_local": "", "page_count": 0}
 
         check_webhook_before_posting(self.webhook_event.id)
 
         mock_lookup.assert_called_with(self.webhook_event.doc_id)
         mock_download.assert_not_called()
-        mock_enqueue.assert_called_with(self.webhook_event, None)
+        mock_enqueue.assert_called_with(self.webhook_event, None, page_count=0)
 
     @patch("bc.subscription.tasks.purchase_pdf_by_doc_id")
     @patch("bc.subscription.tasks.download_pdf_from_cl")
@@ -134,6 +324,39 @@ class CheckWebhookBeforePostingTest(TestCase):
         )
         mock_download.assert_not_called()
 
+    @patch("bc.subscription.tasks.enqueue_posts_for_docket_alert")
+    def test_ignores_duplicated_document(self, mock_enqueue, mock_lookup):
+        duplicated_event = FilingWebhookEventFactory(
+            docket_id=self.webhook_event.docket_id,
+            doc_id=self.webhook_event.doc_id,
+            subscription=self.subscription,
+            status=FilingWebhookEvent.SUCCESSFUL,
+        )
+
+        check_webhook_before_posting(duplicated_event.id)
+        webhook = FilingWebhookEvent.objects.get(id=duplicated_event.id)
+
+        self.assertEqual(webhook.status, FilingWebhookEvent.DUPLICATED)
+        self.mock_registry.assert_not_called()
+        mock_lookup.assert_not_called()
+        mock_enqueue.assert_not_called()
+
+    @patch("bc.subscription.tasks.enqueue_posts_for_docket_alert")
+    def test_reuses_document_in_flight(self, mock_enqueue, mock_lookup):
+        filepath = "recap/gov.uscourts.mied.365816/gov.uscourts.mied.365816.1.0_12.pdf"
+        self.mock_registry.return_value = {
+            "filepath_local": filepath,
+            "page_count": 2,
+        }
+
+        check_webhook_before_posting(self.webhook_event.id)
+
+        self.mock_registry.assert_called_with(self.webhook_event.doc_id)
+        mock_lookup.assert_not_called()
+        mock_enqueue.assert_called_with(
+            self.webhook_event, filepath, page_count=2
+        )
+
 
 class ProcessFetchWebhookEventTest(TestCase):
     webhook_event = None
@@ -171,7 +394,7 @@ class ProcessFetchWebhookEventTest(TestCase):
 
         self.assertEqual(webhook.status, FilingWebhookEvent.SUCCESSFUL)
         mock_lookup.assert_called_with(self.webhook_event.doc_id)
-        mock_enqueue.assert_called_with(self.webhook_event, filepath, True)
+        mock_enqueue.assert_called_with(self.webhook_event, filepath, True, 1)
 
 
 @patch("bc.subscription.tasks.add_sponsored_text_to_thumbnails")
@@ -205,10 +428,22 @@ class MakePostForWebhookEventTest(TestCase):
         self.status_id = str(
             faker.pyint(min_value=100_000_000, max_value=900_000_000)
         )
+        get_patcher = patch(
+            "bc.subscription.tasks.get_artifacts", return_value=None
+        )
+        store_patcher = patch("bc.subscription.tasks.store_artifacts")
+        self.mock_get_artifacts = get_patcher.start()
+        self.mock_store_artifacts = store_patcher.start()
+        self.addCleanup(get_patcher.stop)
+        self.addCleanup(store_patcher.stop)
+        token_patcher = patch("bc.channel.utils.rate_limits.take_post_token")
+        token_patcher.start()
+        self.addCleanup(token_patcher.stop)
 
     def mock_api_wrapper(self, status_id):
         wrapper = MagicMock()
         wrapper.add_status.return_value = status_id
+        wrapper.rate_limit_reset_time = None
 
         return wrapper
 
@@ -257,26 +492,31 @@ class MakePostForWebhookEventTest(TestCase):
         # This test case verifies that `make_post_for_webhook_event` can handle
         # document URLs as input, in contrast to the previous test that used
         # URLs.
-        mock_download.return_value = self.bin_object
+        document = BytesIO(self.bin_object)
+        mock_download.return_value = document
+        mock_thumbnails.return_value = [self.bin_object for _ in range(4)]
         make_post_for_webhook_event(
             self.channel.pk, self.webhook_event.pk, self.fake_document_path
         )
 
         mock_download.assert_called_once_with(self.fake_document_path)
-        mock_thumbnails.assert_called_with(self.bin_object, "[1,2,3]")
+        mock_thumbnails.assert_called_with(document, "[1,2,3,4]", None)
+        _, _, files = mock_api.return_value.add_status.call_args.args
+        self.assertEqual(len(files), 3)
         mock_add_sponsor_text.assert_not_called()
 
     def test_get_four_thumbnails_from_document(
         self, mock_download, mock_api, mock_thumbnails, mock_add_sponsor_text
     ):
         mock_api.return_value = self.mock_api_wrapper(self.status_id)
-        mock_download.return_value = self.bin_object
+        document = BytesIO(self.bin_object)
+        mock_download.return_value = document
 
         make_post_for_webhook_event(
             self.channel.pk, self.webhook_event.pk, self.fake_document_path
         )
         mock_download.assert_called_once_with(self.fake_document_path)
-        mock_thumbnails.assert_called_with(self.bin_object, "[1,2,3,4]")
+        mock_thumbnails.assert_called_with(document, "[1,2,3,4]", None)
         mock_add_sponsor_text.assert_not_called()
 
     def test_add_sponsor_text_to_thumbails(
@@ -285,7 +525,8 @@ class MakePostForWebhookEventTest(TestCase):
         sponsor_text = "This document contributed by Free Law Project"
         mock_api.return_value = self.mock_api_wrapper(self.status_id)
         mock_thumbnails.return_value = [self.bin_object for _ in range(4)]
-        mock_download.return_value = self.bin_object
+        document = BytesIO(self.bin_object)
+        mock_download.return_value = document
 
         make_post_for_webhook_event(
             self.channel.pk,
@@ -295,11 +536,86 @@ class MakePostForWebhookEventTest(TestCase):
         )
 
         mock_download.assert_called_once_with(self.fake_document_path)
-        mock_thumbnails.assert_called_with(self.bin_object, "[1,2,3,4]")
+        mock_thumbnails.assert_called_with(document, "[1,2,3,4]", None)
         mock_add_sponsor_text.assert_called_with(
             mock_thumbnails(), sponsor_text
         )
 
+    def test_reuses_stored_thumbnails(
+        self, mock_download, mock_api, mock_thumbnails, mock_add_sponsor_text
+    ):
+        mock_api.return_value = self.mock_api_wrapper(self.status_id)
+        stored_thumbnails = [self.bin_object for _ in range(4)]
+        self.mock_get_artifacts.return_value = stored_thumbnails
+
+        make_post_for_webhook_event(
+            self.channel.pk, self.webhook_event.pk, self.fake_document_path
+        )
+
+        mock_download.assert_not_called()
+        mock_thumbnails.assert_not_called()
+        self.mock_store_artifacts.assert_not_called()
+        mock_api.return_value.add_status.assert_called_once()
+        _, _, files = mock_api.return_value.add_status.call_args.args
+        self.assertEqual(files, stored_thumbnails)
+
+    def test_reuses_stored_empty_thumbnails(
+        self, mock_download, mock_api, mock_thumbnails, mock_add_sponsor_text
+    ):
+        mock_api.return_value = self.mock_api_wrapper(self.status_id)
+        self.mock_get_artifacts.return_value = []
+
+        make_post_for_webhook_event(
+            self.channel.pk, self.webhook_event.pk, self.fake_document_path
+        )
+
+        mock_download.assert_not_called()
+        mock_thumbnails.assert_not_called()
+        _, _, files = mock_api.return_value.add_status.call_args.args
+        self.assertFalse(files)
+
+    def test_stores_empty_thumbnails(
+        self, mock_download, mock_api, mock_thumbnails, mock_add_sponsor_text
+    ):
+        mock_thumbnails.return_value = []
+
+        render_thumbnails_for_webhook_event(
+            self.webhook_event.pk, self.fake_document_path
+        )
+
+        self.mock_store_artifacts.assert_called_once_with(
+            f"thumbnails:filing_webhook:{self.webhook_event.pk}:[1,2,3,4]", []
+        )
+
+    @patch("bc.subscription.tasks.make_media_variant")
+    def test_stores_platform_variant_of_thumbnails(
+        self,
+        mock_variant,
+        mock_download,
+        mock_api,
+        mock_thumbnails,
+        mock_add_sponsor_text,
+    ):
+        mock_api.return_value = self.mock_api_wrapper(self.status_id)
+        mock_thumbnails.return_value = [self.bin_object for _ in range(4)]
+        mock_variant.return_value = [b"variant" for _ in range(4)]
+        channel = ChannelFactory(bluesky=True)
+
+        make_post_for_webhook_event(
+            channel.pk, self.webhook_event.pk, self.fake_document_path
+        )
+
+        mock_variant.assert_called_once_with(
+            mock_thumbnails.return_value, "bluesky"
+        )
+        self.mock_store_artifacts.assert_called_with(
+            f"thumbnails:filing_webhook:{self.webhook_event.pk}:"
+            "[1,2,3,4]:bluesky",
+            mock_variant.return_value,
+        )
+        _, _, files = mock_api.return_value.add_status.call_args.args
+        self.assertEqual(files, mock_variant.return_value)
+
 
 @patch("bc.subscription.tasks.lookup_initial_complaint")
 @patch("bc.subscription.tasks.lookup_docket_by_cl_id")
@@ -326,6 +642,11 @@ class EnqueuePostsForNewCaseTest(TestCase):
             status=FilingWebhookEvent.SUCCESSFUL,
         )
 
+    def setUp(self) -> None:
+        store_patcher = patch("bc.core.utils.artifacts.store_artifacts")
+        self.mock_store_artifacts = store_patcher.start()
+        self.addCleanup(store_patcher.stop)
+
     def mock_api_wrapper(self):
         return MagicMock(name="api_wrapper")
 
@@ -433,7 +754,11 @@ class EnqueuePostsForNewCaseTest(TestCase):
         enqueue_posts_for_new_case(self.subscription)
 
         mock_queue.enqueue.assert_called_once_with(
-            api_wrapper.add_status, message, None, None, retry=mock_retry()
+            post_status,
+            self.channel.pk,
+            message,
+            thumbnails_key=None,
+            retry=mock_retry(),
         )
 
     def test_can_post_new_case_w_link(
@@ -457,7 +782,11 @@ class EnqueuePostsForNewCaseTest(TestCase):
         enqueue_posts_for_new_case(self.subscription_w_link)
 
         mock_queue.enqueue.assert_called_once_with(
-            api_wrapper.add_status, message, None, None, retry=mock_retry()
+            post_status,
+            self.channel.pk,
+            message,
+            thumbnails_key=None,
+            retry=mock_retry(),
         )
 
     @patch("bc.subscription.tasks.get_thumbnails_from_range")
@@ -478,10 +807,10 @@ class EnqueuePostsForNewCaseTest(TestCase):
         mock_lookup.return_value = None
         mock_docket_by_cl_id.return_value = None
 
-        document = faker.binary(2)
+        document = BytesIO(faker.binary(2))
 
-        thumb_1 = faker.binary(4)
-        thumb_2 = faker.binary(6)
+        thumb_1 = faker.image(size=(4, 4), image_format="png")
+        thumb_2 = faker.image(size=(6, 6), image_format="png")
         mock_thumbnails.return_value = [thumb_1, thumb_2]
         mock_download_pdf.return_value = document
         message, _ = BLUESKY_FOLLOW_A_NEW_CASE.format(
@@ -500,12 +829,14 @@ class EnqueuePostsForNewCaseTest(TestCase):
         enqueue_posts_for_new_case(self.subscription_w_link, fake_path)
 
         mock_download_pdf.assert_called_once_with(fake_path)
-        mock_thumbnails.assert_called_with(document, "[1,2,3,4]")
+        mock_thumbnails.assert_called_with(document, "[1,2,3,4]", None)
         mock_queue.enqueue.assert_called_with(
-            api_wrapper.add_status,
+            post_status,
+            self.channel.pk,
             message,
-            None,
-            [thumb_1, thumb_2],
+            thumbnails_key=put_artifacts(
+                "thumbnails:new_case", [thumb_1, thumb_2]
+            ),
             retry=mock_retry(),
         )
 
@@ -535,11 +866,11 @@ class EnqueuePostsForNewCaseTest(TestCase):
         mock_docket_by_cl_id.return_value = None
 
         fake_path = faker.url()
-        document = faker.binary(2)
+        document = BytesIO(faker.binary(2))
         mock_download_pdf.return_value = document
 
-        thumb_1 = faker.binary(4)
-        thumb_2 = faker.binary(6)
+        thumb_1 = faker.image(size=(4, 4), image_format="png")
+        thumb_2 = faker.image(size=(6, 6), image_format="png")
         mock_thumbnails.return_value = [thumb_1, thumb_2]
 
         thumb_3 = faker.binary(5)
@@ -564,22 +895,26 @@ class EnqueuePostsForNewCaseTest(TestCase):
 
         expected_enqueue_calls = [
             call(
-                api_wrapper.add_status,
+                post_status,
+                self.channel.pk,
                 bluesky_message,
-                None,
-                [thumb_1, thumb_2],
+                thumbnails_key=put_artifacts(
+                    "thumbnails:new_case", [thumb_1, thumb_2]
+                ),
                 retry=mock_retry(),
             ),
             call(
-                api_wrapper.add_status,
+                post_status,
+                channel.pk,
                 masto_message,
-                None,
-                [thumb_3, thumb_4],
+                thumbnails_key=put_artifacts(
+                    "thumbnails:new_case", [thumb_3, thumb_4]
+                ),
                 retry=mock_retry(),
             ),
         ]
         mock_download_pdf.assert_called_once_with(fake_path)
-        mock_thumbnails.assert_called_once_with(document, "[1,2,3,4]")
+        mock_thumbnails.assert_called_once_with(document, "[1,2,3,4]", None)
         mock_sponsored.assert_called_with(
             [thumb_1, thumb_2], sponsorship.watermark_message
         )
@@ -587,6 +922,55 @@ class EnqueuePostsForNewCaseTest(TestCase):
             expected_enqueue_calls, any_order=True
         )
 
+    @patch("bc.subscription.tasks.add_sponsored_text_to_thumbnails")
+    @patch("bc.subscription.tasks.get_thumbnails_from_range")
+    @patch("bc.subscription.tasks.download_pdf_from_cl")
+    def test_watermarks_thumbnails_once_per_sponsor_message(
+        self,
+        mock_download_pdf,
+        mock_thumbnails,
+        mock_sponsored,
+        mock_api,
+        mock_queue,
+        mock_retry,
+        mock_docket_by_cl_id,
+        mock_lookup,
+    ):
+        sponsorship = SponsorshipFactory()
+        channel_group = GroupFactory(sponsorships=[sponsorship])
+        for _ in range(2):
+            channel = ChannelFactory(mastodon=True, group=channel_group)
+            self.subscription_w_link.channel.add(channel)
+
+        mock_api.return_value = self.mock_api_wrapper()
+        mock_lookup.return_value = None
+        mock_docket_by_cl_id.return_value = None
+        mock_download_pdf.return_value = BytesIO(faker.binary(2))
+
+        thumb_1 = faker.image(size=(4, 4), image_format="png")
+        mock_thumbnails.return_value = [thumb_1]
+        thumb_2 = faker.binary(5)
+        mock_sponsored.return_value = [thumb_2]
+
+        enqueue_posts_for_new_case(self.subscription_w_link, faker.url(), True)
+        # The sponsored thumbnails are stored once for both channels
+        self.assertEqual(self.mock_store_artifacts.call_count, 2)
+
+        mock_sponsored.assert_called_once_with(
+            [thumb_1], sponsorship.watermark_message
+        )
+        keys = [
+            c.kwargs["thumbnails_key"]
+            for c in mock_queue.enqueue.call_args_list
+        ]
+        original_key = put_artifacts("thumbnails:new_case", [thumb_1])
+        sponsored_key = put_artifacts("thumbnails:new_case", [thumb_2])
+        # The channel without sponsors keeps the original thumbnails
+        self.assertCountEqual(
+            keys, [original_key, sponsored_key, sponsored_key]
+        )
+        self.mock_store_artifacts.assert_any_call(sponsored_key, [thumb_2])
+
 
 @patch("bc.subscription.tasks.Retry")
 @patch("bc.subscription.tasks.queue")
@@ -623,5 +1007,53 @@ class EnqueuePostsForNewFilingTest(TestCase):
             self.webhook_event.pk,
             None,
             None,
+            None,
+            depends_on=None,
             retry=mock_retry(),
         )
+
+    def test_skips_groups_that_filter_the_entry(
+        self, mock_api, mock_queue, mock_retry
+    ):
+        self.addCleanup(invalidate_filter_rules)
+        group = GroupFactory()
+        self.subscription.channel.add(
+            ChannelFactory(mastodon=True, group=group)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            FilterRule.objects.create(
+                pattern=self.webhook_event.description, group=group
+            )
+
+        enqueue_posts_for_docket_alert(self.webhook_event)
+
+        mock_queue.enqueue.assert_called_once()
+        self.assertEqual(mock_queue.enqueue.call_args.args[1], self.channel.pk)
+
+    def test_renders_thumbnails_once_for_all_channels(
+        self, mock_api, mock_queue, mock_retry
+    ):
+        other_channel = ChannelFactory(mastodon=True)
+        self.subscription.channel.add(other_channel)
+        document_url = faker.url()
+        mock_queue.enqueue.return_value.id = "render-job"
+
+        enqueue_posts_for_docket_alert(self.webhook_event, document_url)
+
+        render_call, *post_calls = mock_queue.enqueue.call_args_list
+        self.assertEqual(
+            render_call,
+            call(
+                render_thumbnails_for_webhook_event,
+                self.webhook_event.pk,
+                document_url,
+                None,
+                retry=mock_retry(),
+            ),
+        )
+        self.assertEqual(len(post_calls), 2)
+        for post_call in post_calls:
+            self.assertEqual(post_call.args[0], make_post_for_webhook_event)
+            dependency = post_call.kwargs["depends_on"]
+            self.assertEqual(dependency.dependencies, ["render-job"])
+            self.assertTrue(dependency.allow_failure)
@@ -1,12 +1,56 @@
+import time
+from http import HTTPStatus
+from io import StringIO
 from unittest.mock import MagicMock, patch
 
 from django.core.exceptions import ValidationError
-from django.test import SimpleTestCase
+from django.core.management import call_command
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from rest_framework.response import Response
 
+from bc.channel.tests.factories import GroupFactory
+from bc.core.utils.tests.base import faker
+from bc.subscription.exceptions import IdempotencyKeyMissing
+from bc.subscription.models import FilterRule
+from bc.subscription.utils.cl_client import (
+    CourtListenerClient,
+    get_courtlistener_stats,
+    r,
+    record_request,
+)
 from bc.subscription.utils.courtlistener import (
+    download_pdf_from_cl,
     get_docket_id_from_query,
     is_bankruptcy,
+    lookup_docket_by_cl_id,
+    lookup_documents_by_doc_ids,
+)
+from bc.subscription.utils.docket_cache import (
+    cache_docket,
+    get_cached_docket,
+    invalidate_cached_docket,
+)
+from bc.subscription.utils.exceptions import DocumentTooLarge
+from bc.subscription.utils.filters import (
+    VERSION_KEY,
+    get_compiled_rules,
+    get_filtered_group_ids,
+    invalidate_filter_rules,
+    is_junk_entry,
+    should_purchase_document,
 )
+from bc.subscription.utils.idempotency import (
+    COMPLETED,
+    IN_PROGRESS,
+    idempotent_webhook,
+)
+
+from .factories import FilingWebhookEventFactory, SubscriptionFactory
 
 
 class SearchBarTest(SimpleTestCase):
@@ -78,6 +122,170 @@ class SearchBarTest(SimpleTestCase):
             self.assertEqual(result, test["docket_id"])
 
 
+@patch("bc.subscription.utils.courtlistener.cl_client")
+class LookupDocumentsByDocIdsTest(SimpleTestCase):
+    def make_response(self, doc_ids, next_url=None):
+        response = MagicMock()
+        response.json.return_value = {
+            "next": next_url,
+            "results": [{"id": doc_id} for doc_id in doc_ids],
+        }
+        return response
+
+    def test_follows_every_page(self, mock_client):
+        next_url = "https://www.courtlistener.com/api/rest/v4/recap-documents/?cursor=2"
+        mock_client.get.side_effect = [
+            self.make_response([1, 2], next_url),
+            self.make_response([3]),
+        ]
+
+        documents = lookup_documents_by_doc_ids([3, 1, 2, 1])
+
+        self.assertEqual(list(documents), [1, 2, 3])
+        first_call, second_call = mock_client.get.call_args_list
+        self.assertEqual(first_call.kwargs["params"]["id__in"], "1,2,3")
+        self.assertEqual(second_call.args[1], next_url)
+        self.assertIsNone(second_call.kwargs["params"])
+
+    @patch("bc.subscription.utils.courtlistener.DOCUMENTS_PER_LOOKUP", 2)
+    def test_sends_ids_in_chunks(self, mock_client):
+        mock_client.get.side_effect = [
+            self.make_response([1, 2]),
+            self.make_response([3]),
+        ]
+
+        documents = lookup_documents_by_doc_ids([1, 2, 3])
+
+        self.assertEqual(list(documents), [1, 2, 3])
+        self.assertEqual(
+            [
+                get_call.kwargs["params"]["id__in"]
+                for get_call in mock_client.get.call_args_list
+            ],
+            ["1,2", "3"],
+        )
+
+
+@patch("bc.subscription.utils.courtlistener.cl_client")
+class LookupDocketByClIdTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.cl_id = faker.random_int(100_000, 400_000)
+        self.docket = {"id": self.cl_id, "case_name": "Lorem v. Ipsum"}
+        self.addCleanup(invalidate_cached_docket, self.cl_id)
+
+    def test_reads_docket_through_cache(self, mock_client):
+        mock_client.get.return_value = MagicMock(
+            status_code=HTTPStatus.OK,
+            headers={"ETag": '"v1"'},
+            json=lambda: self.docket,
+        )
+
+        self.assertEqual(lookup_docket_by_cl_id(self.cl_id), self.docket)
+        self.assertEqual(lookup_docket_by_cl_id(self.cl_id), self.docket)
+
+        mock_client.get.assert_called_once()
+        self.assertEqual(get_cached_docket(self.cl_id)["etag"], '"v1"')
+
+    @override_settings(DOCKET_CACHE_TTL=0)
+    def test_revalidates_stale_docket(self, mock_client):
+        last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+        cache_docket(self.cl_id, self.docket, '"v1"', last_modified)
+        mock_client.get.return_value = MagicMock(
+            status_code=HTTPStatus.NOT_MODIFIED
+        )
+
+        self.assertEqual(lookup_docket_by_cl_id(self.cl_id), self.docket)
+
+        headers = mock_client.get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], last_modified)
+        mock_client.get.return_value.json.assert_not_called()
+
+    @override_settings(DOCKET_CACHE_TTL=0)
+    def test_replaces_changed_docket(self, mock_client):
+        cache_docket(self.cl_id, self.docket, '"v1"')
+        new_docket = {**self.docket, "case_name": "Lorem v. Dolor"}
+        mock_client.get.return_value = MagicMock(
+            status_code=HTTPStatus.OK,
+            headers={"ETag": '"v2"'},
+            json=lambda: new_docket,
+        )
+
+        self.assertEqual(lookup_docket_by_cl_id(self.cl_id), new_docket)
+        cached_docket = get_cached_docket(self.cl_id)
+        self.assertEqual(cached_docket["docket"], new_docket)
+        self.assertEqual(cached_docket["etag"], '"v2"')
+
+
+class DocketCacheInvalidationTest(TestCase):
+    def test_keeps_docket_when_case_is_added_or_edited(self):
+        cl_docket_id = faker.random_int(100_000, 400_000)
+        cache_docket(cl_docket_id, {"id": 1})
+        self.addCleanup(invalidate_cached_docket, cl_docket_id)
+
+        subscription = SubscriptionFactory(cl_docket_id=cl_docket_id)
+        subscription.docket_name = "Lorem v. Ipsum"
+        subscription.save()
+
+        self.assertIsNotNone(get_cached_docket(cl_docket_id))
+
+    def test_invalidates_docket_when_it_changes(self):
+        subscription = SubscriptionFactory()
+        previous_docket_id = subscription.cl_docket_id
+        cache_docket(previous_docket_id, {"id": 1})
+
+        subscription.cl_docket_id = previous_docket_id + 1
+        cache_docket(subscription.cl_docket_id, {"id": 2})
+        subscription.save()
+
+        self.assertIsNone(get_cached_docket(previous_docket_id))
+        self.assertIsNone(get_cached_docket(subscription.cl_docket_id))
+
+    def test_invalidates_docket_when_case_is_removed(self):
+        subscription = SubscriptionFactory()
+        cache_docket(subscription.cl_docket_id, {"id": 1})
+
+        subscription.delete()
+
+        self.assertIsNone(get_cached_docket(subscription.cl_docket_id))
+
+
+@override_settings(PDF_MAX_DOWNLOAD_SIZE=10, PDF_SPOOL_MEMORY_SIZE=4)
+@patch("bc.subscription.utils.courtlistener.cl_client")
+class DownloadPdfFromClTest(SimpleTestCase):
+    def make_response(self, chunks, content_length=None):
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.headers = (
+            {"Content-Length": str(content_length)} if content_length else {}
+        )
+        response.iter_content.return_value = chunks
+        return response
+
+    def test_streams_document_into_file(self, mock_client):
+        mock_client.get.return_value = self.make_response([b"%PDF", b"-1.7"])
+
+        with download_pdf_from_cl("recap/doc.pdf") as document:
+            self.assertEqual(document.read(), b"%PDF-1.7")
+
+        url = mock_client.get.call_args.args[1]
+        self.assertEqual(
+            url, "https://storage.courtlistener.com/recap/doc.pdf"
+        )
+        self.assertTrue(mock_client.get.call_args.kwargs["stream"])
+
+    def test_rejects_documents_over_the_size_limit(self, mock_client):
+        mock_client.get.return_value = self.make_response([b"%PDF-1.7"], 20)
+        with self.assertRaises(DocumentTooLarge):
+            download_pdf_from_cl("recap/doc.pdf")
+        mock_client.get.return_value.iter_content.assert_not_called()
+
+        # The size is also checked while the document is downloaded
+        mock_client.get.return_value = self.make_response([b"%PDF-1.7"] * 2)
+        with self.assertRaises(DocumentTooLarge):
+            download_pdf_from_cl("recap/doc.pdf")
+
+
 class IsBankruptcyTest(SimpleTestCase):
     def test_is_bankruptcy(self):
         self.assertTrue(is_bankruptcy("13B"))
@@ -88,3 +296,236 @@ class IsBankruptcyTest(SimpleTestCase):
 
     def test_is_bankruptcy_none(self):
         self.assertFalse(is_bankruptcy(None))  # type: ignore
+
+
+@patch("bc.subscription.utils.idempotency.r")
+class IdempotentWebhookTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.view = MagicMock(return_value=Response(status=HTTPStatus.CREATED))
+        self.request = RequestFactory().post(
+            "/webhook/", headers={"Idempotency-Key": "abc"}
+        )
+
+    def test_raises_exception_if_key_is_missing(self, mock_redis):
+        request = RequestFactory().post("/webhook/")
+
+        with self.assertRaises(IdempotencyKeyMissing):
+            idempotent_webhook(self.view)(request)
+
+        mock_redis.set.assert_not_called()
+        self.view.assert_not_called()
+
+    def test_reserves_key_and_marks_it_completed(self, mock_redis):
+        mock_redis.set.return_value = None
+
+        response = idempotent_webhook(self.view)(self.request)
+
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.view.assert_called_once()
+        self.assertEqual(mock_redis.set.call_count, 2)
+        reserve_call, complete_call = mock_redis.set.call_args_list
+        self.assertEqual(reserve_call.args[1], IN_PROGRESS)
+        self.assertTrue(reserve_call.kwargs["nx"])
+        self.assertTrue(reserve_call.kwargs["get"])
+        self.assertEqual(complete_call.args[1], COMPLETED)
+
+    def test_skips_completed_deliveries(self, mock_redis):
+        mock_redis.set.return_value = COMPLETED
+
+        response = idempotent_webhook(self.view)(self.request)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.view.assert_not_called()
+        mock_redis.set.assert_called_once()
+
+    def test_rejects_deliveries_in_progress(self, mock_redis):
+        mock_redis.set.return_value = IN_PROGRESS
+
+        response = idempotent_webhook(self.view)(self.request)
+
+        self.assertEqual(response.status_code, HTTPStatus.CONFLICT)
+        self.view.assert_not_called()
+
+    def test_releases_key_if_view_fails(self, mock_redis):
+        mock_redis.set.return_value = None
+        self.view.side_effect = ValueError()
+
+        with self.assertRaises(ValueError):
+            idempotent_webhook(self.view)(self.request)
+
+        mock_redis.delete.assert_called_once()
+        mock_redis.set.assert_called_once()
+
+
+@patch("bc.subscription.utils.cl_client.record_request")
+@patch.object(CourtListenerClient, "_make_session")
+class CourtListenerClientTest(SimpleTestCase):
+    @override_settings(COURTLISTENER_TIMEOUT=7)
+    def test_records_latency_of_each_request(
+        self, mock_make_session, mock_record
+    ):
+        mock_make_session.return_value.request.return_value = MagicMock(
+            ok=True
+        )
+        client = CourtListenerClient()
+
+        client.get("dockets", "https://www.courtlistener.com/", params={})
+
+        mock_make_session.return_value.request.assert_called_once_with(
+            "GET", "https://www.courtlistener.com/", params={}, timeout=7
+        )
+        endpoint, latency, failed = mock_record.call_args.args
+        self.assertEqual(endpoint, "dockets")
+        self.assertGreaterEqual(latency, 0)
+        self.assertFalse(failed)
+
+    def test_records_errors(self, mock_make_session, mock_record):
+        session = mock_make_session.return_value
+        session.request.return_value = MagicMock(ok=False)
+        client = CourtListenerClient()
+
+        client.post("recap-fetch", "https://www.courtlistener.com/")
+        _, _, failed = mock_record.call_args.args
+        self.assertTrue(failed)
+
+        session.request.side_effect = ConnectionError()
+        with self.assertRaises(ConnectionError):
+            client.get("storage", "https://storage.courtlistener.com/")
+        endpoint, _, failed = mock_record.call_args.args
+        self.assertEqual(endpoint, "storage")
+        self.assertTrue(failed)
+
+    def test_reuses_session_in_the_same_process(
+        self, mock_make_session, _mock_record
+    ):
+        client = CourtListenerClient()
+
+        client.get("dockets", "https://www.courtlistener.com/")
+        client.get("dockets", "https://www.courtlistener.com/")
+        mock_make_session.assert_called_once()
+
+        with patch("bc.subscription.utils.cl_client.os.getpid") as mock_pid:
+            mock_pid.return_value = -1
+            client.get("dockets", "https://www.courtlistener.com/")
+        self.assertEqual(mock_make_session.call_count, 2)
+
+
+@patch("bc.subscription.utils.cl_client.STATS_KEY", "test:courtlistener:stats")
+class CourtListenerStatsTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.addCleanup(r.delete, "test:courtlistener:stats")
+
+    def test_aggregates_stats_per_endpoint(self):
+        record_request("recap-documents", 0.2, False)
+        record_request("recap-documents", 0.4, True)
+        record_request("dockets", 0.1, False)
+
+        stats = get_courtlistener_stats()
+
+        self.assertEqual(list(stats), ["dockets", "recap-documents"])
+        self.assertEqual(stats["recap-documents"]["calls"], 2)
+        self.assertEqual(stats["recap-documents"]["errors"], 1)
+        self.assertAlmostEqual(stats["recap-documents"]["avg_latency"], 0.3)
+        self.assertEqual(stats["dockets"]["errors"], 0)
+
+
+class FilterRulesTest(TestCase):
+    def setUp(self) -> None:
+        # Rules removed by the rollback of each test don't fire signals
+        self.addCleanup(invalidate_filter_rules)
+
+    def test_uses_default_rules(self):
+        self.assertTrue(is_junk_entry("NOTICE of Appearance by John Doe"))
+        self.assertFalse(is_junk_entry("MOTION to Dismiss"))
+        self.assertFalse(should_purchase_document("Summons Returned Executed"))
+        self.assertTrue(should_purchase_document("MOTION to Dismiss"))
+
+    def test_recompiles_rules_after_changes(self):
+        self.assertFalse(is_junk_entry("Transcript  of Hearing"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rule = FilterRule.objects.create(pattern="transcript of")
+        self.assertTrue(is_junk_entry("Transcript  of Hearing"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rule.enabled = False
+            rule.save()
+        self.assertFalse(is_junk_entry("Transcript  of Hearing"))
+
+    def test_waits_for_commit_to_recompile_rules(self):
+        self.assertFalse(is_junk_entry("Transcript  of Hearing"))
+
+        FilterRule.objects.create(pattern="transcript of")
+        self.assertFalse(is_junk_entry("Transcript  of Hearing"))
+
+    def test_reuses_compiled_rules(self):
+        compiled = get_compiled_rules()
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_compiled_rules(), compiled)
+
+    @override_settings(FILTER_RULES_CHECK_INTERVAL=60)
+    def test_checks_version_once_per_interval(self):
+        invalidate_filter_rules()
+        compiled = get_compiled_rules()
+
+        # Another process changes the rules
+        r.incr(VERSION_KEY)
+        self.assertIs(get_compiled_rules(), compiled)
+
+        with patch(
+            "bc.subscription.utils.filters.time.monotonic",
+            return_value=time.monotonic() + 60,
+        ):
+            self.assertIsNot(get_compiled_rules(), compiled)
+
+    def test_returns_groups_that_filter_an_entry(self):
+        group, other_group = GroupFactory(), GroupFactory()
+        with self.captureOnCommitCallbacks(execute=True):
+            FilterRule.objects.create(
+                pattern=r"order\b", is_regex=True, group=group
+            )
+            FilterRule.objects.create(
+                pattern="minute entry", group=other_group
+            )
+
+        self.assertEqual(get_filtered_group_ids("ORDER granting"), {group.pk})
+        self.assertEqual(get_filtered_group_ids("Orders"), set())
+        self.assertFalse(is_junk_entry("ORDER granting"))
+
+    def test_keeps_rules_that_cannot_be_combined_apart(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            FilterRule.objects.create(
+                pattern="(?s)minute.order", is_regex=True
+            )
+            FilterRule.objects.create(pattern=r"(x)\1 entry", is_regex=True)
+            FilterRule.objects.create(pattern=r"(stay)ed", is_regex=True)
+
+        # The rules are still valid one by one
+        FilterRule(pattern="(?s)minute.order", is_regex=True).clean()
+        self.assertTrue(is_junk_entry("MINUTE\nORDER"))
+        self.assertTrue(is_junk_entry("xx entry"))
+        self.assertTrue(is_junk_entry("Stayed"))
+        self.assertFalse(is_junk_entry("xy entry"))
+        self.assertTrue(is_junk_entry("NOTICE of Appearance by John Doe"))
+
+    def test_validates_rules(self):
+        with self.assertRaises(ValidationError):
+            FilterRule(pattern="(unclosed", is_regex=True).clean()
+        with self.assertRaises(ValidationError):
+            FilterRule(
+                pattern="order",
+                action=FilterRule.DO_NOT_PURCHASE,
+                group=GroupFactory(),
+            ).clean()
+
+
+class BenchmarkFiltersTest(TestCase):
+    def test_times_filters_over_descriptions(self):
+        FilingWebhookEventFactory.create_batch(3)
+        out = StringIO()
+
+        call_command("benchmark", "--iterations=1", "filters", stdout=out)
+
+        self.assertIn("3 descriptions, 9 rules [per rule]", out.getvalue())
+        self.assertIn("3 descriptions, 9 rules [compiled]", out.getvalue())
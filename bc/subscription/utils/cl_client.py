@@ -0,0 +1,154 @@
+import logging
+import os
+import time
+from collections import defaultdict
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from bc.core.utils.redis import make_redis_interface
+
+logger = logging.getLogger(__name__)
+
+r = make_redis_interface("CACHE")
+
+STATS_KEY = "courtlistener:stats"
+
+# Status codes that are worth retrying. POST requests are only retried when
+# the connection can't be established, because buying a document twice
+# costs money.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CourtListenerClient:
+    """
+    Sends the requests to the CourtListener API and its storage.
+
+    Every request goes through a single requests.Session, so the
+    connections to the servers are kept alive and reused between calls.
+    Timeouts and retries are configured in one place and the latency and
+    the errors of each endpoint are recorded in Redis.
+
+    Jobs run in forked processes, so the session is created again when the
+    client is used in a process different from the one that created it.
+    """
+
+    def __init__(self) -> None:
+        self._session: requests.Session | None = None
+        self._pid: int | None = None
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None or self._pid != os.getpid():
+            self._session = self._make_session()
+            self._pid = os.getpid()
+        return self._session
+
+    @staticmethod
+    def _make_session() -> requests.Session:
+        retry = Retry(
+            total=settings.COURTLISTENER_MAX_RETRIES,
+            backoff_factor=settings.COURTLISTENER_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=settings.COURTLISTENER_POOL_SIZE,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(
+        self, method: str, endpoint: str, url: str, **kwargs
+    ) -> requests.Response:
+        """
+        Sends a request and records its latency and outcome.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (str): Name used to group the stats of the request.
+            url (str): The URL of the request.
+            **kwargs: Arguments of `requests.Session.request`.
+
+        Returns:
+            requests.Response: The response of the server.
+        """
+        kwargs.setdefault("timeout", settings.COURTLISTENER_TIMEOUT)
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.request(method, url, **kwargs)
+            failed = not response.ok
+            return response
+        finally:
+            latency = time.perf_counter() - start
+            logger.debug(
+                f"CourtListener {method} {endpoint} took {latency:.3f}s"
+            )
+            record_request(endpoint, latency, failed)
+
+    def get(self, endpoint: str, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", endpoint, url, **kwargs)
+
+    def post(self, endpoint: str, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", endpoint, url, **kwargs)
+
+
+cl_client = CourtListenerClient()
+
+
+def record_request(endpoint: str, latency: float, failed: bool) -> None:
+    """
+    Adds a request to the stats of its endpoint. The stats are shared by
+    every process and errors to store them are only logged, so they never
+    break a request.
+
+    Args:
+        endpoint (str): The name of the endpoint.
+        latency (float): The duration of the request in seconds.
+        failed (bool): Whether the request raised or got an error response.
+    """
+    try:
+        with r.pipeline() as pipe:
+            pipe.hincrby(STATS_KEY, f"{endpoint}:calls")
+            pipe.hincrbyfloat(STATS_KEY, f"{endpoint}:seconds", latency)
+            if failed:
+                pipe.hincrby(STATS_KEY, f"{endpoint}:errors")
+            pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not record CourtListener stats:\n{e}")
+
+
+def get_courtlistener_stats() -> dict[str, dict[str, int | float]]:
+    """
+    Returns the number of calls, the number of errors and the average
+    latency in seconds of each endpoint.
+    """
+    stats: dict[str, dict[str, float]] = defaultdict(
+        lambda: {"calls": 0, "errors": 0, "seconds": 0.0}
+    )
+    for field, value in r.hgetall(STATS_KEY).items():
+        endpoint, metric = field.rsplit(":", 1)
+        stats[endpoint][metric] = float(value)
+
+    return {
+        endpoint: {
+            "calls": int(values["calls"]),
+            "errors": int(values["errors"]),
+            "avg_latency": (
+                values["seconds"] / values["calls"] if values["calls"] else 0.0
+            ),
+        }
+        for endpoint, values in sorted(stats.items())
+    }
+
+
+def reset_courtlistener_stats() -> None:
+    r.delete(STATS_KEY)
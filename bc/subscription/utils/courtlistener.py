@@ -1,5 +1,8 @@
 import logging
 import re
+from collections.abc import Iterable
+from http import HTTPStatus
+from tempfile import SpooledTemporaryFile
 from typing import NotRequired, TypedDict
 
 import courts_db
@@ -8,7 +11,9 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
 
-from .exceptions import MultiDefendantCaseError
+from .cl_client import cl_client
+from .docket_cache import cache_docket, get_cached_docket, is_fresh
+from .exceptions import DocumentTooLarge, MultiDefendantCaseError
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +38,8 @@ def CL_API_URL(suffix):
 
 CL_MEDIA_STORAGE = "https://storage.courtlistener.com/"
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 pacer_to_cl_ids = {
     # Maps PACER ids to their CL equivalents
     "azb": "arb",  # Arizona Bankruptcy Court
@@ -131,11 +138,35 @@ def lookup_docket_by_cl_id(cl_id: int) -> DocketDict:
     """
     Performs a GET query on /api/rest/v4/dockets/
     to get a Docket using the CourtListener ID
+
+    Dockets are read through a cache. A fresh entry is returned without a
+    request, while a stale one is revalidated with the ETag and
+    Last-Modified headers of the response that returned it.
     """
+    cached_docket = get_cached_docket(cl_id)
+    if cached_docket and is_fresh(cached_docket):
+        return cached_docket["docket"]
+
+    headers = auth_header()
+    if cached_docket and cached_docket["etag"]:
+        headers["If-None-Match"] = cached_docket["etag"]
+    if cached_docket and cached_docket["last_modified"]:
+        headers["If-Modified-Since"] = cached_docket["last_modified"]
+
     url = f"{CL_API_URL('dockets')}{cl_id}/"
-    response = requests.get(url, headers=auth_header(), timeout=5)
-    response.raise_for_status()
-    return response.json()
+    response = cl_client.get("dockets", url, headers=headers)
+    if cached_docket and response.status_code == HTTPStatus.NOT_MODIFIED:
+        docket = cached_docket["docket"]
+        etag = cached_docket["etag"]
+        last_modified = cached_docket["last_modified"]
+    else:
+        response.raise_for_status()
+        docket = response.json()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+    cache_docket(cl_id, docket, etag, last_modified)
+    return docket
 
 
 class DocumentDict(TypedDict):
@@ -151,19 +182,65 @@ def lookup_document_by_doc_id(doc_id: int | None) -> DocumentDict:
     Performs a GET query on /api/rest/v4/recap-documents/
     using the document_id to get a recap document
     """
-    response = requests.get(
+    response = cl_client.get(
+        "recap-documents",
         f"{CL_API_URL('recap-documents')}{doc_id}/",
         params={
             "fields": "id,absolute_url,filepath_local,page_count,pacer_doc_id"
         },
         headers=auth_header(),
-        timeout=5,
     )
     response.raise_for_status()
     data: DocumentDict = response.json()
     return data
 
 
+# Number of ids sent in each request of a batched lookup, so the query
+# string stays short.
+DOCUMENTS_PER_LOOKUP = 100
+
+
+def lookup_documents_by_doc_ids(
+    doc_ids: Iterable[int],
+) -> dict[int, DocumentDict]:
+    """
+    Performs GET queries on /api/rest/v4/recap-documents/
+    using an id__in filter to get many recap documents at once.
+
+    The ids are sent in chunks of DOCUMENTS_PER_LOOKUP and every page of
+    the response is followed, so a whole webhook usually takes one request.
+
+    Args:
+        doc_ids (Iterable[int]): The document ids from CL.
+
+    Returns:
+        dict[int, DocumentDict]: The documents found, keyed by their id.
+        Ids that CL doesn't know are left out.
+    """
+    documents: dict[int, DocumentDict] = {}
+    unique_ids = sorted(set(doc_ids))
+    for start in range(0, len(unique_ids), DOCUMENTS_PER_LOOKUP):
+        chunk = unique_ids[start : start + DOCUMENTS_PER_LOOKUP]
+        url: str | None = CL_API_URL("recap-documents")
+        params: dict[str, str | int] | None = {
+            "id__in": ",".join(str(doc_id) for doc_id in chunk),
+            "page_size": DOCUMENTS_PER_LOOKUP,
+            "fields": "id,absolute_url,filepath_local,page_count,pacer_doc_id",
+        }
+        while url:
+            response = cl_client.get(
+                "recap-documents", url, params=params, headers=auth_header()
+            )
+            response.raise_for_status()
+            data = response.json()
+            for document in data["results"]:
+                documents[document["id"]] = document
+            # The next URL already includes the query string
+            url, params = data["next"], None
+
+    return documents
+
+
 def lookup_initial_complaint(docket_id: int | None) -> DocumentDict | None:
     """
     Performs a GET query on /api/rest/v4/recap/
@@ -186,11 +263,11 @@ def lookup_initial_complaint(docket_id: int | None) -> DocumentDict | None:
         "fields": "id,absolute_url,filepath_local,page_count,pacer_doc_id",
     }
 
-    response = requests.get(
+    response = cl_client.get(
+        "recap-documents",
         f"{CL_API_URL('recap-documents')}",
         params=params,
         headers=auth_header(),
-        timeout=5,
     )
     response.raise_for_status()
 
@@ -208,11 +285,43 @@ def lookup_initial_complaint(docket_id: int | None) -> DocumentDict | None:
     }
 
 
-def download_pdf_from_cl(filepath: str) -> bytes:
+def download_pdf_from_cl(filepath: str) -> SpooledTemporaryFile:
+    """
+    Downloads a document from the CL storage into a spooled temporary file.
+
+    The response is streamed in chunks, so documents bigger than
+    PDF_SPOOL_MEMORY_SIZE are written to disk instead of kept in memory.
+    The caller is responsible for closing the file.
+
+    Args:
+        filepath (str): The path of the document in the CL storage.
+
+    Raises:
+        DocumentTooLarge: if the document is bigger than PDF_MAX_DOWNLOAD_SIZE.
+
+    Returns:
+        SpooledTemporaryFile: the document, positioned at its start.
+    """
     document_url = f"{CL_MEDIA_STORAGE}{filepath}"
-    document_request = requests.get(document_url, timeout=3)
-    document_request.raise_for_status()
-    return document_request.content
+    max_size = settings.PDF_MAX_DOWNLOAD_SIZE
+    with cl_client.get("storage", document_url, stream=True) as response:
+        response.raise_for_status()
+        if int(response.headers.get("Content-Length") or 0) > max_size:
+            raise DocumentTooLarge(document_url, max_size)
+
+        # The file is returned open, so the caller closes it.
+        spool_size = settings.PDF_SPOOL_MEMORY_SIZE
+        document = SpooledTemporaryFile(max_size=spool_size)  # noqa: SIM115
+        size = 0
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                document.close()
+                raise DocumentTooLarge(document_url, max_size)
+            document.write(chunk)
+
+    document.seek(0)
+    return document
 
 
 def purchase_pdf_by_doc_id(doc_id: int | None, docket_id: int | None) -> int:
@@ -221,7 +330,8 @@ def purchase_pdf_by_doc_id(doc_id: int | None, docket_id: int | None) -> int:
     using the document_id from CL and the PACER's login
     credentials.
     """
-    response = requests.post(
+    response = cl_client.post(
+        "recap-fetch",
         f"{CL_API_URL('recap-fetch')}",
         json={
             "request_type": 2,
@@ -231,7 +341,6 @@ def purchase_pdf_by_doc_id(doc_id: int | None, docket_id: int | None) -> int:
             "docket": docket_id,
         },
         headers=auth_header(),
-        timeout=5,
     )
     response.raise_for_status()
     data = response.json()
@@ -245,11 +354,11 @@ def lookup_docket_by_case_number(court: str, docket_number: str):
     Docket.
     """
 
-    response = requests.get(
+    response = cl_client.get(
+        "dockets",
         CL_API_URL("dockets"),
         params={"court_id": court, "docket_number": docket_number},
         headers=auth_header(),
-        timeout=5,
     )
     data = response.json()
     num_results = len(data["results"])
@@ -297,13 +406,13 @@ def subscribe_to_docket_alert(cl_id: int) -> bool:
     Performs a POST query on /api/rest/v4/docket-alerts/
     to subscribe to docket alerts for a given CourtListener docket ID.
     """
-    response = requests.post(
+    response = cl_client.post(
+        "docket-alerts",
         CL_API_URL("docket-alerts"),
         headers=auth_header(),
         data={
             "docket": cl_id,
         },
-        timeout=5,
     )
 
     try:
@@ -0,0 +1,93 @@
+import json
+import time
+from typing import TYPE_CHECKING, TypedDict
+
+from django.conf import settings
+
+from bc.core.utils.redis import make_redis_interface
+
+if TYPE_CHECKING:
+    from .courtlistener import DocketDict
+
+r = make_redis_interface("CACHE")
+
+
+class CachedDocket(TypedDict):
+    docket: "DocketDict"
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+
+def _get_cache_key(cl_id: int) -> str:
+    return f"docket_cache:{cl_id}"
+
+
+def get_cached_docket(cl_id: int) -> CachedDocket | None:
+    """
+    Returns the docket stored in the cache with the validators of the
+    response that returned it.
+
+    Args:
+        cl_id (int): The CourtListener ID of the docket.
+
+    Returns:
+        CachedDocket | None: the cached entry or None if there's none.
+    """
+    data = r.get(_get_cache_key(cl_id))
+    if not data:
+        return None
+    return json.loads(data)
+
+
+def is_fresh(cached_docket: CachedDocket) -> bool:
+    """
+    Checks whether a cached docket can be used without asking CourtListener
+    if it changed.
+    """
+    age = time.time() - cached_docket["fetched_at"]
+    return age < settings.DOCKET_CACHE_TTL
+
+
+def cache_docket(
+    cl_id: int,
+    docket: "DocketDict",
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> None:
+    """
+    Stores a docket in the cache.
+
+    The entry is fresh for DOCKET_CACHE_TTL seconds. After that, it's kept
+    until DOCKET_CACHE_MAX_AGE so it can be revalidated with a conditional
+    request instead of downloaded again.
+
+    Args:
+        cl_id (int): The CourtListener ID of the docket.
+        docket (DocketDict): The docket returned by CL.
+        etag (str | None): The ETag header of the response.
+        last_modified (str | None): The Last-Modified header of the response.
+    """
+    cached_docket: CachedDocket = {
+        "docket": docket,
+        "etag": etag,
+        "last_modified": last_modified,
+        "fetched_at": time.time(),
+    }
+    r.set(
+        _get_cache_key(cl_id),
+        json.dumps(cached_docket),
+        ex=settings.DOCKET_CACHE_MAX_AGE,
+    )
+
+
+def invalidate_cached_docket(cl_id: int | None) -> None:
+    """
+    Removes a docket from the cache.
+
+    Args:
+        cl_id (int | None): The CourtListener ID of the docket.
+    """
+    if not cl_id:
+        return
+    r.delete(_get_cache_key(cl_id))
@@ -1,2 +1,14 @@
 class MultiDefendantCaseError(Exception):
     pass
+
+
+class DocumentTooLarge(Exception):
+    """
+    Raised when a document from CourtListener is bigger than the size
+    allowed by the PDF_MAX_DOWNLOAD_SIZE setting.
+    """
+
+    def __init__(self, url: str, max_size: int) -> None:
+        super().__init__(
+            f"The document {url} is bigger than {max_size} bytes."
+        )
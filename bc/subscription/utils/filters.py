@@ -0,0 +1,184 @@
+import logging
+import re
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from threading import Lock
+
+from django.conf import settings
+
+from bc.core.utils.redis import make_redis_interface
+from bc.subscription.models import FilterRule
+
+logger = logging.getLogger(__name__)
+
+r = make_redis_interface("CACHE")
+
+# Counter increased each time a rule changes, so every process knows its
+# compiled matchers are stale.
+VERSION_KEY = "filter_rules:version"
+
+MatcherKey = tuple[int | None, int]
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    version: int
+    matchers: dict[MatcherKey, list[re.Pattern]]
+
+    def search(
+        self, text: str, action: int, group_id: int | None = None
+    ) -> re.Match | None:
+        for matcher in self.matchers.get((group_id, action), []):
+            if match := matcher.search(text):
+                return match
+        return None
+
+
+_compiled: CompiledRules | None = None
+# Monotonic time after which this process checks the version again
+_next_check = 0.0
+_lock = Lock()
+
+
+def _can_be_combined(regex: str) -> bool:
+    """
+    Checks whether a rule keeps its meaning inside a single regex with
+    other rules.
+
+    Inline flags like `(?s)` are only valid at the start of a pattern, and
+    numbered backreferences like `\\1` point to the groups of other rules
+    once they're joined, so rules with groups are left on their own.
+    """
+    try:
+        pattern = re.compile(f"(?:{regex})")
+    except re.error:
+        return False
+    return not pattern.groups
+
+
+def compile_rules(
+    rules: Iterable[FilterRule],
+) -> dict[MatcherKey, list[re.Pattern]]:
+    """
+    Compiles the rules of each group and action into a single regex, so a
+    description is checked against all of them in one pass. Rules that
+    can't be combined with the others get a regex of their own.
+
+    Rules with invalid patterns are skipped.
+
+    Args:
+        rules (Iterable[FilterRule]): the enabled rules.
+
+    Returns:
+        dict[MatcherKey, list[re.Pattern]]: the regexes of each (group id,
+        action) pair. Rules without a group use None as the group id.
+    """
+    matchers: dict[MatcherKey, list[re.Pattern]] = defaultdict(list)
+    alternatives: dict[MatcherKey, list[str]] = defaultdict(list)
+    for rule in rules:
+        key = (rule.group_id, rule.action)
+        try:
+            pattern = re.compile(rule.regex, re.IGNORECASE)
+        except re.error:
+            logger.error(f"Skipping filter rule {rule.pk} with bad pattern")
+            continue
+
+        if _can_be_combined(rule.regex):
+            alternatives[key].append(rule.regex)
+        else:
+            matchers[key].append(pattern)
+
+    for key, regexes in alternatives.items():
+        try:
+            matchers[key].append(
+                re.compile(
+                    "|".join(f"(?:{regex})" for regex in regexes),
+                    re.IGNORECASE,
+                )
+            )
+        except re.error:
+            logger.error(f"Could not combine the filter rules of {key}")
+            matchers[key].extend(
+                re.compile(regex, re.IGNORECASE) for regex in regexes
+            )
+
+    return dict(matchers)
+
+
+def get_rules_version() -> int:
+    return int(r.get(VERSION_KEY) or 0)
+
+
+def invalidate_filter_rules() -> None:
+    """Marks the compiled rules of every process as stale."""
+    global _next_check
+
+    r.incr(VERSION_KEY)
+    # This process uses the new rules right away
+    _next_check = 0.0
+
+
+def get_compiled_rules() -> CompiledRules:
+    """
+    Returns the compiled rules of this process. They're loaded from the
+    database again when the rules changed since they were compiled.
+
+    The version of the rules is read from Redis at most once every
+    FILTER_RULES_CHECK_INTERVAL seconds, so checking an entry doesn't cost
+    a round trip. Changes made by other processes can take that long to be
+    used.
+    """
+    global _compiled, _next_check
+
+    compiled = _compiled
+    now = time.monotonic()
+    if compiled and now < _next_check:
+        return compiled
+
+    version = get_rules_version()
+    if not compiled or compiled.version != version:
+        with _lock:
+            if _compiled is None or _compiled.version != version:
+                rules = FilterRule.objects.filter(enabled=True).only(
+                    "group", "action", "pattern", "is_regex"
+                )
+                _compiled = CompiledRules(version, compile_rules(rules))
+            compiled = _compiled
+
+    _next_check = now + settings.FILTER_RULES_CHECK_INTERVAL
+    return compiled
+
+
+def is_junk_entry(description: str) -> bool:
+    """Checks whether no group should post about a docket entry."""
+    rules = get_compiled_rules()
+    return bool(rules.search(description, FilterRule.IGNORE))
+
+
+def should_purchase_document(description: str) -> bool:
+    """Checks whether the document of a docket entry can be purchased."""
+    rules = get_compiled_rules()
+    return not rules.search(description, FilterRule.DO_NOT_PURCHASE)
+
+
+def get_filtered_group_ids(description: str) -> set[int]:
+    """
+    Returns the groups whose own rules filter a docket entry. The rules
+    shared by every group are checked by is_junk_entry.
+
+    Args:
+        description (str): the description of the docket entry.
+
+    Returns:
+        set[int]: the ids of the groups that shouldn't post about the entry.
+    """
+    rules = get_compiled_rules()
+    return {
+        group_id
+        for group_id, action in rules.matchers
+        if group_id is not None
+        and action == FilterRule.IGNORE
+        and rules.search(description, action, group_id)
+    }
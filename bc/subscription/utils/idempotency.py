@@ -0,0 +1,98 @@
+from collections.abc import Callable
+from functools import wraps
+from http import HTTPStatus
+from typing import cast
+
+from django.conf import settings
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from bc.core.utils.redis import make_redis_interface
+from bc.subscription.exceptions import IdempotencyKeyMissing
+
+r = make_redis_interface("CACHE")
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+
+def _get_reservation_key(idempotency_key: str) -> str:
+    return f"webhook_idempotency:{idempotency_key}"
+
+
+def reserve_idempotency_key(idempotency_key: str) -> str | None:
+    """
+    Atomically reserves the idempotency key of a webhook delivery.
+
+    The reservation is stored using a single SET NX GET command, so a
+    redelivery costs one round trip no matter the state of the first one.
+    In-progress reservations expire after WEBHOOK_IN_PROGRESS_TTL seconds
+    in case the worker handling them dies.
+
+    Args:
+        idempotency_key (str): The key sent by CourtListener.
+
+    Returns:
+        str | None: None if the key was reserved by this call, otherwise the
+        state of the existing reservation (IN_PROGRESS or COMPLETED).
+    """
+    previous_state = r.set(
+        _get_reservation_key(idempotency_key),
+        IN_PROGRESS,
+        nx=True,
+        get=True,
+        ex=settings.WEBHOOK_IN_PROGRESS_TTL,
+    )
+    # With GET, SET returns the previous value of the key instead of a flag.
+    return cast(str | None, previous_state)
+
+
+def complete_idempotency_key(idempotency_key: str) -> None:
+    """Marks the delivery as handled for WEBHOOK_IDEMPOTENCY_TTL seconds."""
+    r.set(
+        _get_reservation_key(idempotency_key),
+        COMPLETED,
+        ex=settings.WEBHOOK_IDEMPOTENCY_TTL,
+    )
+
+
+def release_idempotency_key(idempotency_key: str) -> None:
+    """Drops the reservation so the next delivery can be handled."""
+    r.delete(_get_reservation_key(idempotency_key))
+
+
+def idempotent_webhook(
+    view: Callable[..., Response],
+) -> Callable[..., Response]:
+    """
+    Makes sure each delivery of a CourtListener webhook is handled once.
+
+    The key is reserved as soon as the request arrives. Redeliveries of a
+    handled webhook get a 200 response right away, while redeliveries of a
+    webhook that's still being handled get a 409 response so CourtListener
+    retries them later. The reservation is dropped if the view raises an
+    exception.
+    """
+
+    @wraps(view)
+    def wrapper(request: Request, *args, **kwargs) -> Response:
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if not idempotency_key:
+            raise IdempotencyKeyMissing()
+
+        state = reserve_idempotency_key(idempotency_key)
+        if state == COMPLETED:
+            return Response(status=HTTPStatus.OK)
+        if state == IN_PROGRESS:
+            return Response(status=HTTPStatus.CONFLICT)
+
+        try:
+            response = view(request, *args, **kwargs)
+        except Exception:
+            release_idempotency_key(idempotency_key)
+            raise
+
+        complete_idempotency_key(idempotency_key)
+        return response
+
+    return wrapper
@@ -0,0 +1,76 @@
+import json
+
+from django.conf import settings
+
+from bc.core.utils.redis import make_redis_interface
+
+from .courtlistener import DocumentDict
+
+r = make_redis_interface("CACHE")
+
+
+def _get_registry_key(doc_id: int) -> str:
+    return f"document_in_flight:{doc_id}"
+
+
+def get_document_in_flight(doc_id: int | None) -> DocumentDict | None:
+    """
+    Returns the RECAP document stored in the in-flight registry.
+
+    The same document often arrives in several webhooks, so the first event
+    that looks it up in CourtListener stores the result for a few minutes
+    and the duplicates read it from here instead of repeating the request.
+
+    Args:
+        doc_id (int | None): The document id from CL.
+
+    Returns:
+        DocumentDict | None: The document or None if it's not registered.
+    """
+    if not doc_id:
+        return None
+
+    data = r.get(_get_registry_key(doc_id))
+    if not data:
+        return None
+
+    return json.loads(data)
+
+
+def register_document_in_flight(
+    doc_id: int | None, document: DocumentDict
+) -> None:
+    """
+    Stores a RECAP document in the in-flight registry for
+    DOCUMENT_IN_FLIGHT_TTL seconds, replacing any previous version of it.
+
+    Args:
+        doc_id (int | None): The document id from CL.
+        document (DocumentDict): The document returned by CL.
+    """
+    if not doc_id:
+        return
+
+    r.set(
+        _get_registry_key(doc_id),
+        json.dumps(document),
+        ex=settings.DOCUMENT_IN_FLIGHT_TTL,
+    )
+
+
+def register_documents_in_flight(documents: dict[int, DocumentDict]) -> None:
+    """
+    Stores many RECAP documents in the in-flight registry using a single
+    round trip.
+
+    Args:
+        documents (dict[int, DocumentDict]): The documents keyed by their id.
+    """
+    with r.pipeline() as pipe:
+        for doc_id, document in documents.items():
+            pipe.set(
+                _get_registry_key(doc_id),
+                json.dumps(document),
+                ex=settings.DOCUMENT_IN_FLIGHT_TTL,
+            )
+        pipe.execute()
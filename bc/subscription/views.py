@@ -5,7 +5,6 @@ from django.db import transaction
 from django.shortcuts import render
 from django.views import View
 from django_htmx.http import trigger_client_event
-from django_rq.queues import get_queue
 from requests.exceptions import HTTPError, ReadTimeout
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -13,7 +12,8 @@ from rq import Retry
 
 from bc.channel.models import Channel
 from bc.channel.selectors import get_channel_groups_per_user
-from bc.core.utils.status.base import InvalidTemplate
+from bc.core.utils.queues import QueueRouter
+from bc.core.utils.status.base import InvalidTemplate, RenderResult
 from bc.core.utils.status.selectors import get_new_case_template
 
 from .forms import AddSubscriptionForm
@@ -25,7 +25,7 @@ from .utils.courtlistener import (
     subscribe_to_docket_alert,
 )
 
-queue = get_queue("default")
+queue = QueueRouter()
 
 
 def search(request: Request) -> Response:
@@ -94,19 +94,22 @@ class AddCaseView(LoginRequiredMixin, View):
                 ) = create_or_update_subscription_from_docket(docket)
                 channels = request.POST.getlist("channels")
 
-                # Verify that all templates produce valid post content
+                # Verify that all templates produce valid post content. The
+                # channels of the same service share the template, so each
+                # message is rendered and measured once.
+                results: dict[int, RenderResult] = {}
                 for channel_id in channels:
                     channel = Channel.objects.get(pk=channel_id)
-                    template = get_new_case_template(channel.service)
-
-                    template.format(
-                        docket=subscription.name_with_summary,
-                        docket_link=subscription.cl_url,
-                        docket_id=subscription.cl_docket_id,
-                        article_url=subscription.article_url,
-                    )
-
-                    if not template.is_valid:
+                    if channel.service not in results:
+                        template = get_new_case_template(channel.service)
+                        results[channel.service] = template.format(
+                            docket=subscription.name_with_summary,
+                            docket_link=subscription.cl_url,
+                            docket_id=subscription.cl_docket_id,
+                            article_url=subscription.article_url,
+                        )
+
+                    if not results[channel.service].is_valid:
                         raise InvalidTemplate
         except InvalidTemplate:
             context = {